@@ -2,32 +2,144 @@
 # IMPORTS
 # ============================================
 
+import base64
+import hashlib
+import hmac
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
 import bcrypt
 from fastapi import Depends, HTTPException, Cookie
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from .database import SessionLocal
+from .database import get_db, get_async_db
 from .models import Personnel
 
 # ============================================
-# DATABASE - SESSION
+# SIGNED SESSION TOKEN
 # ============================================
 
-def get_db():
-    """This function provides a database session.
+SESSION_SECRET = os.getenv("SESSION_SECRET")
+"""Key used to sign the session cookie. It must be shared by every worker and
+survive restarts, so the application refuses to start without it.
+Version:
+--------
+specification: Esteban Barracho (v.1 17/10/2026)
+implement: Esteban Barracho (v.2 17/10/2026)
+"""
+
+assert SESSION_SECRET, "⚠️ Variable d'environnement SESSION_SECRET manquante"
+
+SESSION_MAX_AGE = int(os.getenv("SESSION_MAX_AGE", str(12 * 3600)))
+"""Lifetime (seconds) of a session token."""
+
+def _sign(payload: str) -> str:
+    return hmac.new(SESSION_SECRET.encode(), payload.encode(), hashlib.sha256).hexdigest()
+
+def create_session_token(user) -> str:
+    """Builds the signed session cookie value carrying the user identity and role.
+    Parameter:
+    ----------
+    user (Personnel): The authenticated user.
     Return:
     -------
-    (Session): A SQLAlchemy session instance.
+    (str): "<base64 payload>.<HMAC-SHA256 signature>".
     Version:
     --------
-    specification: Esteban Barracho (v.1 19/06/25)
-    implement: Esteban Barracho (v.1 19/06/25)
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+    data = {"id": user.id_personnel, "role": user.fonction, "exp": int(time.time()) + SESSION_MAX_AGE}
+    payload = base64.urlsafe_b64encode(json.dumps(data).encode()).decode()
+    return f"{payload}.{_sign(payload)}"
+
+def read_session_token(token: str):
+    """Verifies a session cookie and returns its content.
+    Parameter:
+    ----------
+    token (str): Cookie value produced by `create_session_token`.
+    Return:
+    -------
+    (dict | None): {"id", "role", "exp"} if the signature is valid and the token not expired, else None.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
     """
-    db = SessionLocal()
+    payload, _, signature = token.rpartition(".")
+    if not payload or not hmac.compare_digest(signature, _sign(payload)):
+        return None
     try:
-        yield db
-    finally:
-        db.close()
+        data = json.loads(base64.urlsafe_b64decode(payload.encode()))
+    except ValueError:
+        return None
+    if not isinstance(data, dict) or data.get("exp", 0) < time.time():
+        return None
+    return data
+
+# ============================================
+# AUTHENTICATED USER CACHE
+# ============================================
+
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "1024"))
+USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", "300"))
+
+class UserCache:
+    """Bounded LRU/TTL cache of the `Personnel` records of authenticated users.
+    Records are stored as column snapshots (password excluded) and every
+    lookup returns a new transient `Personnel`, so a cached user is never
+    attached to, or expired by, a request session.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+
+    def __init__(self, max_size: int = USER_CACHE_SIZE, ttl: int = USER_CACHE_TTL):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._max_size = max_size
+        self._ttl = ttl
+
+    def get(self, id_personnel: str):
+        with self._lock:
+            entry = self._entries.get(id_personnel)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] > self._ttl:
+                del self._entries[id_personnel]
+                return None
+            self._entries.move_to_end(id_personnel)
+            return Personnel(**entry[1])
+
+    def put(self, user):
+        values = {c.name: getattr(user, c.name) for c in Personnel.__table__.columns if c.name != "password"}
+        with self._lock:
+            self._entries[user.id_personnel] = (time.monotonic(), values)
+            self._entries.move_to_end(user.id_personnel)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, id_personnel: str = None):
+        """Drops one user (or every user when no identifier is given) from the cache."""
+        with self._lock:
+            if id_personnel is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(id_personnel, None)
+
+user_cache = UserCache()
+"""Process-wide cache of authenticated users, invalidated by the admin Personnel routes.
+Version:
+--------
+specification: Esteban Barracho (v.1 17/10/2026)
+implement: Esteban Barracho (v.1 17/10/2026)
+"""
 
 # ============================================
 # USER AUTHENTICATION
@@ -64,26 +176,71 @@ def authenticate_user(email: str, plain_password: str, db: Session):
 # ============================================
 
 def get_current_user(session_id: str = Cookie(None), db: Session = Depends(get_db)):
-    """This function retrieves the currently authenticated user from the session cookie.
+    """This function retrieves the currently authenticated user from the signed session cookie.
+    The user record comes from `user_cache`; the database is only queried on a
+    cache miss (the injected session does not open a connection otherwise).
     Parameter:
     ----------
-    session_id (str): The session ID stored in the user's cookies.
+    session_id (str): The signed session token stored in the user's cookies.
     Db (Session): The active database session.
     Return:
     -------
     (Personnel): The authenticated user object.
     Raise:
     ------
-    HTTPException: If no session or user is found.
+    HTTPException: If no valid session or user is found.
     Version:
     --------
     specification: Esteban Barracho (v.1 19/06/25)
-    implement: Esteban Barracho (v.1 19/06/25)
+    implement: Esteban Barracho (v.2 17/10/2026)
     """
+    token = _session_token(session_id)
+    user = user_cache.get(token["id"])
+    if user is None:
+        assert db, "Session DB invalide"
+        user = _cache_user(db.query(Personnel).filter(Personnel.id_personnel == token["id"]).first())
+    return _check_role(user, token)
+
+async def get_current_user_async(session_id: str = Cookie(None), db: AsyncSession = Depends(get_async_db)):
+    """Asynchronous counterpart of `get_current_user` for the `async def` routes.
+    Same token check and same `user_cache`; a cache miss is loaded through the async session.
+    Parameter:
+    ----------
+    session_id (str): The signed session token stored in the user's cookies.
+    db (AsyncSession): The active asynchronous database session.
+    Return:
+    -------
+    (Personnel): The authenticated user object.
+    Raise:
+    ------
+    HTTPException: If no valid session or user is found.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+    token = _session_token(session_id)
+    user = user_cache.get(token["id"])
+    if user is None:
+        result = await db.execute(select(Personnel).where(Personnel.id_personnel == token["id"]))
+        user = _cache_user(result.scalars().first())
+    return _check_role(user, token)
+
+def _session_token(session_id: str) -> dict:
     if not session_id or not isinstance(session_id, str):
         raise HTTPException(status_code=401, detail="Session non trouvée")
-    assert db, "Session DB invalide"
-    user = db.query(Personnel).filter(Personnel.id_personnel == session_id).first()
+    token = read_session_token(session_id)
+    if token is None:
+        raise HTTPException(status_code=401, detail="Session invalide ou expirée")
+    return token
+
+def _cache_user(user):
     if not user:
         raise HTTPException(status_code=401, detail="Utilisateur non authentifié")
+    user_cache.put(user)
+    return user_cache.get(user.id_personnel)
+
+def _check_role(user, token: dict):
+    if user.fonction != token.get("role"):
+        raise HTTPException(status_code=401, detail="Rôle modifié, veuillez vous reconnecter")
     return user
@@ -6,19 +6,26 @@ import os
 
 from dotenv import load_dotenv
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
+from app.utils.pool_metrics import InstrumentedAsyncQueuePool, InstrumentedQueuePool, async_pool_metrics, instrument_engine
+
 # ============================================
 # PROVIDING THE SESSION TO THE APPLICATION
 # ============================================
 
 def get_db():
     """Dependency injection for a SQLAlchemy session.
+    This is the only session provider of the application: `get_current_user`
+    and every router depend on this same callable, and FastAPI resolves a
+    dependency once per request, so a request uses a single session and a
+    single pooled connection.
     Version:
     --------
     specification: Esteban Barracho (v.1 22/06/2025)
-    implement: Esteban Barracho (v.1 22/06/2025)
+    implement: Esteban Barracho (v.2 17/10/2026)
     """
     db = SessionLocal()
     assert db is not None, "Session DB invalide"
@@ -27,6 +34,21 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    """Dependency injection for an asynchronous SQLAlchemy session (`async def` routes).
+    The session checks a connection out of the async pool when its first
+    statement is awaited and keeps it until commit, rollback or close; the
+    dependency closes it when the request ends. Awaiting the database does not
+    block the event loop, but the connection stays checked out for the rest of
+    the request, including while the route awaits other I/O.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.2 17/10/2026)
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
 # ============================================
 # LOADING ENVIRONMENT VARIABLES
 # ============================================
@@ -51,6 +73,15 @@ DB_NAME = os.getenv("DB_NAME")
 
 assert all([DB_USER, DB_PASSWORD, DB_HOST, DB_PORT, DB_NAME]), "⚠️ Variables d'environnement SQL manquantes"
 
+DB_LOCAL_INFILE = os.getenv("DB_LOCAL_INFILE", "0") == "1"
+"""Enables `LOAD DATA LOCAL INFILE` on the client connections (bulk Excel imports).
+The MySQL server must also allow it (`local_infile=ON`).
+Version:
+--------
+specification: Esteban Barracho (v.1 17/10/2026)
+implement: Esteban Barracho (v.1 17/10/2026)
+"""
+
 # ============================================
 # CONNECTION TO THE DATABASE
 # ============================================
@@ -65,12 +96,103 @@ specification: Esteban Barracho (v.1 19/06/2025)
 implement: Esteban Barracho (v.1 19/06/2025)
 """
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL, pool_pre_ping=True)
+# ============================================
+# CONNECTION POOL SETTINGS
+# ============================================
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_PRE_PING = os.getenv("DB_PRE_PING", "idle")
+DB_PRE_PING_IDLE = float(os.getenv("DB_PRE_PING_IDLE", "30"))
+"""Connection pool settings, loaded from the environment:
+size, overflow, checkout timeout (s), recycle age (s) and pre-ping strategy
+("always": ping on every checkout, "idle": ping only connections idle for more
+than DB_PRE_PING_IDLE seconds, "off": rely on DB_POOL_RECYCLE only).
+Version:
+--------
+specification: Esteban Barracho (v.1 17/10/2026)
+implement: Esteban Barracho (v.1 17/10/2026)
+"""
+
+assert DB_PRE_PING in ("always", "idle", "off"), "⚠️ DB_PRE_PING doit valoir always, idle ou off"
+
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL,
+    poolclass=InstrumentedQueuePool,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=DB_PRE_PING == "always",
+    connect_args={"local_infile": True} if DB_LOCAL_INFILE else {}
+)
 """This object creates the SQLAlchemy engine based on the URL configuration.
 Version:
 --------
 specification: Esteban Barracho (v.1 19/06/2025)
-implement: Esteban Barracho (v.2 22/06/2025)
+implement: Esteban Barracho (v.4 17/10/2026)
+"""
+
+instrument_engine(engine, pre_ping=DB_PRE_PING, idle_ping_after=DB_PRE_PING_IDLE)
+
+# ============================================
+# ASYNCHRONOUS ENGINE (READ-HEAVY ROUTES)
+# ============================================
+
+ASYNC_DATABASE_URL = (
+    f"mysql+aiomysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+)
+"""Same database as SQLALCHEMY_DATABASE_URL, through the aiomysql driver.
+Version:
+--------
+specification: Esteban Barracho (v.1 17/10/2026)
+implement: Esteban Barracho (v.1 17/10/2026)
+"""
+
+DB_ASYNC_POOL_SIZE = int(os.getenv("DB_ASYNC_POOL_SIZE", str(DB_POOL_SIZE)))
+DB_ASYNC_MAX_OVERFLOW = int(os.getenv("DB_ASYNC_MAX_OVERFLOW", str(DB_MAX_OVERFLOW)))
+"""Size and overflow of the async pool; the other pool settings are shared with `engine`.
+The async routes are no longer limited by the threadpool (40 threads), so
+their concurrency on the database is bounded by this pool.
+Both pools are independent: each worker may hold up to
+(DB_POOL_SIZE + DB_MAX_OVERFLOW) + (DB_ASYNC_POOL_SIZE + DB_ASYNC_MAX_OVERFLOW)
+connections, i.e. 60 with the defaults (10 + 20 per pool). MySQL
+`max_connections` must cover this budget times the number of workers.
+Version:
+--------
+specification: Esteban Barracho (v.1 17/10/2026)
+implement: Esteban Barracho (v.2 17/10/2026)
+"""
+
+DB_CONNECTION_BUDGET = DB_POOL_SIZE + DB_MAX_OVERFLOW + DB_ASYNC_POOL_SIZE + DB_ASYNC_MAX_OVERFLOW
+"""Maximum number of MySQL connections opened by one worker (both pools)."""
+
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    poolclass=InstrumentedAsyncQueuePool,
+    pool_size=DB_ASYNC_POOL_SIZE,
+    max_overflow=DB_ASYNC_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=DB_PRE_PING == "always"
+)
+"""Asynchronous engine used by the `async def` read routes (dashboard, finance, lists, Outlook events).
+Version:
+--------
+specification: Esteban Barracho (v.1 17/10/2026)
+implement: Esteban Barracho (v.2 17/10/2026)
+"""
+
+instrument_engine(async_engine.sync_engine, pre_ping=DB_PRE_PING, idle_ping_after=DB_PRE_PING_IDLE, metrics=async_pool_metrics)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+"""Factory of asynchronous sessions bound to `async_engine`.
+Version:
+--------
+specification: Esteban Barracho (v.1 17/10/2026)
+implement: Esteban Barracho (v.1 17/10/2026)
 """
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -3,9 +3,10 @@
 # ============================================
 
 from fastapi import FastAPI, Request, Form, Depends
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 from starlette.status import HTTP_302_FOUND
 from starlette.exceptions import HTTPException as StarletteHTTPException
@@ -13,7 +14,10 @@ from fastapi.exceptions import RequestValidationError
 
 import app.utils.openrouter_adapter as deepseek
 import app.utils.outlook_sync as outlook_sync
-from app.auth import authenticate_user, get_current_user, get_db
+from app.utils.schema_catalog import schema_catalog
+from app.utils.scheduler import scheduler, OUTLOOK_SYNC_INTERVAL
+from app.auth import authenticate_user, get_current_user, get_db, create_session_token, SESSION_MAX_AGE
+from app.database import async_engine, SessionLocal
 from app.models import Client, Projet
 from app.models import Facture, PlanificationCollaborateur, PrestationCollaborateur
 from app.routers import admin
@@ -90,18 +94,64 @@ implement: Esteban Barracho (v.1.3 24/06/2025)
 @app.on_event("startup")
 def startup_event():
     """Startup events when the API server is launched.
+    The database wait, the schema warm-up and the periodic Outlook
+    synchronization run in the background scheduler: the server accepts
+    requests at once, and /ready reports when the startup tasks are done.
     Version:
     --------
     specification: Esteban Barracho (v.1 11/07/2025)
-    implement: Esteban Barracho (v.2 11/07/2025)
+    implement: Esteban Barracho (v.4 17/10/2026)
     """
     print("✅ API disponible sur http://localhost:8000")
+    scheduler.add_startup_task("base_de_donnees", deepseek.prepare_adaptation)
+    scheduler.add_startup_task("schema", schema_catalog.warm_up)
+    if OUTLOOK_SYNC_INTERVAL and outlook_sync.is_configured():
+        scheduler.add_job("outlook_sync", outlook_sync.synchronize_outlook, OUTLOOK_SYNC_INTERVAL)
+    else:
+        print("⚠️  Synchronisation Outlook non planifiée (identifiants, OUTLOOK_MAILBOXES ou OUTLOOK_SYNC_INTERVAL).")
+    scheduler.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stops the background scheduler and closes the connections of the
+    asynchronous pool when the API server stops.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.2 17/10/2026)
+    """
+    scheduler.stop()
+    await async_engine.dispose()
+
+# ============================================
+# READINESS
+# ============================================
+
+@app.get("/ready")
+def readiness():
+    """Readiness probe: 200 once the startup tasks are done and the database
+    answers, 503 otherwise. The state of the scheduled jobs is informative
+    only (a slow or failing Outlook synchronization does not make the API unready).
+    Returns:
+    --------
+    JSONResponse
+        {"pret", "base_de_donnees", "erreurs_demarrage", "taches"}
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+    state = scheduler.snapshot()
+    db = SessionLocal()
     try:
-        outlook_sync.synchronize_outlook()
+        db.execute(text("SELECT 1"))
+        state["base_de_donnees"] = "ok"
     except Exception as e:
-        print(f"⚠️  Synchronisation Outlook ignorée : {e}")
-
-    deepseek.prepare_adaptation()
+        state["base_de_donnees"] = f"indisponible : {e}"
+        state["pret"] = False
+    finally:
+        db.close()
+    return JSONResponse(content=state, status_code=200 if state["pret"] else 503)
 
 # ============================================
 # PUBLIC ROADS (HTML)
@@ -148,12 +198,13 @@ def login_user(request: Request, email: str = Form(...), password: str = Form(..
     Version:
     --------
     specification: Esteban Barracho (v.1 19/06/2025)
-    implement: Esteban Barracho (v.1 19/06/2025)
+    implement: Esteban Barracho (v.2 17/10/2026)
     """
     user = authenticate_user(email=email, plain_password=password, db=db)
     if user and code == "123456": #Todo 123456 à changé pour 2AF (idée randint et envoie par mail du code journalié)
         response = RedirectResponse(url="/dashboard", status_code=HTTP_302_FOUND)
-        response.set_cookie(key="session_id", value=user.id_personnel)
+        response.set_cookie(key="session_id", value=create_session_token(user), httponly=True,
+                            samesite="lax", max_age=SESSION_MAX_AGE)
         return response
     return templates.TemplateResponse("login.html", {
         "request": request,
@@ -469,17 +520,16 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     }, status_code=422)
 
 @app.get("/encodage", response_class=HTMLResponse)
-def encodage_page(request: Request, user=Depends(get_current_user), db: Session = Depends(get_db)):
+def encodage_page(request: Request, user=Depends(get_current_user)):
     """Displays the manual encoding page for a free service, with a dynamic drop-down menu
-    of accessible projects. Only logged-in users can access it.
+    of accessible projects (filled by static/js/encodage.js from /projects/options).
+    Only logged-in users can access it.
     Parameters:
     -----------
     request: Request
     Current HTTP request (FastAPI).
     user: User
     Authenticated user (inferred via Depends).
-    db: Session
-    Active SQLAlchemy session for retrieving projects.
     Return:
     -------
     TemplateResponse
@@ -487,12 +537,10 @@ def encodage_page(request: Request, user=Depends(get_current_user), db: Session
     Version:
     --------
     specification: Esteban Barracho (v.1 14/07/2025)
-    implement: Esteban Barracho (v.1 14/07/2025)
+    implement: Esteban Barracho (v.2 17/10/2026)
     """
     assert user is not None, "Utilisateur non connecté"
-    projets = db.query(Projet).all()
     return templates.TemplateResponse("encodage.html", {
         "request": request,
-        "user": user,
-        "projets": projets
+        "user": user
     })
@@ -2,7 +2,7 @@
 # IMPORTS
 # ============================================
 
-from sqlalchemy import Column, String, Enum, Date, Boolean, DECIMAL, ForeignKey, Integer, Text
+from sqlalchemy import Column, String, Enum, Date, DateTime, Boolean, DECIMAL, ForeignKey, Integer, Text
 from sqlalchemy.orm import relationship
 from .database import Base
 
@@ -318,7 +318,7 @@ class ImportLog(Base):
     Version:
     --------
     specification: Esteban Barracho (v.1 19/06/2025)
-    implement: Esteban Barracho (v.2 26/06/2025)
+    implement: Esteban Barracho (v.4 17/10/2026)
     """
     __tablename__ = "ImportLog"
     id_import = Column(String(10), primary_key=True)
@@ -327,6 +327,8 @@ class ImportLog(Base):
     date_import = Column(Date)
     statut = Column(String(20))
     message_log = Column(Text)
+    suggestion_ia = Column(Text)
+    derniere_maj = Column(DateTime)
     id_projet = Column(String(10), ForeignKey("Projet.id_projet"), nullable=True)
     projet = relationship("Projet")
     assert __tablename__ == "ImportLog"
@@ -373,3 +375,85 @@ class Offre(Base):
     client = relationship("Client")
     assert __tablename__ == "Offre"
 
+
+# ============================================
+# TABLE : OUTLOOK EVENT
+# ============================================
+
+class EvenementOutlook(Base):
+    """ORM model for the 'EvenementOutlook' table (local copy of the synchronized Outlook calendars).
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+    __tablename__ = "EvenementOutlook"
+    id_outlook = Column(String(255), primary_key=True)
+    boite_mail = Column(String(100), nullable=False)
+    sujet = Column(String(255), nullable=False)
+    date_debut = Column(DateTime, nullable=False)
+    date_fin = Column(DateTime, nullable=False)
+    modifie_le = Column(String(40))
+    assert __tablename__ == "EvenementOutlook"
+
+class SynchroOutlook(Base):
+    """ORM model for the 'SynchroOutlook' table (Graph delta link and period of each synchronized mailbox).
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+    __tablename__ = "SynchroOutlook"
+    boite_mail = Column(String(100), primary_key=True)
+    delta_link = Column(Text)
+    debut_fenetre = Column(DateTime, nullable=False)
+    fin_fenetre = Column(DateTime, nullable=False)
+    derniere_synchro = Column(DateTime, nullable=False)
+    assert __tablename__ == "SynchroOutlook"
+
+class ExportOutlook(Base):
+    """ORM model for the 'ExportOutlook' table (Outlook event created for a task in a mailbox).
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+    __tablename__ = "ExportOutlook"
+    boite_mail = Column(String(100), primary_key=True)
+    id_tache = Column(String(10), ForeignKey("Tache.id_tache"), primary_key=True)
+    id_outlook = Column(String(255), nullable=False)
+    empreinte = Column(String(40), nullable=False)
+    exporte_le = Column(DateTime, nullable=False)
+    assert __tablename__ == "ExportOutlook"
+
+# ============================================
+# TABLE : SCHEDULED JOB
+# ============================================
+
+class TachePlanifiee(Base):
+    """ORM model for the 'TachePlanifiee' table (last run of each periodic job, shared by the workers).
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+    __tablename__ = "TachePlanifiee"
+    nom = Column(String(50), primary_key=True)
+    derniere_execution = Column(DateTime, nullable=False)
+    assert __tablename__ == "TachePlanifiee"
+
+# ============================================
+# TABLE : ID SEQUENCE
+# ============================================
+
+class IdSequence(Base):
+    """ORM model for the 'IdSequence' table (next free number of each identifier prefix).
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+    __tablename__ = "IdSequence"
+    prefixe = Column(String(10), primary_key=True)
+    prochain = Column(Integer, nullable=False)
+    assert __tablename__ == "IdSequence"
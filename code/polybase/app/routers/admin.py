@@ -2,23 +2,33 @@
 # IMPORTS
 # ============================================
 
-import random
-import string
+import csv
+import io
+import json
 import os
 import pandas as pd
-from fastapi.responses import FileResponse
-from app.utils.openrouter_adapter import adapt_excel_to_table
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import FileResponse, StreamingResponse
 
-import Levenshtein
 import bcrypt
-from fastapi import APIRouter, Depends, Request, HTTPException, status, Query
+from fastapi import APIRouter, Depends, File, Request, HTTPException, status, Query, UploadFile
 from fastapi.responses import JSONResponse
 from fastapi.templating import Jinja2Templates
-from sqlalchemy import inspect, text
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app.auth import get_current_user
-from app.database import get_db
+from app.auth import get_current_user, user_cache
+from app.database import (get_db, SessionLocal, engine, async_engine, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT,
+                          DB_POOL_RECYCLE, DB_PRE_PING, DB_ASYNC_POOL_SIZE, DB_ASYNC_MAX_OVERFLOW, DB_CONNECTION_BUDGET)
+from app.utils.index_advisor import advise
+from app.utils.pool_metrics import pool_metrics, async_pool_metrics
+from app.utils.dashboard_aggregates import aggregates
+from app.utils.id_allocator import id_allocator, table_prefixes, ID_RETRIES
+from app.utils.import_jobs import import_jobs
+from app.utils.response_cache import response_cache, SCHEMA_TAG
+from app.utils.schema_catalog import schema_catalog
+from app.utils.search_index import search_index
 
 # ============================================
 # ROUTER INITIALIZATION
@@ -29,48 +39,6 @@ templates = Jinja2Templates(directory="templates")
 UPLOAD_DIR = "uploaded_files"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
-# ============================================
-# MANAGEMENT OF IDENTIFIER PREFIXES
-# ============================================
-table_prefixes = {
-    "Client": "CL",
-    "Personnel": "P",
-    "Projet": "PRJ",
-    "Facture": "F",
-    "Tache": "T",
-    "Phase": "PH",
-    "PlanificationCollaborateur": "PL",
-    "PrestationCollaborateur": "PC",
-    "Cout": "C",
-    "ImportLog": "IMP",
-    "Offre": "OFF",
-    "HonoraireReparti": "HR",
-    "ResponsableProjet": "P",
-    "Collaborateur": "P",
-    "Gerer": None,
-    "ProjectionFacturation": "PF"
-}
-
-def generate_id(prefix, length=3):
-    """Generates a unique business identifier from a prefix and a random number.
-    Parameters:
-    -----------
-    prefix: str
-        Prefix of the identifier (e.g. “CL”, “PRJ”, “T”).
-    length: int, optional
-        Length of the randomly generated numeric part (default: 3).
-    Returns:
-    --------
-    str
-        Concatenated identifier of type `prefix` + `random digits`, e.g.: “CL001”.
-    Version:
-    --------
-    specification: Esteban Barracho (v.1 26/06/2025)
-    implement: Esteban Barracho (v.1 26/06/2025)
-    """
-    num = ''.join(random.choices(string.digits, k=length))
-    return f"{prefix}{num}"
-
 # ============================================
 # ADMIN ACCESS
 # ============================================
@@ -93,6 +61,36 @@ def check_admin(user):
             detail="Accès réservé à l'administrateur."
         )
 
+# ============================================
+# DERIVED DATA AFTER A WRITE
+# ============================================
+def refresh_after_write(db: Session, table: str, key: dict, deleted: bool = False):
+    """Brings the caches and the search index up to date after a committed write.
+    The write is already committed: a failure here is logged and the search
+    index is rebuilt in the background, the request itself still succeeds.
+    Parameters:
+    -----------
+    db (Session): Active database session (after commit).
+    table (str): Written table.
+    key (dict): {primary key column: value} of the written row.
+    deleted (bool): True when the row was deleted.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+    aggregates.invalidate_for(table)
+    response_cache.invalidate(table)
+    try:
+        if deleted:
+            search_index.remove_row(table, key)
+        else:
+            search_index.refresh_row(db, table, key)
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Mise à jour de l'index de recherche échouée ({table}) : {e}")
+        search_index.schedule_rebuild()
+
 # ============================================
 # ADMIN HTML PAGE
 # ============================================
@@ -118,10 +116,12 @@ async def admin_page(request: Request, user=Depends(get_current_user)):
 # LIST OF TABLES
 # ============================================
 @router.get("/tables")
-def get_tables(db: Session = Depends(get_db), user=Depends(get_current_user)):
+def get_tables(request: Request, db: Session = Depends(get_db), user=Depends(get_current_user)):
     """Returns a list of all non-view tables in the database schema.
+    Served from `response_cache` (ETag / 304) until the schema is refreshed.
     Parameters:
     -----------
+    request (Request): Current request (cache key and conditional headers).
     db (Session): Database session.
     user: Authenticated admin user.
     Returns:
@@ -130,23 +130,134 @@ def get_tables(db: Session = Depends(get_db), user=Depends(get_current_user)):
     Version:
     --------
     specification: Esteban Barracho (v.1 26/06/2025)
-    implement: Esteban Barracho (v.1 26/06/2025)
+    implement: Esteban Barracho (v.3 17/10/2026)
+    """
+    check_admin(user)
+    return response_cache.respond(request, (SCHEMA_TAG,),
+                                  lambda: [t for t in schema_catalog.table_names(db) if not t.startswith('Vue')])
+
+@router.post("/schema/refresh")
+def refresh_schema(user=Depends(get_current_user)):
+    """Drops the cached schema metadata so that it is reflected again
+    (to be called after a schema migration applied while the server runs).
+    Parameters:
+    -----------
+    user: Authenticated admin user.
+    Returns:
+    --------
+    dict: Confirmation message.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.2 17/10/2026)
+    """
+    check_admin(user)
+    schema_catalog.invalidate()
+    response_cache.invalidate(SCHEMA_TAG)
+    search_index.schedule_rebuild()
+    return {"status": "ok"}
+
+# ============================================
+# CONNECTION POOL METRICS
+# ============================================
+@router.get("/pool")
+def pool_status(user=Depends(get_current_user)):
+    """Reports the state of the database connection pools (synchronous and
+    asynchronous engines): configuration, connections checked out / idle / in
+    overflow, checkout counters and checkout wait time percentiles (to detect
+    pool exhaustion under load).
+    Parameters:
+    -----------
+    user: Authenticated admin user.
+    Returns:
+    --------
+    dict: Shared configuration, per-pool usage and metrics, connection budget of the worker.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.2 17/10/2026)
+    """
+    check_admin(user)
+
+    def usage(pool, size, overflow, metrics):
+        return {
+            "pool_size": size,
+            "max_overflow": overflow,
+            "utilisation": {
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(0, pool.overflow()),
+                "capacite": size + overflow
+            },
+            "metriques": metrics.snapshot()
+        }
+
+    return {
+        "configuration": {
+            "pool_timeout": DB_POOL_TIMEOUT,
+            "pool_recycle": DB_POOL_RECYCLE,
+            "pre_ping": DB_PRE_PING,
+            "budget_connexions": DB_CONNECTION_BUDGET
+        },
+        "synchrone": usage(engine.pool, DB_POOL_SIZE, DB_MAX_OVERFLOW, pool_metrics),
+        "asynchrone": usage(async_engine.pool, DB_ASYNC_POOL_SIZE, DB_ASYNC_MAX_OVERFLOW, async_pool_metrics)
+    }
+
+# ============================================
+# RESPONSE CACHE METRICS
+# ============================================
+@router.get("/cache")
+def cache_status(user=Depends(get_current_user)):
+    """Reports the hit / miss / 304 counters of the response cache of the
+    reference endpoints (clients, offers, projects, admin tables and structures).
+    Parameters:
+    -----------
+    user: Authenticated admin user.
+    Returns:
+    --------
+    dict: Number of cached responses and counters.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+    check_admin(user)
+    return response_cache.snapshot()
+
+# ============================================
+# INDEX ADVISOR
+# ============================================
+@router.get("/index-advisor")
+def index_advisor(user=Depends(get_current_user), db: Session = Depends(get_db)):
+    """Runs EXPLAIN on the known queries of the application and reports the
+    full table scans and the recommended secondary indexes missing from the database.
+    Parameters:
+    -----------
+    user: Authenticated admin user.
+    db (Session): Active database session.
+    Returns:
+    --------
+    dict: {"requetes": [...], "index_manquants": [...]}
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
     """
     check_admin(user)
-    inspector = inspect(db.get_bind())
-    tables = [t for t in inspector.get_table_names() if not t.startswith('Vue')]
-    return tables
+    return advise(db)
 
 # ============================================
 # TABLE STRUCTURE
 # ============================================
 @router.get("/table/{table}/structure")
-def get_table_structure(table: str, db: Session = Depends(get_db), user=Depends(get_current_user)):
+def get_table_structure(table: str, request: Request, db: Session = Depends(get_db), user=Depends(get_current_user)):
     """Retrieves the structure of a specific table, including types, nullability, and examples,
     and detects foreign key relationships for dynamic dropdowns.
+    Served from `response_cache` (ETag / 304) until the schema is refreshed.
     Parameters:
     -----------
     table (str): Name of the table to inspect.
+    request (Request): Current request (cache key and conditional headers).
     Db (Session): Database session.
     user: Authenticated admin user.
     Returns:
@@ -155,17 +266,30 @@ def get_table_structure(table: str, db: Session = Depends(get_db), user=Depends(
     Version:
     --------
     specification: Esteban Barracho (v.1.3 11/07/2025)
-    implement: Esteban Barracho (v.1.3 11/07/2025)
+    implement: Esteban Barracho (v.3 17/10/2026)
     """
     check_admin(user)
-    inspector = inspect(db.get_bind())
-    fk_map = {}
-    for fk in inspector.get_foreign_keys(table):
-        if fk.get("constrained_columns") and fk.get("referred_table"):
-            for col in fk["constrained_columns"]:
-                fk_map[col] = fk["referred_table"]
+    if not schema_catalog.has_table(db, table):
+        raise HTTPException(404, detail="Table inconnue")
+    return response_cache.respond(request, (SCHEMA_TAG,), lambda: table_structure(db, table))
+
+def table_structure(db: Session, table: str) -> list:
+    """Builds the column metadata returned by `get_table_structure`.
+    Parameters:
+    -----------
+    db (Session): Database session.
+    table (str): Name of an existing table.
+    Returns:
+    --------
+    list[dict]: Column metadata including foreign key target if applicable.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+    fk_map = schema_catalog.fk_map(db, table)
     cols = []
-    for c in inspector.get_columns(table):
+    for c in schema_catalog.columns(db, table):
         ex = "Exemple : "
         tpe = str(c["type"]).upper()
         if "VARCHAR" in tpe:
@@ -194,27 +318,96 @@ def get_table_structure(table: str, db: Session = Depends(get_db), user=Depends(
 # ============================================
 # TABLE DATA
 # ============================================
+STREAM_BATCH_SIZE = 500
+STREAM_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+def table_select(table: str):
+    """Builds the SELECT used to read an admin table (administrators are hidden from Personnel).
+    Parameters:
+    -----------
+    table (str): Table name.
+    Returns:
+    --------
+    TextClause: SQL statement selecting the rows of the table.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+    if table == "Personnel":
+        return text("SELECT * FROM Personnel WHERE fonction != 'admin'")
+    return text(f"SELECT * FROM `{table}`")
+
+def stream_table_rows(table: str, fmt: str):
+    """Yields the rows of a table as NDJSON or CSV chunks read from a server-side cursor.
+    The generator owns its session: the request session is already closed
+    when the streamed body is sent. Rows are fetched `STREAM_BATCH_SIZE` at a
+    time, so memory stays flat whatever the table size.
+    Parameters:
+    -----------
+    table (str): Table name (already validated).
+    fmt (str): "ndjson" or "csv".
+    Yields:
+    -------
+    str: A chunk of NDJSON lines or CSV records.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+    db = SessionLocal()
+    try:
+        result = db.execute(table_select(table),
+                            execution_options={"stream_results": True, "yield_per": STREAM_BATCH_SIZE})
+        columns = list(result.keys())
+        if fmt == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(columns)
+            yield buffer.getvalue()
+        for partition in result.mappings().partitions():
+            rows = jsonable_encoder([dict(row) for row in partition])
+            if table == "Personnel":
+                for row in rows:
+                    if "password" in row:
+                        row["password"] = "********"
+            if fmt == "csv":
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                writer.writerows([row.get(c) for c in columns] for row in rows)
+                yield buffer.getvalue()
+            else:
+                yield "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+    finally:
+        db.close()
+
 @router.get("/table/{table}")
-def get_table_data(table: str, db: Session = Depends(get_db), user=Depends(get_current_user)):
-    """Retrieves all records from the specified table (max 200 rows by design).
+def get_table_data(table: str, fmt: str = Query("json", alias="format", pattern="^(json|ndjson|csv)$"),
+                   db: Session = Depends(get_db), user=Depends(get_current_user)):
+    """Retrieves all records from the specified table.
+    With `format=ndjson` or `format=csv` the rows are streamed from a server-side
+    cursor instead of being materialized in one JSON body.
     Parameters:
     -----------
     table (str): Table name.
+    fmt (str): Output format, "json" (default), "ndjson" or "csv" (query parameter `format`).
     db (Session): Active SQLAlchemy session.
     user: Authenticated admin user.
     Returns:
     --------
-    list[dict]: List of records from the table.
+    list[dict] | StreamingResponse: List of records, or the streamed rows.
     Version:
     --------
     specification: Esteban Barracho (v.1 26/06/2025)
-    implement: Esteban Barracho (v.2 11/07/2025)
+    implement: Esteban Barracho (v.3 17/10/2026)
     """
     check_admin(user)
-    if table == "Personnel":
-        result = db.execute(text("SELECT * FROM Personnel WHERE fonction != 'admin'"))
-    else:
-        result = db.execute(text(f"SELECT * FROM `{table}`"))
+    if fmt in STREAM_MEDIA_TYPES:
+        if not schema_catalog.has_table(db, table):
+            raise HTTPException(404, detail="Table inconnue")
+        headers = {"Content-Disposition": f'inline; filename="{table}.{fmt}"'}
+        return StreamingResponse(stream_table_rows(table, fmt), media_type=STREAM_MEDIA_TYPES[fmt], headers=headers)
+    result = db.execute(table_select(table))
     data = [dict(row) for row in result.mappings()]
     for row in data:
         if table == "Personnel" and "password" in row:
@@ -239,17 +432,17 @@ def insert_row(table: str, row: dict, db: Session = Depends(get_db), user=Depend
     Version:
     --------
     specification: Esteban Barracho (v.1 26/06/2025)
-    implement: Esteban Barracho (v.1 27/06/2025)
+    implement: Esteban Barracho (v.6 17/10/2026)
     """
     check_admin(user)
-    inspector = inspect(db.get_bind())
-    if table not in inspector.get_table_names():
+    if not schema_catalog.has_table(db, table):
         raise HTTPException(404, detail="Table inconnue")
-    columns = {c["name"]: c for c in inspector.get_columns(table)}
+    columns = schema_catalog.column_map(db, table)
     assert isinstance(columns, dict) and len(columns) > 0, f"Structure de la table `{table}` vide ou invalide"
     insert_row = {}
     # Forcer la détection de l'ID principal même si inspect échoue
-    id_field = next((name for name, col in columns.items() if name.startswith("id_") and col.get("primary_key")), None)
+    pk_columns = schema_catalog.primary_key(db, table)
+    id_field = next((name for name in pk_columns if name.startswith("id_")), None)
     if not id_field:
         for fallback in ["id_" + table.lower(), f"id_{table}"]:
             if fallback in columns:
@@ -257,17 +450,7 @@ def insert_row(table: str, row: dict, db: Session = Depends(get_db), user=Depend
                 break
     prefix = table_prefixes.get(table)
     assert prefix is None or isinstance(prefix, str), f"Préfixe mal défini pour la table {table}"
-    if id_field and prefix:
-        # Vérifie unicité et regénère si existe déjà (boucle protection)
-        for _ in range(10):
-            new_id = generate_id(prefix)
-            assert new_id.startswith(prefix), f"ID généré ne commence pas par le préfixe {prefix}"
-            exists = db.execute(text(f"SELECT 1 FROM `{table}` WHERE `{id_field}` = :id"), {"id": new_id}).first()
-            if not exists:
-                insert_row[id_field] = new_id
-                break
-        else:
-            raise HTTPException(500, detail="Impossible de générer un identifiant unique.")
+    generated = bool(id_field and prefix)
 
     # INJECTION DES AUTRES CHAMPS (hors ID et password)
     for k, v in row.items():
@@ -290,17 +473,33 @@ def insert_row(table: str, row: dict, db: Session = Depends(get_db), user=Depend
         else:
             insert_row[k] = v if v not in ("", None) else None
     # CONSTRUCTION ET EXECUTION SQL
+    if generated:
+        insert_row[id_field] = None
     keys = ", ".join([f"`{k}`" for k in insert_row])
     vals = ", ".join([f":{k}" for k in insert_row])
     sql = text(f"INSERT INTO `{table}` ({keys}) VALUES ({vals})")
-    try:
-        db.execute(sql, insert_row)
-        db.commit()
-        assert db.execute(text(f"SELECT 1 FROM `{table}` WHERE `{id_field}` = :id"),
-                          {"id": insert_row.get(id_field)}).first(), "Échec de l'insertion, l’ID n’existe pas en base"
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(400, detail=f"Erreur lors de l’insertion : {e}")
+    for attempt in range(ID_RETRIES):
+        try:
+            if generated:
+                insert_row[id_field] = id_allocator.next_id(prefix)
+        except OverflowError as e:
+            raise HTTPException(500, detail=f"Impossible de générer un identifiant unique : {e}")
+        try:
+            db.execute(sql, insert_row)
+            db.commit()
+            assert db.execute(text(f"SELECT 1 FROM `{table}` WHERE `{id_field}` = :id"),
+                              {"id": insert_row.get(id_field)}).first(), "Échec de l'insertion, l’ID n’existe pas en base"
+            break
+        except IntegrityError as e:
+            db.rollback()
+            if (not generated or attempt == ID_RETRIES - 1
+                    or not id_allocator.taken(db, table, [insert_row[id_field]])):
+                raise HTTPException(400, detail=f"Erreur lors de l’insertion : {e}")
+            id_allocator.resync(prefix)  # identifiant déjà écrit explicitement (import, création manuelle)
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(400, detail=f"Erreur lors de l’insertion : {e}")
+    refresh_after_write(db, table, {c: insert_row.get(c) for c in pk_columns})
     # Retourne l'identifiant généré (pour liaison côté client)
     return {"status": "ok", "id": insert_row.get(id_field)}
 
@@ -308,11 +507,15 @@ def insert_row(table: str, row: dict, db: Session = Depends(get_db), user=Depend
 # GLOBAL LEVENSHTEIN SEARCH ON ALL TABLES
 # ============================================
 @router.get("/search_global")
-def search_global(query: str = Query(..., min_length=1),db: Session = Depends(get_db),user=Depends(get_current_user)):
+def search_global(query: str = Query(..., min_length=1), limit: int = Query(50, ge=1, le=500),
+                  db: Session = Depends(get_db), user=Depends(get_current_user)):
     """Performs a fuzzy Levenshtein search across all business tables.
+    Candidates come from the trigram index (`app.utils.search_index`) and only
+    the rows of the top-ranked hits are read from the database.
     Parameters:
     -----------
     query (str): Search string (minimum 1 character).
+    limit (int): Maximum number of results (top-k).
     db (Session): Active database session.
     user: Authenticated admin user.
     Returns:
@@ -321,33 +524,36 @@ def search_global(query: str = Query(..., min_length=1),db: Session = Depends(ge
     Version:
     --------
     specification: Esteban Barracho (v.1 26/06/2025)
-    implement: Esteban Barracho (v.1 27/06/2025)
+    implement: Esteban Barracho (v.2 17/10/2026)
     """
     check_admin(user)
-    inspector = inspect(db.get_bind())
+    search_index.ensure_ready(db)
+    hits = search_index.search(query, k=limit)
+    rows = {}
+    for table in {h["table"] for h in hits}:
+        pk_cols = search_index.primary_key(table)
+        keys = list({h["pk"] for h in hits if h["table"] == table})
+        where = " OR ".join(
+            "(" + " AND ".join(f"`{c}` = :k{i}_{j}" for j, c in enumerate(pk_cols)) + ")" for i in range(len(keys))
+        )
+        params = {f"k{i}_{j}": v for i, key in enumerate(keys) for j, v in enumerate(key)}
+        for row in db.execute(text(f"SELECT * FROM `{table}` WHERE {where}"), params).mappings():
+            rows[(table, tuple(row[c] for c in pk_cols))] = dict(row)
     results = []
-    tables = [t for t in inspector.get_table_names() if not t.startswith('Vue')]
-    for table in tables:
-        # Prends max 200 lignes/table
-        rows = db.execute(text(f"SELECT * FROM `{table}` LIMIT 200")).mappings().all()
-        columns = [col["name"] for col in inspector.get_columns(table)]
-        id_field = next((c for c in columns if c.startswith("id_")), None)
-        for row in rows:
-            for col in columns:
-                value = row.get(col)
-                if value is None:
-                    continue
-                score = Levenshtein.distance(query.lower(), str(value).lower())
-                if score < 4:  # seuil : à ajuster selon tolérance
-                    results.append({
-                        "table": table,
-                        "id": row.get(id_field),
-                        "col": col,
-                        "value": value,
-                        "score": score,
-                        "row": dict(row)
-                    })
-    results.sort(key=lambda r: (r["score"], r["table"], r["col"]))
+    for h in hits:
+        row = rows.get((h["table"], h["pk"]))
+        if row is None:
+            continue
+        row.pop("password", None)
+        id_field = next((c for c in row if c.startswith("id_")), None)
+        results.append({
+            "table": h["table"],
+            "id": row.get(id_field),
+            "col": h["col"],
+            "value": row.get(h["col"]),
+            "score": h["score"],
+            "row": row
+        })
     return results
 
 # ============================================
@@ -369,18 +575,16 @@ def update_row(table: str, id: str, row: dict, db: Session = Depends(get_db), us
     Version:
     --------
     specification: Esteban Barracho (v.1 26/06/2025)
-    implement: Esteban Barracho (v.1 27/06/2025)
+    implement: Esteban Barracho (v.5 17/10/2026)
     """
     check_admin(user)
-    inspector = inspect(db.get_bind())
-    if table not in inspector.get_table_names():
+    if not schema_catalog.has_table(db, table):
         raise HTTPException(404, detail="Table inconnue")
-    pk = inspector.get_pk_constraint(table)
-    assert "constrained_columns" in pk, f"Clé primaire introuvable pour la table `{table}`"
-    id_field = pk['constrained_columns'][0] if pk['constrained_columns'] else None
+    pk_columns = schema_catalog.primary_key(db, table)
+    id_field = pk_columns[0] if pk_columns else None
     if not id_field:
         raise HTTPException(400, detail="Impossible de déterminer la clé primaire.")
-    columns = {c["name"]: c for c in inspector.get_columns(table)}
+    columns = schema_catalog.column_map(db, table)
     updates = []
     values = {}
     for k, v in row.items():
@@ -395,10 +599,13 @@ def update_row(table: str, id: str, row: dict, db: Session = Depends(get_db), us
     try:
         db.execute(sql, values)
         db.commit()
-        return {"status": "ok"}
     except Exception as e:
         db.rollback()
         raise HTTPException(400, detail=f"Erreur lors de la mise à jour : {e}")
+    refresh_after_write(db, table, {id_field: id})
+    if table == "Personnel":
+        user_cache.invalidate(id)
+    return {"status": "ok"}
 
 # ============================================
 # DELETING AN ENTRY (DELETE)
@@ -418,14 +625,13 @@ def delete_row(table: str, id: str, db: Session = Depends(get_db), user=Depends(
     Version:
     --------
     specification: Esteban Barracho (v.1 26/06/2025)
-    implement: Esteban Barracho (v.2 11/07/2025)
+    implement: Esteban Barracho (v.6 17/10/2026)
     """
     check_admin(user)
-    inspector = inspect(db.get_bind())
-    if table not in inspector.get_table_names():
+    if not schema_catalog.has_table(db, table):
         raise HTTPException(404, detail="Table inconnue")
-    pk = inspector.get_pk_constraint(table)
-    id_field = pk['constrained_columns'][0] if pk['constrained_columns'] else None
+    pk_columns = schema_catalog.primary_key(db, table)
+    id_field = pk_columns[0] if pk_columns else None
     if not id_field:
         raise HTTPException(400, detail="Impossible de déterminer la clé primaire.")
     if table == "Personnel":
@@ -436,13 +642,16 @@ def delete_row(table: str, id: str, db: Session = Depends(get_db), user=Depends(
     try:
         result = db.execute(sql, {"id": id})
         db.commit()
-        if result.rowcount == 0:
-            raise HTTPException(404, detail="Aucune ligne supprimée")
-        return {"status": "ok"}
     except Exception as e:
         db.rollback()
         print(f"❌ Erreur DELETE {table}({id}): {e}")
         raise HTTPException(400, detail=f"Erreur lors de la suppression : {e}")
+    if result.rowcount == 0:
+        raise HTTPException(404, detail="Aucune ligne supprimée")
+    refresh_after_write(db, table, {id_field: id}, deleted=True)
+    if table == "Personnel":
+        user_cache.invalidate(id)
+    return {"status": "ok"}
 
 def detect_foreign_keys(table: str, db: Session):
     """Detects foreign key relationships for a given SQL table.
@@ -463,17 +672,10 @@ def detect_foreign_keys(table: str, db: Session):
     Version:
     --------
     specification: Esteban Barracho (v.1 26/06/2025)
-    implement: Esteban Barracho (v.1.1 11/07/2025)
+    implement: Esteban Barracho (v.2 17/10/2026)
     """
-    inspector = inspect(db.get_bind())
-    fks = inspector.get_foreign_keys(table)
-    assert isinstance(fks, list), "Les clés étrangères doivent être une liste"
-    fk_map = {}
-
-    for fk in fks:
-        if fk.get("constrained_columns") and fk.get("referred_table"):
-            for col in fk["constrained_columns"]:
-                fk_map[col] = fk["referred_table"]
+    fk_map = schema_catalog.fk_map(db, table)
+    assert isinstance(fk_map, dict), "Les clés étrangères doivent être un dictionnaire"
     return fk_map
 
 # =============================================
@@ -507,15 +709,22 @@ def export_table(table: str, db: Session = Depends(get_db), user=Depends(get_cur
     df.to_excel(file_path, index=False)
     return FileResponse(file_path, filename=f"{table}.xlsx", media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
 
-@router.post("/import/{table}")
-async def import_table(table: str, request: Request, db: Session = Depends(get_db), user=Depends(get_current_user)):
-    """This route allows an administrator to import an Excel file and adapt it to the structure of a given SQL table.
+IMPORT_CHUNK_SIZE = 1024 * 1024
+IMPORT_EXTENSIONS = {".xlsx", ".xlsm", ".xls", ".csv"}
+
+@router.post("/import/{table}", status_code=202)
+def import_table(table: str, file: UploadFile = File(...), db: Session = Depends(get_db),
+                 user=Depends(get_current_user)):
+    """This route allows an administrator to import an Excel or CSV file and adapt it to the structure of a given SQL table.
+    The route runs in the threadpool (its database calls are synchronous); the
+    upload is copied to disk by chunks and the import runs as a background
+    job, whose progress is available on `/admin/import/jobs/{id}`.
     Parameters:
     -----------
     table: str
-        Name of the target table for import.
-    request: Request
-        HTTP request containing the Excel file.
+        Name of the target SQL table for import.
+    file: UploadFile
+        Excel (.xlsx) or CSV file of the multipart form.
     db: Session
         Injected SQLAlchemy session.
     user: User
@@ -523,20 +732,53 @@ async def import_table(table: str, request: Request, db: Session = Depends(get_d
     Return:
     -------
     dict
-        Dictionary containing the status of the operation,
-        the number of entries inserted, and an AI suggestion.
+        Dictionary containing the status of the operation and the job identifier.
     Version:
     --------
     specification: Esteban Barracho (v.1 12/07/2025)
-    implement: Esteban Barracho (v.1 12/07/2025)
+    implement: Esteban Barracho (v.5 17/10/2026)
     """
     check_admin(user)
-    form = await request.form()
-    file = form["file"]
-    contents = await file.read()
-    path = os.path.join(UPLOAD_DIR, f"import_{table}.xlsx")
-    with open(path, "wb") as f:
-        f.write(contents)
-    inserted, suggestion = adapt_excel_to_table(table=table, file_path=path, db=db)
-    return {"status": "ok", "inserted": inserted, "suggestion": suggestion}
+    if not schema_catalog.has_table(db, table):
+        raise HTTPException(404, detail="Table inconnue")
+    job_id = import_jobs.create(db, table, file.filename or f"{table}.xlsx")
+    extension = os.path.splitext(file.filename or "")[1].lower()
+    path = os.path.join(UPLOAD_DIR, f"import_{job_id}{extension if extension in IMPORT_EXTENSIONS else '.xlsx'}")
+    try:
+        with open(path, "wb") as f:
+            while chunk := file.file.read(IMPORT_CHUNK_SIZE):
+                f.write(chunk)
+        import_jobs.submit(job_id, path)
+    except Exception as e:
+        import_jobs.fail(job_id, str(e))
+        if os.path.exists(path):
+            os.remove(path)
+        raise HTTPException(500, detail=f"Import {job_id} non démarré : {e}")
+    return {"status": "ok", "job_id": job_id}
 
+@router.get("/import/jobs/{job_id}")
+def import_job_status(job_id: str, db: Session = Depends(get_db), user=Depends(get_current_user)):
+    """Returns the progress of an import job: rows parsed, inserted and rejected,
+    the AI suggestion once available and the final status.
+    Parameters:
+    -----------
+    job_id: str
+        Identifier returned by the import route (ImportLog.id_import).
+    db: Session
+        Injected SQLAlchemy session.
+    user: User
+        Logged-in user (must be an administrator).
+    Return:
+    -------
+    dict
+        Job state ("en_attente", "en_cours", "succès", "partiel", "échec" or "interrompu").
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+    check_admin(user)
+    state = import_jobs.status(db, job_id)
+    if state is None:
+        raise HTTPException(404, detail="Import introuvable")
+    return state
@@ -5,26 +5,11 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
-from ..database import SessionLocal
+from ..database import get_db
 from ..models import HonoraireReparti
 from ..models import ProjectionFacturation, PlanificationCollaborateur, Facture
 from ..schemas import HonoraireRepartiCreate, ProjectionFacturationCreate, ProjectionFacturationOut
-
-# ============================================
-# DATABASE DEPENDENCY
-# ============================================
-def get_db():
-    """Provides a database session for dependency injection.
-    Version:
-    --------
-    specification: Esteban Barracho (v.1 19/06/2025)
-    implement: Esteban Barracho (v.2 22/06/2025)
-    """
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+from ..utils.dashboard_aggregates import aggregates
 
 # ============================================
 # ROUTER INITIALIZATION
@@ -78,6 +63,7 @@ def delete_projection(id_projection: str, db: Session = Depends(get_db)):
     assert projection.id_projection == id_projection, "ID incohérent avec l'objet récupéré"
     db.delete(projection)
     db.commit()
+    aggregates.refresh_projection(db, id_projection)
     return {"message": f"Projection {id_projection} deleted successfully"}
 
 
@@ -104,6 +90,7 @@ def delete_facture(id_facture: str, db: Session = Depends(get_db)):
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Deletion failed: {str(e)}")
+    aggregates.invalidate()
 
     return {"message": f"Facture {id_facture} deleted successfully"}
 
@@ -169,4 +156,5 @@ def update_projection_facturation(id_projection: str, update: ProjectionFacturat
         setattr(proj, key, value)
     db.commit()
     db.refresh(proj)
+    aggregates.refresh_projection(db, id_projection, proj.id_projection)
     return proj
@@ -2,11 +2,16 @@
 # IMPORTS
 # ============================================
 
-from fastapi import APIRouter, Depends, HTTPException, Body
+from fastapi import APIRouter, Depends, HTTPException, Body, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from ..database import SessionLocal
+from ..database import get_db, get_async_db
 from ..models import Client, Facture
 from ..schemas import ClientOut
+from ..utils.dashboard_aggregates import aggregates
+from ..utils.id_allocator import id_allocator
+from ..utils.pagination import PageParams, page_model, paginate_async
+from ..utils.response_cache import response_cache
 
 # ============================================
 # ROUTER INITIALIZATION
@@ -14,45 +19,32 @@ from ..schemas import ClientOut
 
 router = APIRouter()
 
-# ============================================
-# DATABASE DEPENDENCY
-# ============================================
-def get_db():
-    """Provides a database session for dependency injection.
-    Yields:
-    -------
-    Session: SQLAlchemy session instance.
-
-    Version:
-    --------
-    specification: Esteban Barracho (v.1 19/06/2025)
-    implement: Esteban Barracho (v.1 19/06/2025)
-    """
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 # ============================================
 # ROUTE : List All Clients
 # ============================================
 
-@router.get("/clients")
-def list_clients(db: Session = Depends(get_db)):
-    """Retrieves all registered clients from the database.
+@router.get("/clients", response_model=list[page_model(ClientOut)], response_model_exclude_unset=True)
+async def list_clients(request: Request, response: Response, page: PageParams = Depends(),
+                       db: AsyncSession = Depends(get_async_db)):
+    """Retrieves one page of registered clients, sorted by identifier (keyset pagination).
+    The page is served from `response_cache` (ETag / 304) until a client is written.
     Parameters:
     -----------
-    db (Session): Database session provided by dependency.
+    request (Request): Current request (cache key and conditional headers).
+    response (Response): Receives the `X-Next-Cursor` header.
+    page (PageParams): Pagination (limit, cursor) and projection (fields) parameters.
+    db (AsyncSession): Database session provided by dependency.
     Returns:
     --------
-    list[Client]: List of client records.
+    list[Client]: A page of client records; the next cursor is sent in the `X-Next-Cursor` header.
     Version:
     --------
     specification: Esteban Barracho (v.1 19/06/2025)
-    implement: Esteban Barracho (v.1 19/06/2025)
+    implement: Esteban Barracho (v.5 17/10/2026)
     """
-    return db.query(Client).all()
+    return await response_cache.respond_async(request, ("Client",),
+                                              lambda: paginate_async(db, Client, ClientOut, page, response),
+                                              response=response, model=list[page_model(ClientOut)])
 
 # ============================================
 # ROUTE : Create New Client
@@ -70,7 +62,7 @@ def create_client(client: ClientOut = Body(...), db: Session = Depends(get_db)):
     Version:
     --------
     specification: Esteban Barracho (v.1 21/06/2025)
-    implement: Esteban Barracho (v.1 19/06/2025)
+    implement: Esteban Barracho (v.3 17/10/2026)
     """
     if db.query(Client).filter(Client.id_client == client.id_client).first():
         raise HTTPException(status_code=400, detail="Client ID already exists")
@@ -79,6 +71,8 @@ def create_client(client: ClientOut = Body(...), db: Session = Depends(get_db)):
     db.add(db_client)
     db.commit()
     db.refresh(db_client)
+    id_allocator.advance("Client", [db_client.id_client])
+    response_cache.invalidate("Client")
     return db_client
 
 # ============================================
@@ -97,7 +91,7 @@ def delete_client(id_client: str, db: Session = Depends(get_db)):
     Version:
     --------
     specification: Esteban Barracho (v.1 26/06/2025)
-    implement: Esteban Barracho (v.1 09/07/2025)
+    implement: Esteban Barracho (v.2 17/10/2026)
     """
     assert isinstance(id_client, str), "L’identifiant client doit être une chaîne"
     client = db.query(Client).filter(Client.id_client == id_client).first()
@@ -105,6 +99,8 @@ def delete_client(id_client: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Client not found")
     db.delete(client)
     db.commit()
+    aggregates.invalidate()
+    response_cache.invalidate("Client")
     return {"message": f"Client {id_client} deleted successfully"}
 
 # ============================================
@@ -135,6 +131,7 @@ def delete_facture(id_facture: str, db: Session = Depends(get_db)):
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Deletion failed: {str(e)}")
+    aggregates.invalidate()
     return {"message": f"Facture {id_facture} deleted successfully"}
 
 
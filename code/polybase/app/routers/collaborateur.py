@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
-from ..database import SessionLocal
+from ..database import get_db
 from ..models import Collaborateur
 
 # ============================================
@@ -15,26 +15,6 @@ from ..models import Collaborateur
 
 router = APIRouter()
 
-# ============================================
-# UTILITY : Database session
-# ============================================
-
-def get_db():
-    """Provides a database session for dependency injection.
-    Yields:
-    -------
-    Session: SQLAlchemy session instance.
-    Version:
-    --------
-    specification: Esteban Barracho (v.1 19/06/2025)
-    implement: Esteban Barracho (v.1 19/06/2025)
-    """
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 # ============================================
 # SCHEMA : Input
 # ============================================
@@ -2,13 +2,16 @@
 # IMPORTS
 # ============================================
 
-from fastapi import APIRouter, Depends
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.auth import get_current_user
-from app.database import SessionLocal
-from app.models import Tache, PlanificationCollaborateur, ProjectionFacturation
+from app.auth import get_current_user, get_current_user_async
+from app.database import get_db, get_async_db
+from app.models import Tache, PlanificationCollaborateur
+from app.routers.admin import check_admin
+from app.utils.dashboard_aggregates import aggregates
 
 # ============================================
 # ROUTER INITIALIZATION
@@ -16,127 +19,90 @@ from app.models import Tache, PlanificationCollaborateur, ProjectionFacturation
 
 router = APIRouter()
 
-# ============================================
-# DATABASE DEPENDENCY
-# ============================================
-
-def get_db():
-    """Provides a database session for dependency injection.
-    Yields:
-    -------
-    Session: SQLAlchemy session instance.
-    Version:
-    --------
-    specification: Esteban Barracho (v.1 19/06/2025)
-    implement: Esteban Barracho (v.1 19/06/2025)
-    """
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 # ============================================
 # ROUTE : Count tasks with delay alert
 # ============================================
 
 @router.get("/dashboard/tasks/alertes")
-def taches_en_alerte(db: Session = Depends(get_db)):
-    """Returns the number of tasks marked with a delay alert.
+async def taches_en_alerte(db: AsyncSession = Depends(get_async_db)):
+    """Returns the number of tasks marked with a delay alert (read from the aggregate store).
+    The store is only (re)built through the session when it is stale.
     Parameters:
     -----------
-    db (Session): Database session.
+    db (AsyncSession): Asynchronous database session.
     Returns:
     --------
     dict: { "taches_retard": <count> }
     Version:
     --------
     specification: Esteban Barracho (v.1 19/06/2025)
-    implement: Esteban Barracho (v.1 19/06/2025)
+    implement: Esteban Barracho (v.3 17/10/2026)
     """
-    en_retard = db.query(Tache).filter(Tache.alerte_retard == True).count()
-    return {"taches_retard": en_retard}
+    return {"taches_retard": await db.run_sync(aggregates.taches_retard)}
 
 # ============================================
 # ROUTE : Sum of exceeded hours
 # ============================================
 @router.get("/dashboard/heures-depassees")
-def total_depassement_heures(db: Session = Depends(get_db)):
-    """Returns the total number of exceeded hours across all tasks.
+async def total_depassement_heures(db: AsyncSession = Depends(get_async_db)):
+    """Returns the total number of exceeded hours across all tasks (read from the aggregate store).
     Parameters:
     -----------
-    db (Session): Database session.
+    db (AsyncSession): Asynchronous database session.
     Returns:
     --------
     dict: { "heures_depassees_totales": <sum> }
     Version:
     --------
     specification: Esteban Barracho (v.1 19/06/2025)
-    implement: Esteban Barracho (v.1 19/06/2025)
+    implement: Esteban Barracho (v.3 17/10/2026)
     """
-    result = db.query(func.sum(Tache.heures_depassees)).scalar()
-    assert result is None or isinstance(result, (float, int)), "Somme d'heures dépassées invalide"
-    return {"heures_depassees_totales": float(result or 0)}
+    return {"heures_depassees_totales": await db.run_sync(aggregates.heures_depassees)}
 
 # ============================================
 # ROUTE : Billing projection summary
 # ============================================
 @router.get("/dashboard/facturation")
-def synthese_facturation(db: Session = Depends(get_db)):
-    """Returns a summary of projected vs. actual billable amounts by project.
+async def synthese_facturation(db: AsyncSession = Depends(get_async_db)):
+    """Returns a summary of projected vs. actual billable amounts by project (read from the aggregate store).
     Parameters:
     -----------
-    db (Session): Database session.
+    db (AsyncSession): Asynchronous database session.
     Returns:
     --------
     list[dict]: List of project-level billing summaries.
     Version:
     --------
     specification: Esteban Barracho (v.1 19/06/2025)
-    implement: Esteban Barracho (v.1 19/06/2025)
+    implement: Esteban Barracho (v.3 17/10/2026)
     """
-    projets = db.query(
-        ProjectionFacturation.id_projet,
-        func.sum(ProjectionFacturation.montant_projete).label("total_projete"),
-        func.sum(ProjectionFacturation.montant_facturable_actuel).label("total_actuel")
-    ).group_by(ProjectionFacturation.id_projet).all()
-
-    resultats = []
-    for p in projets:
-        assert isinstance(p.total_projete, (int, float)), f"Montant projeté invalide pour {p.id_projet}"
-        assert isinstance(p.total_actuel, (int, float)), f"Montant facturable invalide pour {p.id_projet}"
-        resultats.append({
-            "id_projet": p.id_projet,
-            "montant_projete": float(p.total_projete),
-            "montant_facturable_actuel": float(p.total_actuel),
-            "ecart": float(p.total_projete - p.total_actuel)
-        })
-    return resultats
+    return await db.run_sync(aggregates.facturation)
 
 # ============================================
 # ROUTE : Current user’s active tasks
 # ============================================
 @router.get("/dashboard/mes-taches")
-def mes_taches(user=Depends(get_current_user), db: Session = Depends(get_db)):
+async def mes_taches(user=Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
     """Returns all non-completed tasks assigned to the current user.
     Parameters:
     -----------
     user: The authenticated user.
-    db (Session): Database session.
+    db (AsyncSession): Asynchronous database session.
     Returns:
     --------
     list[dict]: List of task data assigned to the user.
     Version:
     --------
     specification: Esteban Barracho (v.1 19/06/2025)
-    implement: Esteban Barracho (v.1 19/06/2025)
+    implement: Esteban Barracho (v.3 17/10/2026)
     """
     assert hasattr(user, "id_personnel") and isinstance(user.id_personnel,
                                                         str), "Utilisateur non authentifié ou identifiant invalide"
-    taches = db.query(Tache).join(PlanificationCollaborateur).filter(
+    result = await db.execute(select(Tache).join(PlanificationCollaborateur).where(
         PlanificationCollaborateur.id_collaborateur == user.id_personnel,
-        Tache.statut != "terminé"
-    ).all()
+        Tache.statut != "termine"
+    ))
+    taches = result.scalars().all()
 
     return [
         {
@@ -148,3 +114,112 @@ def mes_taches(user=Depends(get_current_user), db: Session = Depends(get_db)):
         }
         for t in taches
     ]
+
+# ============================================
+# ROUTE : Consolidated dashboard snapshot
+# ============================================
+@router.get("/dashboard/snapshot")
+async def dashboard_snapshot(mes_taches: bool = Query(False), user=Depends(get_current_user_async),
+                             db: AsyncSession = Depends(get_async_db)):
+    """Returns every dashboard indicator in a single round-trip.
+    The counters and the billing summary come from the aggregate store, which
+    only reads the database when it has to be (re)built; otherwise the current
+    user's open tasks are the only query. The async session is shared with
+    `get_current_user_async` (which reads nothing when the user is cached), so
+    the page costs at most one connection checkout from the async pool.
+    Parameters:
+    -----------
+    mes_taches (bool): Includes the current user's open tasks when True.
+    user: The authenticated user.
+    db (AsyncSession): Asynchronous database session shared with `get_current_user_async`.
+    Returns:
+    --------
+    dict: {
+        "taches_retard": <count>,
+        "heures_depassees_totales": <sum>,
+        "facturation": [<project billing summary>, ...],
+        "alertes_retard": {"retard_utilisateur": [...], "retard_admin": [...]},
+        "mes_taches": [...]  (only when requested)
+    }
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.4 17/10/2026)
+    """
+    assert hasattr(user, "id_personnel") and isinstance(user.id_personnel,
+                                                        str), "Utilisateur non authentifié ou identifiant invalide"
+    result = await db.execute(select(
+        Tache.id_tache, Tache.nom_tache, Tache.statut, Tache.date_debut, Tache.date_fin, Tache.alerte_retard
+    ).join(PlanificationCollaborateur).where(
+        PlanificationCollaborateur.id_collaborateur == user.id_personnel,
+        Tache.statut != "termine"
+    ).distinct())
+    taches_utilisateur = result.all()
+
+    retard_admin = []
+    if (user.fonction or "").lower() == "admin":
+        retard_admin = await db.run_sync(aggregates.ids_taches_retard)
+
+    snapshot = {
+        "taches_retard": await db.run_sync(aggregates.taches_retard),
+        "heures_depassees_totales": await db.run_sync(aggregates.heures_depassees),
+        "facturation": await db.run_sync(aggregates.facturation),
+        "alertes_retard": {
+            "retard_utilisateur": [t.id_tache for t in taches_utilisateur if t.alerte_retard],
+            "retard_admin": retard_admin
+        }
+    }
+    if mes_taches:
+        snapshot["mes_taches"] = [
+            {
+                "id_tache": t.id_tache,
+                "nom": t.nom_tache,
+                "statut": t.statut,
+                "debut": str(t.date_debut),
+                "fin": str(t.date_fin)
+            }
+            for t in taches_utilisateur
+        ]
+    return snapshot
+
+# ============================================
+# ROUTE : Rebuild the aggregate store
+# ============================================
+@router.post("/dashboard/aggregats/rebuild")
+def reconstruire_aggregats(user=Depends(get_current_user), db: Session = Depends(get_db)):
+    """Recomputes the dashboard aggregate store from the database (recovery command).
+    Parameters:
+    -----------
+    user: Authenticated admin user.
+    db (Session): Database session.
+    Returns:
+    --------
+    dict: Number of tasks and projections reloaded, and whether the snapshot was applied.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+    check_admin(user)
+    return {"status": "ok", **aggregates.rebuild(db)}
+
+# ============================================
+# ROUTE : Consistency check of the aggregate store
+# ============================================
+@router.get("/dashboard/aggregats/verification")
+def verifier_aggregats(user=Depends(get_current_user), db: Session = Depends(get_db)):
+    """Compares the incrementally maintained aggregates to a full recomputation.
+    Parameters:
+    -----------
+    user: Authenticated admin user.
+    db (Session): Database session.
+    Returns:
+    --------
+    dict: {"statut": "chargé" | "non chargé", "coherent": bool | None, "ecarts": [...]}
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.2 17/10/2026)
+    """
+    check_admin(user)
+    return aggregates.check(db)
@@ -4,13 +4,16 @@
 
 from datetime import date
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from ..database import SessionLocal
+from ..database import get_db, get_async_db
 from ..models import Facture
 from ..schemas import FactureOut
+from ..utils.dashboard_aggregates import aggregates
+from ..utils.pagination import PageParams, page_model, paginate_async
 
 # ============================================
 # SCHEMA : CREATE INVOICE
@@ -36,45 +39,31 @@ class FactureCreate(BaseModel):
 # ============================================
 router = APIRouter()
 
-# ============================================
-# DATABASE DEPENDENCY
-# ============================================
-def get_db():
-    """Provides a database session for dependency injection.
-    Yields:
-    -------
-    Session: SQLAlchemy session instance.
-    Version:
-    --------
-    specification: Esteban Barracho (v.1 19/06/2025)
-    implement: Esteban Barracho (v.1 19/06/2025)
-    """
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 # ============================================
 # ROUTE : List all invoices
 # ============================================
-@router.get("/factures", response_model=list[FactureOut])
-def list_factures(db: Session = Depends(get_db)):
-    """Returns the full list of invoices stored in the database.
+@router.get("/factures", response_model=list[page_model(FactureOut)], response_model_exclude_unset=True)
+async def list_factures(response: Response, page: PageParams = Depends(), db: AsyncSession = Depends(get_async_db)):
+    """Returns one page of invoices, sorted by identifier (keyset pagination).
+    The date range filter applies to the emission date.
     Parameters:
     -----------
-    db : Session
-        Active SQLAlchemy session for database access.
+    response : Response
+        Receives the `X-Next-Cursor` header.
+    page : PageParams
+        Pagination (limit, cursor), projection (fields) and filter parameters.
+    db : AsyncSession
+        Active asynchronous SQLAlchemy session for database access.
     Returns:
     --------
     list[FactureOut]
-        List of all invoice entries.
+        A page of invoice entries; the next cursor is sent in the `X-Next-Cursor` header.
     Version:
     --------
     specification: Esteban Barracho (v.1 19/06/2025)
-    implement: Esteban Barracho (v.1 19/06/2025)
+    implement: Esteban Barracho (v.4 17/10/2026)
     """
-    return db.query(Facture).all()
+    return await paginate_async(db, Facture, FactureOut, page, response, date_column=Facture.date_emission)
 
 # ============================================
 # ROUTE : Get one invoice by ID
@@ -207,4 +196,5 @@ def delete_facture(id_facture: str, db: Session = Depends(get_db)):
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Deletion failed: {str(e)}")
+    aggregates.invalidate()
     return {"message": f"Facture {id_facture} deleted successfully"}
@@ -2,10 +2,13 @@
 # IMPORTS
 # ============================================
 
+from decimal import Decimal
+
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_async_db
 
 # ============================================
 # ROUTER INITIALIZATION
@@ -13,15 +16,22 @@ from app.database import get_db
 
 router = APIRouter(prefix="/api/finance", tags=["Finance"])
 
+TACHE_PROJET = """
+               SELECT DISTINCT id_tache, id_projet
+               FROM PrestationCollaborateur
+               WHERE id_tache IS NOT NULL AND id_projet IS NOT NULL
+               """
+"""Task / project pairs: a task is linked to a project through the prestations encoded on it."""
+
 # =============================
 # Overspending by project
 # =============================
 @router.get("/depassements")
-def get_depassements(db: Session = Depends(get_db)):
+async def get_depassements(db: AsyncSession = Depends(get_async_db)):
     """Retrieves the total number of exceeded hours (heures_depassees) per project.
     Parameters:
     -----------
-    db (Session): Active database session used for executing SQL queries.
+    db (AsyncSession): Active asynchronous database session used for executing SQL queries.
     Returns:
     --------
     dict: A dictionary with two lists:
@@ -30,16 +40,16 @@ def get_depassements(db: Session = Depends(get_db)):
     Version:
     --------
     specification: Esteban Barracho (v.1 19/06/2025)
-    implement: Esteban Barracho (v.1 21/06/2025)
+    implement: Esteban Barracho (v.2 17/10/2026)
     """
-    result = db.execute("""
-                        SELECT p.id_projet, SUM(t.heures_depassees) AS total
-                        FROM Projet p
-                                 JOIN Tache t ON p.id_projet = t.id_projet
+    result = (await db.execute(text(f"""
+                        SELECT tp.id_projet, SUM(t.heures_depassees) AS total
+                        FROM Tache t
+                                 JOIN ({TACHE_PROJET}) tp ON tp.id_tache = t.id_tache
                         WHERE t.heures_depassees > 0
-                        GROUP BY p.id_projet
-                        """).fetchall()
-    assert all(len(row) == 2 and isinstance(row[1], (int, float)) for row in
+                        GROUP BY tp.id_projet
+                        """))).fetchall()
+    assert all(len(row) == 2 and isinstance(row[1], (int, float, Decimal)) for row in
                result), "Résultat SQL invalide pour les dépassements"
     return {
         "labels": [row[0] for row in result],
@@ -50,11 +60,11 @@ def get_depassements(db: Session = Depends(get_db)):
 # Current alerts (delays)
 # =============================
 @router.get("/alertes")
-def get_alertes(db: Session = Depends(get_db)):
+async def get_alertes(db: AsyncSession = Depends(get_async_db)):
     """Retrieves the number of delayed tasks (alerte_retard = 1) per project.
     Parameters:
     -----------
-    db (Session): Active database session used for executing SQL queries.
+    db (AsyncSession): Active asynchronous database session used for executing SQL queries.
     Returns:
     --------
     dict: A dictionary with:
@@ -63,15 +73,15 @@ def get_alertes(db: Session = Depends(get_db)):
     Version:
     --------
     specification: Esteban Barracho (v.1 19/06/2025)
-    implement: Esteban Barracho (v.1 21/06/2025)
+    implement: Esteban Barracho (v.2 17/10/2026)
     """
-    result = db.execute("""
-                        SELECT p.id_projet, COUNT(*) AS nb_alertes
+    result = (await db.execute(text(f"""
+                        SELECT tp.id_projet, COUNT(*) AS nb_alertes
                         FROM Tache t
-                                 JOIN Projet p ON t.id_projet = p.id_projet
+                                 JOIN ({TACHE_PROJET}) tp ON tp.id_tache = t.id_tache
                         WHERE t.alerte_retard = 1
-                        GROUP BY p.id_projet
-                        """).fetchall()
+                        GROUP BY tp.id_projet
+                        """))).fetchall()
     assert all(len(row) == 2 and isinstance(row[1], int) for row in result), "Résultat SQL invalide pour les alertes"
     return {
         "labels": [row[0] for row in result],
@@ -82,11 +92,12 @@ def get_alertes(db: Session = Depends(get_db)):
 # Budgets vs Costs
 # =============================
 @router.get("/budgets")
-def get_budget_vs_couts(db: Session = Depends(get_db)):
+async def get_budget_vs_couts(db: AsyncSession = Depends(get_async_db)):
     """Retrieves both estimated budgets and real computed costs per project.
+    The cost is the sum of the hours encoded on the project times their hourly rate.
     Parameters:
     -----------
-    db (Session): Active database session used for executing SQL queries.
+    db (AsyncSession): Active asynchronous database session used for executing SQL queries.
     Returns:
     --------
     dict: A dictionary containing:
@@ -96,17 +107,18 @@ def get_budget_vs_couts(db: Session = Depends(get_db)):
     Version:
     --------
     specification: Esteban Barracho (v.1 19/06/2025)
-    implement: Esteban Barracho (v.1 21/06/2025)
+    implement: Esteban Barracho (v.2 17/10/2026)
     """
-    result = db.execute("""
-                        SELECT p.id_projet, p.budget_estime, SUM(t.heures_prestees * p.taux_horaire) AS cout
+    result = (await db.execute(text("""
+                        SELECT p.id_projet,
+                               COALESCE(p.montant_total_estime, 0) AS budget,
+                               COALESCE(SUM(pr.heures_effectuees * pr.taux_horaire), 0) AS cout
                         FROM Projet p
-                                 JOIN Tache t ON t.id_projet = p.id_projet
-                                 JOIN Prestation pr ON pr.id_tache = t.id_tache
-                        GROUP BY p.id_projet, p.budget_estime
-                        """).fetchall()
-    assert all(len(row) == 3 and isinstance(row[1], (int, float)) and isinstance(row[2], (int, float)) for row in
-               result), "Résultat SQL invalide pour les budgets vs coûts"
+                                 JOIN PrestationCollaborateur pr ON pr.id_projet = p.id_projet
+                        GROUP BY p.id_projet, p.montant_total_estime
+                        """))).fetchall()
+    assert all(len(row) == 3 and isinstance(row[1], (int, float, Decimal)) and isinstance(row[2], (int, float, Decimal))
+               for row in result), "Résultat SQL invalide pour les budgets vs coûts"
     return {
         "labels": [row[0] for row in result],
         "budget": [float(row[1]) for row in result],
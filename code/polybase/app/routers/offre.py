@@ -4,12 +4,15 @@
 
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app.models import Offre
 from app.schemas import OffreCreate, OffreOut
+from app.utils.pagination import PageParams, page_model, paginate_async
+from app.utils.response_cache import response_cache
 
 # ============================================
 # ROUTER INITIALIZATION
@@ -44,7 +47,7 @@ def create_offre(offre: OffreCreate, db: Session = Depends(get_db)):
     Version:
     --------
     specification: Esteban Barracho (v.1 24/06/2025)
-    implement: Esteban Barracho (v.1 24/06/2025)
+    implement: Esteban Barracho (v.2 17/10/2026)
     """
     db_offre = db.query(Offre).filter_by(id_offre=offre.id_offre).first()
     if db_offre:
@@ -54,28 +57,39 @@ def create_offre(offre: OffreCreate, db: Session = Depends(get_db)):
     db.add(new_offre)
     db.commit()
     db.refresh(new_offre)
+    response_cache.invalidate("Offre")
     return new_offre
 
 # ============================================
 # GET ALL OFFRES
 # ============================================
-@router.get("/", response_model=List[OffreOut])
-def get_offres(db: Session = Depends(get_db)):
-    """Retrieve all Offres.
+@router.get("/", response_model=List[page_model(OffreOut)], response_model_exclude_unset=True)
+async def get_offres(request: Request, response: Response, page: PageParams = Depends(),
+                     db: AsyncSession = Depends(get_async_db)):
+    """Retrieve one page of Offres, sorted by identifier (keyset pagination).
+    The page is served from `response_cache` (ETag / 304) until an offer is written.
     Parameters:
     -----------
-    db : Session
-        Active SQLAlchemy session used to fetch data from the database.
+    request : Request
+        Current request (cache key and conditional headers).
+    response : Response
+        Receives the `X-Next-Cursor` header.
+    page : PageParams
+        Pagination (limit, cursor) and projection (fields) parameters.
+    db : AsyncSession
+        Active asynchronous SQLAlchemy session used to fetch data from the database.
     Returns:
     --------
     List[OffreOut]
-        A list of all offers registered in the database.
+        A page of offers; the next cursor is sent in the `X-Next-Cursor` header.
     Version:
     --------
     specification: Esteban Barracho (v.1 24/06/2025)
-    implement: Esteban Barracho (v.1 24/06/2025)
+    implement: Esteban Barracho (v.5 17/10/2026)
     """
-    return db.query(Offre).all()
+    return await response_cache.respond_async(request, ("Offre",),
+                                              lambda: paginate_async(db, Offre, OffreOut, page, response),
+                                              response=response, model=List[page_model(OffreOut)])
 
 # ============================================
 # GET OFFRE BY ID
@@ -131,7 +145,7 @@ def delete_offre(id_offre: str, db: Session = Depends(get_db)):
     Version:
     --------
     specification: Esteban Barracho (v.1 24/06/2025)
-    implement: Esteban Barracho (v.1 24/06/2025)
+    implement: Esteban Barracho (v.2 17/10/2026)
     """
     assert isinstance(id_offre, str), "L’identifiant de l’offre doit être une chaîne"
     offre = db.query(Offre).filter_by(id_offre=id_offre).first()
@@ -139,4 +153,5 @@ def delete_offre(id_offre: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Offre not found.")
     db.delete(offre)
     db.commit()
+    response_cache.invalidate("Offre")
     return {"detail": "Offre deleted successfully."}
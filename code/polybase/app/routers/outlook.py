@@ -2,18 +2,25 @@
 # IMPORTS
 # ============================================
 
+import asyncio
 import os
 import uuid
-from datetime import datetime, timedelta
+from datetime import date, datetime, time, timedelta
 from urllib.parse import urlencode
 
+import httpx
 import requests
-from fastapi import APIRouter, Request, Depends, Response, HTTPException
+from fastapi import APIRouter, Request, Depends, Response, HTTPException, Query
 from fastapi.responses import RedirectResponse, JSONResponse
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.auth import get_current_user, get_current_user_async
+from app.database import get_db, get_async_db
 from app.models import PlanificationCollaborateur
+from app.utils.graph_cache import graph_cache
+from app.utils.outlook_sync import GRAPH_BASE_URL, GRAPH_PAGE_SIZE, export_tasks
 
 router = APIRouter()
 
@@ -25,8 +32,11 @@ CLIENT_SECRET = os.getenv("GRAPH_CLIENT_SECRET")
 TENANT_ID = os.getenv("GRAPH_TENANT_ID")
 AUTHORITY = f"https://login.microsoftonline.com/{TENANT_ID}"
 REDIRECT_URI = "http://localhost:8000/outlook/callback"
-SCOPE = ["Calendars.Read"]
+SCOPE = ["Calendars.ReadWrite"]
 SESSION_KEY = "outlook_token"
+GRAPH_TIMEOUT = float(os.getenv("GRAPH_TIMEOUT", "15"))
+AGENDA_GRAPH_BUDGET = float(os.getenv("AGENDA_GRAPH_BUDGET", "0.08"))
+AGENDA_MAX_DAYS = 92
 
 # --------------------------------------------
 # Step 1: Launch Microsoft Authorisation
@@ -100,53 +110,224 @@ def outlook_callback(code: str, response: Response):
     response.set_cookie(key=SESSION_KEY, value=token, httponly=True, max_age=3600)
     return response
 
+# --------------------------------------------
+# Agenda: local events of a period
+# --------------------------------------------
+async def local_events(db: AsyncSession, id_collaborateur: str, start: date, end: date) -> list:
+    """Reads the local events of a collaborator overlapping [start, end[:
+    the planned tasks (IDX_Tache_dates) and the events of the mailbox
+    synchronized by outlook_sync (IDX_EvenementOutlook_boite_debut).
+    Parameters:
+    -----------
+    db: AsyncSession
+        Asynchronous SQLAlchemy session.
+    id_collaborateur: str
+        Collaborator whose agenda is read.
+    start, end: date
+        Period (end excluded).
+    Returns:
+    --------
+    list[dict]: {"id", "sujet", "date_debut", "date_fin", "source"} per event.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+    taches = await db.execute(text("""
+        SELECT DISTINCT t.id_tache, t.nom_tache, t.date_debut, t.date_fin, t.statut
+        FROM Tache t JOIN PlanificationCollaborateur p ON p.id_tache = t.id_tache
+        WHERE p.id_collaborateur = :id AND t.date_debut < :fin AND t.date_fin >= :debut
+    """), {"id": id_collaborateur, "debut": start, "fin": end})
+    events = [{
+        "id": t.id_tache,
+        "sujet": t.nom_tache,
+        "date_debut": str(t.date_debut),
+        "date_fin": str(t.date_fin),
+        "statut": t.statut,
+        "source": "tache"
+    } for t in taches]
+    synchronises = await db.execute(text("""
+        SELECT e.id_outlook, e.sujet, e.date_debut, e.date_fin
+        FROM EvenementOutlook e JOIN Personnel p ON p.email = e.boite_mail
+        WHERE p.id_personnel = :id AND e.date_debut < :fin AND e.date_fin > :debut
+    """), {"id": id_collaborateur, "debut": datetime.combine(start, time.min), "fin": datetime.combine(end, time.min)})
+    events += [{
+        "id": e.id_outlook,
+        "sujet": e.sujet,
+        "date_debut": str(e.date_debut).replace(" ", "T"),
+        "date_fin": str(e.date_fin).replace(" ", "T"),
+        "source": "outlook"
+    } for e in synchronises]
+    return events
+
+# --------------------------------------------
+# Agenda: live Outlook events of a period
+# --------------------------------------------
+async def graph_events(token: str, start: date, end: date) -> list:
+    """Reads the events of the connected Outlook account over [start, end[ (every page).
+    Parameters:
+    -----------
+    token: str
+        Delegated access token (cookie of /outlook/callback).
+    start, end: date
+        Period (end excluded).
+    Returns:
+    --------
+    list[dict]: {"id", "sujet", "date_debut", "date_fin", "source"} per event.
+    Raises:
+    -------
+    HTTPException (502): if Graph answers with an error.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+    headers = {"Authorization": f"Bearer {token}", "Prefer": f"odata.maxpagesize={GRAPH_PAGE_SIZE}"}
+    url = f"{GRAPH_BASE_URL}/me/calendarview"
+    params = {"startdatetime": f"{start.isoformat()}T00:00:00", "enddatetime": f"{end.isoformat()}T00:00:00",
+              "$select": "id,subject,start,end"}
+    events = []
+    async with httpx.AsyncClient(timeout=GRAPH_TIMEOUT) as client:
+        while url:
+            res = await client.get(url, headers=headers, params=params)
+            params = None
+            if res.status_code != 200:
+                raise HTTPException(status_code=502, detail=f"Erreur Graph {res.status_code}")
+            page = res.json()
+            for ev in page.get("value", []):
+                assert isinstance(ev, dict), "Format d’événement Outlook inattendu"
+                events.append({
+                    "id": ev.get("id"),
+                    "sujet": ev.get("subject", "Sans titre"),
+                    "date_debut": ev.get("start", {}).get("dateTime", "")[:19],
+                    "date_fin": ev.get("end", {}).get("dateTime", "")[:19],
+                    "source": "outlook"
+                })
+            url = page.get("@odata.nextLink")
+    return events
+
+# --------------------------------------------
+# API route: Agenda of a period (local + Outlook)
+# --------------------------------------------
+@router.get("/outlook/agenda")
+async def get_agenda(request: Request, start: date = Query(...), end: date = Query(...),
+                     collaborateur: str = Query(None), user=Depends(get_current_user_async),
+                     db: AsyncSession = Depends(get_async_db)):
+    """Returns the agenda of a collaborator over [start, end[: planned tasks,
+    synchronized Outlook events and, for one's own agenda with a connected
+    Outlook account, the live Outlook events.
+    The live events come from `graph_cache` (per token and period, short TTL)
+    and are fetched concurrently with the database queries. The response never
+    waits more than AGENDA_GRAPH_BUDGET seconds for Graph: a slower call keeps
+    running in the background and fills the cache for the next view.
+    Parameters:
+    -----------
+    request: Request
+        HTTP request (Outlook token cookie).
+    start, end: date
+        Period (end excluded, at most AGENDA_MAX_DAYS days).
+    collaborateur: str, optional
+        Collaborator (default: the logged-in user; others are reserved to the administrator).
+    user: Personnel
+        Authenticated user.
+    db: AsyncSession
+        Asynchronous SQLAlchemy session.
+    Returns:
+    --------
+    dict: {"evenements": [...], "outlook": "direct" | "cache" | "en_attente" | "erreur" | "non_connecte"}
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+    if end <= start or (end - start).days > AGENDA_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"Période invalide (fin après début, {AGENDA_MAX_DAYS} jours maximum)")
+    collaborateur = collaborateur or user.id_personnel
+    if collaborateur != user.id_personnel and (user.fonction or "").lower() != "admin":
+        raise HTTPException(status_code=403, detail="Accès réservé à l'administrateur.")
+
+    token = request.cookies.get(SESSION_KEY) if collaborateur == user.id_personnel else None
+    live, statut, outlook_events = None, "non_connecte", []
+    if token:
+        key = graph_cache.key(token, start, end)
+        cached = graph_cache.get(key)
+        if cached is not None:
+            outlook_events, statut = cached, "cache"
+        else:
+            live = asyncio.ensure_future(asyncio.wait_for(
+                graph_cache.fetch(key, lambda: graph_events(token, start, end)), AGENDA_GRAPH_BUDGET))
+
+    events = await local_events(db, collaborateur, start, end)
+    if live is not None:
+        try:
+            outlook_events, statut = await live, "direct"
+        except asyncio.TimeoutError:
+            outlook_events, statut = [], "en_attente"
+        except Exception as e:
+            print(f"⚠️  Événements Outlook indisponibles : {e}")
+            outlook_events, statut = [], "erreur"
+    known = {ev["id"] for ev in events if ev["source"] == "outlook"}
+    events += [ev for ev in outlook_events if ev["id"] not in known]
+    events.sort(key=lambda ev: ev["date_debut"])
+    return {"evenements": events, "outlook": statut}
+
 # --------------------------------------------
 # API route: Retrieve Outlook + local events
 # --------------------------------------------
 @router.get("/outlook/events")
-def get_all_events(request: Request, db: Session = Depends(get_db)):
-    """Retrieves all scheduled events: local and Outlook.
+async def get_all_events(request: Request, user=Depends(get_current_user_async),
+                         db: AsyncSession = Depends(get_async_db)):
+    """Retrieves the events of the logged-in user for the next 30 days: local and Outlook.
+    Kept for compatibility; same data as /outlook/agenda over that period.
     Parameters:
     -----------
     request: Request
         HTTP object containing session cookies (Outlook token).
-    db: Session
-        SQLAlchemy session for accessing the local database.
+    user: Personnel
+        Authenticated user.
+    db: AsyncSession
+        Asynchronous SQLAlchemy session for accessing the local database.
     Returns:
     --------
     JSONResponse: Merged list of local and Outlook events.
     Version:
     --------
     specification: Esteban Barracho (v.1 11/07/2025)
-    implement: Esteban Barracho (v.1 11/07/2025)
+    implement: Esteban Barracho (v.3 17/10/2026)
+    """
+    today = date.today()
+    agenda = await get_agenda(request, today, today + timedelta(days=30), None, user, db)
+    return JSONResponse(content=agenda["evenements"])
+
+# --------------------------------------------
+# API route: Export the planned tasks to Outlook
+# --------------------------------------------
+@router.post("/outlook/export")
+def export_to_outlook(request: Request, user=Depends(get_current_user), db: Session = Depends(get_db)):
+    """Exports the feasible tasks planned for the logged-in user to their Outlook calendar.
+    Tasks already exported are updated instead of duplicated (see `export_tasks`).
+    Parameters:
+    -----------
+    request: Request
+        HTTP request (Outlook token cookie).
+    user: Personnel
+        Authenticated user.
+    db: Session
+        SQLAlchemy session.
+    Returns:
+    --------
+    dict: {"created", "updated", "unchanged", "failed", "errors"}.
+    Raises:
+    -------
+    HTTPException (401): if no Outlook account is connected.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
     """
-    all_events = []
-    # Local events
-    db_events = db.query(PlanificationCollaborateur).all()
-    for ev in db_events:
-        assert hasattr(ev, "sujet") and hasattr(ev, "date_debut") and hasattr(ev,
-                                                                              "date_fin"), "Événement local mal formé"
-        all_events.append({
-            "sujet": ev.sujet,
-            "date_debut": ev.date_debut.isoformat(),
-            "date_fin": ev.date_fin.isoformat(),
-            "source": ev.source or "local"
-        })
-    # Outlook events if connected
     token = request.cookies.get(SESSION_KEY)
-    if token:
-        today = datetime.utcnow().isoformat()
-        future = (datetime.utcnow() + timedelta(days=30)).isoformat()
-        headers = {"Authorization": f"Bearer {token}"}
-        url = f"https://graph.microsoft.com/v1.0/me/calendarview?startdatetime={today}&enddatetime={future}"
-        res = requests.get(url, headers=headers)
-        if res.status_code == 200:
-            for ev in res.json().get("value", []):
-                assert isinstance(ev, dict), "Format d’événement Outlook inattendu"
-                all_events.append({
-                    "sujet": ev.get("subject", "Sans titre"),
-                    "date_debut": ev.get("start", {}).get("dateTime", ""),
-                    "date_fin": ev.get("end", {}).get("dateTime", ""),
-                    "source": "outlook"
-                })
-    return JSONResponse(content=all_events)
+    if not token:
+        raise HTTPException(status_code=401, detail="Compte Outlook non connecté (/outlook/login)")
+    ids_tache = [i for (i,) in db.query(PlanificationCollaborateur.id_tache)
+                 .filter(PlanificationCollaborateur.id_collaborateur == user.id_personnel).distinct()]
+    return export_tasks(db, token, mailbox=user.email, ids_tache=ids_tache, delegated=True)
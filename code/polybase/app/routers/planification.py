@@ -2,12 +2,15 @@
 # IMPORTS
 # ============================================
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.database import SessionLocal
+from app.database import get_db, get_async_db
 from app.models import PlanificationCollaborateur, Facture
 from app.schemas import PlanificationCreate, PlanificationOut
+from app.utils.dashboard_aggregates import aggregates
+from app.utils.pagination import PageParams, page_model, paginate_async
 
 # ============================================
 # ROUTER INITIALIZATION
@@ -15,46 +18,32 @@ from app.schemas import PlanificationCreate, PlanificationOut
 
 router = APIRouter()
 
-# ============================================
-# DATABASE DEPENDENCY
-# ============================================
-
-def get_db():
-    """Provides a database session for dependency injection.
-    Yields:
-    -------
-    Session: SQLAlchemy session instance.
-    Version:
-    --------
-    specification: Esteban Barracho (v.1 19/06/2025)
-    implement: Esteban Barracho (v.1 19/06/2025)
-    """
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 # ============================================
 # ROUTE : List all planifications
 # ============================================
-@router.get("/planifications", response_model=list[PlanificationOut])
-def list_planifications(db: Session = Depends(get_db)):
-    """Returns all collaborator task planifications.
+@router.get("/planifications", response_model=list[page_model(PlanificationOut)], response_model_exclude_unset=True)
+async def list_planifications(response: Response, page: PageParams = Depends(), db: AsyncSession = Depends(get_async_db)):
+    """Returns one page of collaborator task planifications, sorted by identifier
+    (keyset pagination), optionally filtered by collaborator.
     Parameters:
     -----------
-    db : Session
-        Active SQLAlchemy session used for database interaction.
+    response : Response
+        Receives the `X-Next-Cursor` header.
+    page : PageParams
+        Pagination (limit, cursor), projection (fields) and filter parameters.
+    db : AsyncSession
+        Active asynchronous SQLAlchemy session used for database interaction.
     Returns:
     --------
     list[PlanificationOut]
-        List of all task planification records.
+        A page of planification records; the next cursor is sent in the `X-Next-Cursor` header.
     Version:
     --------
     specification: Esteban Barracho (v.1 19/06/2025)
-    implement: Esteban Barracho (v.1 19/06/2025)
+    implement: Esteban Barracho (v.4 17/10/2026)
     """
-    return db.query(PlanificationCollaborateur).all()
+    return await paginate_async(db, PlanificationCollaborateur, PlanificationOut, page, response,
+                                filters={"id_collaborateur": PlanificationCollaborateur.id_collaborateur})
 
 # ============================================
 # ROUTE : Get one planification by ID
@@ -229,5 +218,6 @@ def delete_facture(id_facture: str, db: Session = Depends(get_db)):
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Deletion failed: {str(e)}")
+    aggregates.invalidate()
     return {"message": f"Facture {id_facture} deleted successfully"}
 
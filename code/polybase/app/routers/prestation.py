@@ -2,63 +2,68 @@
 # IMPORTS
 # ============================================
 
-from fastapi import APIRouter, Depends, HTTPException
+from collections import defaultdict
+from fastapi import APIRouter, Depends, HTTPException, Response
 from fastapi import Form
 from fastapi.responses import RedirectResponse
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from datetime import date
+from datetime import date, timedelta
 from app.auth import get_current_user
 
-from app.database import SessionLocal
-from app.models import PrestationCollaborateur, Facture
-from app.schemas import PrestationCreate, PrestationOut
-from app.models import PrestationCollaborateur
-from app.routers.admin import generate_id
+from app.database import get_db, get_async_db
+from app.models import PrestationCollaborateur, Facture, Projet, Tache, Collaborateur
+from app.schemas import PrestationCreate, PrestationOut, TimesheetWeek
+from app.routers.project import CLOSED_PROJECT_STATUSES
+from app.utils.bulk_import import bulk_insert
+from app.utils.dashboard_aggregates import aggregates
+from app.utils.id_allocator import id_allocator, ID_RETRIES
+from app.utils.pagination import PageParams, page_model, paginate_async
 
 # ============================================
 # ROUTER INITIALIZATION
 # ============================================
 router = APIRouter()
 
-# ============================================
-# DATABASE DEPENDENCY
-# ============================================
-def get_db():
-    """Provides a database session for dependency injection.
-    Yields:
-    -------
-    Session: SQLAlchemy session instance.
-    Version:
-    --------
-    specification: Esteban Barracho (v.1 19/06/2025)
-    implement: Esteban Barracho (v.1 19/06/2025)
-    """
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+MAX_DAILY_HOURS = 24
+"""Maximum number of hours a collaborator can encode on one day (existing prestations included)."""
+
+HOURS_STEP = 0.25
+"""Granularity of the encoded hours (a quarter of an hour, as in the encoding form)."""
+
+MAX_TIMESHEET_CELLS = 500
+"""Maximum number of non-empty cells accepted in one weekly timesheet."""
 
 # ============================================
 # ROUTE : List all prestations
 # ============================================
-@router.get("/prestation", response_model=list[PrestationOut])
-def list_prestations(db: Session = Depends(get_db)):
-    """Returns all prestation records from the database.
+@router.get("/prestation", response_model=list[page_model(PrestationOut)], response_model_exclude_unset=True)
+async def list_prestations(response: Response, page: PageParams = Depends(), db: AsyncSession = Depends(get_async_db)):
+    """Returns one page of prestation records, sorted by date then identifier
+    (keyset pagination), optionally filtered by project, collaborator and date range.
     Parameters:
     -----------
-    db : Session
-        Active SQLAlchemy session used to query the prestations table.
+    response : Response
+        Receives the `X-Next-Cursor` header.
+    page : PageParams
+        Pagination (limit, cursor), projection (fields) and filter parameters.
+    db : AsyncSession
+        Active asynchronous SQLAlchemy session used to query the prestations table.
     Returns:
     --------
     list[PrestationOut]
-        List of all PrestationCollaborateur entries stored in the system.
+        A page of PrestationCollaborateur entries; the next cursor is sent in the `X-Next-Cursor` header.
     Version:
     --------
     specification: Esteban Barracho (v.1 19/06/2025)
-    implement: Esteban Barracho (v.1 19/06/2025)
+    implement: Esteban Barracho (v.4 17/10/2026)
     """
-    return db.query(PrestationCollaborateur).all()
+    return await paginate_async(db, PrestationCollaborateur, PrestationOut, page, response,
+                                filters={"id_projet": PrestationCollaborateur.id_projet,
+                                         "id_collaborateur": PrestationCollaborateur.id_collaborateur},
+                                date_column=PrestationCollaborateur.date, sort_by_date=True)
 
 # ============================================
 # ROUTE : Get one prestation by ID
@@ -114,6 +119,7 @@ def create_prestation(prestation: PrestationCreate, db: Session = Depends(get_db
     db.add(db_prestation)
     db.commit()
     db.refresh(db_prestation)
+    aggregates.refresh_tache(db, db_prestation.id_tache)
     return db_prestation
 
 # ============================================
@@ -146,11 +152,13 @@ def update_prestation(id_prestation: str, updated: PrestationCreate, db: Session
     prestation = db.query(PrestationCollaborateur).filter_by(id_prestation=id_prestation).first()
     if not prestation:
         raise HTTPException(status_code=404, detail="Prestation not found")
+    ancienne_tache = prestation.id_tache
     for key, value in updated.dict().items():
         assert hasattr(prestation, key), f"Champ '{key}' introuvable dans PrestationCollaborateur"
         setattr(prestation, key, value)
     db.commit()
     db.refresh(prestation)
+    aggregates.refresh_tache(db, ancienne_tache, prestation.id_tache)
     return prestation
 
 # ============================================
@@ -182,8 +190,10 @@ def delete_prestation(id_prestation: str, db: Session = Depends(get_db)):
     prestation = db.query(PrestationCollaborateur).filter_by(id_prestation=id_prestation).first()
     if not prestation:
         raise HTTPException(status_code=404, detail="Prestation not found")
+    id_tache = prestation.id_tache
     db.delete(prestation)
     db.commit()
+    aggregates.refresh_tache(db, id_tache)
     return {"message": "Prestation successfully deleted"}
 
 # ============================================
@@ -223,6 +233,7 @@ def delete_facture(id_facture: str, db: Session = Depends(get_db)):
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Deletion failed: {str(e)}")
+    aggregates.invalidate()
     return {"message": f"Facture {id_facture} deleted successfully"}
 
 # ============================================
@@ -255,21 +266,240 @@ def encodage_libre(date: date = Form(...),id_projet: str = Form(...),heures_effe
     Version:
     --------
     specification: Esteban Barracho (v.1 14/07/2025)
-    implement: Esteban Barracho (v.1 14/07/2025)
+    implement: Esteban Barracho (v.3 17/10/2026)
     """
-    new_id = generate_id("PC")
-    prestation = PrestationCollaborateur(
-        id_prestation=new_id,
-        date=date,
-        id_tache=None,
-        id_projet=id_projet,
-        id_collaborateur=user.id_personnel,
-        heures_effectuees=heures_effectuees,
-        mode_facturation="horaire",
-        facture_associee=None,
-        taux_horaire=user.taux_honoraire_standard,
-        commentaire=commentaire
-    )
-    db.add(prestation)
-    db.commit()
+    for attempt in range(ID_RETRIES):
+        new_id = id_allocator.next_id("PC")
+        prestation = PrestationCollaborateur(
+            id_prestation=new_id,
+            date=date,
+            id_tache=None,
+            id_projet=id_projet,
+            id_collaborateur=user.id_personnel,
+            heures_effectuees=heures_effectuees,
+            mode_facturation="horaire",
+            facture_associee=None,
+            taux_horaire=user.taux_honoraire_standard,
+            commentaire=commentaire
+        )
+        db.add(prestation)
+        try:
+            db.commit()
+            break
+        except IntegrityError:
+            db.rollback()
+            if attempt == ID_RETRIES - 1 or not id_allocator.taken(db, "PrestationCollaborateur", [new_id]):
+                raise
+            id_allocator.resync("PC")  # identifiant déjà écrit explicitement (import)
     return RedirectResponse(url="/agenda", status_code=302)
+
+# ============================================
+# WEEKLY TIMESHEET (BULK ENCODING)
+# ============================================
+def week_bounds(semaine: str) -> tuple:
+    """Returns the Monday and Sunday of an ISO week.
+    Parameters:
+    -----------
+    semaine: str
+        ISO week, e.g. "2025-W23".
+    Returns:
+    --------
+    tuple[date, date]
+        First and last day of the week.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+    annee, numero = semaine.upper().split("-W")
+    lundi = date.fromisocalendar(int(annee), int(numero), 1)
+    return lundi, lundi + timedelta(days=6)
+
+def timesheet_cells(week: TimesheetWeek) -> list:
+    """Flattens the grid of a timesheet into its non-empty cells (one future prestation each).
+    Parameters:
+    -----------
+    week: TimesheetWeek
+        Timesheet sent by the client.
+    Returns:
+    --------
+    list[dict]
+        {"ligne", "date", "id_projet", "id_tache", "heures", "commentaire"} per cell, sorted by date.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+    cells = []
+    for index, line in enumerate(week.lignes):
+        for jour, heures in line.heures.items():
+            if heures:
+                cells.append({"ligne": index, "date": jour, "id_projet": line.id_projet,
+                              "id_tache": line.id_tache or None, "heures": heures,
+                              "commentaire": line.commentaire})
+    return sorted(cells, key=lambda c: (c["date"], c["ligne"]))
+
+def validate_timesheet(db: Session, id_collaborateur: str, cells: list, bounds: tuple = None) -> list:
+    """Validates all the cells of a timesheet at once and sets a "message" on the invalid ones.
+    The referenced projects, tasks and the hours already encoded on the same
+    days are read with one query each, whatever the number of cells. A task
+    belongs to the projects its prestations are encoded on (there is no direct
+    Tache -> Projet link, cf. finance.TACHE_PROJET): a task already encoded
+    is refused on the other projects, and a task encoded for the first time
+    is bound to the first project it is encoded on in the timesheet.
+    Parameters:
+    -----------
+    db: Session
+        Active SQLAlchemy session.
+    id_collaborateur: str
+        Collaborator encoding the timesheet.
+    cells: list[dict]
+        Result of `timesheet_cells` (modified in place).
+    bounds: tuple[date, date], optional
+        Week the dates must belong to.
+    Returns:
+    --------
+    list[dict]
+        The valid cells.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.2 17/10/2026)
+    """
+    projets = {p.id_projet: p.statut for p in db.query(Projet.id_projet, Projet.statut)
+               .filter(Projet.id_projet.in_({c["id_projet"] for c in cells}))}
+    id_taches = {c["id_tache"] for c in cells if c["id_tache"]}
+    taches, projets_tache = {}, defaultdict(set)
+    if id_taches:
+        for t in db.query(Tache.id_tache, Tache.statut, PrestationCollaborateur.id_projet).outerjoin(
+                PrestationCollaborateur, PrestationCollaborateur.id_tache == Tache.id_tache
+        ).filter(Tache.id_tache.in_(id_taches)).distinct():
+            taches[t.id_tache] = t.statut
+            if t.id_projet is not None:
+                projets_tache[t.id_tache].add(t.id_projet)
+    deja_encode = defaultdict(float, {
+        row.date: float(row.total) for row in db.query(
+            PrestationCollaborateur.date, func.sum(PrestationCollaborateur.heures_effectuees).label("total")
+        ).filter(PrestationCollaborateur.id_collaborateur == id_collaborateur,
+                 PrestationCollaborateur.date.in_({c["date"] for c in cells}))
+        .group_by(PrestationCollaborateur.date)
+    })
+
+    seen = set()
+    for cell in cells:
+        key = (cell["date"], cell["id_projet"], cell["id_tache"])
+        if not 0 < cell["heures"] <= MAX_DAILY_HOURS:
+            cell["message"] = f"Durée invalide : {cell['heures']} h (entre 0 et {MAX_DAILY_HOURS} h)"
+        elif abs(cell["heures"] / HOURS_STEP - round(cell["heures"] / HOURS_STEP)) > 1e-9:
+            cell["message"] = f"Durée invalide : {cell['heures']} h (par pas de {HOURS_STEP} h)"
+        elif bounds and not bounds[0] <= cell["date"] <= bounds[1]:
+            cell["message"] = "Date hors de la semaine encodée"
+        elif cell["id_projet"] not in projets:
+            cell["message"] = f"Projet inconnu : {cell['id_projet']}"
+        elif projets[cell["id_projet"]] in CLOSED_PROJECT_STATUSES:
+            cell["message"] = f"Projet clôturé : {cell['id_projet']}"
+        elif cell["id_tache"] and cell["id_tache"] not in taches:
+            cell["message"] = f"Tâche inconnue : {cell['id_tache']}"
+        elif cell["id_tache"] and taches[cell["id_tache"]] == "termine":
+            cell["message"] = f"Tâche terminée : {cell['id_tache']}"
+        elif cell["id_tache"] and projets_tache[cell["id_tache"]] and \
+                cell["id_projet"] not in projets_tache[cell["id_tache"]]:
+            cell["message"] = f"Tâche {cell['id_tache']} hors du projet {cell['id_projet']}"
+        elif key in seen:
+            cell["message"] = "Cellule en double (même jour, projet et tâche)"
+        elif cell["id_tache"]:
+            projets_tache[cell["id_tache"]].add(cell["id_projet"])
+        seen.add(key)
+
+    par_jour = defaultdict(float)
+    for cell in cells:
+        if "message" not in cell:
+            par_jour[cell["date"]] += cell["heures"]
+    for cell in cells:
+        total = deja_encode[cell["date"]] + par_jour[cell["date"]]
+        if "message" not in cell and total > MAX_DAILY_HOURS:
+            cell["message"] = f"Plus de {MAX_DAILY_HOURS} h encodées le {cell['date'].isoformat()} ({total:g} h)"
+    return [c for c in cells if "message" not in c]
+
+@router.post("/api/encodage/semaine")
+def encodage_semaine(week: TimesheetWeek, user=Depends(get_current_user), db: Session = Depends(get_db)):
+    """Encodes a whole weekly timesheet (days × projects) of the logged-in collaborator.
+    All cells are validated together, identifiers are allocated in one go and
+    the valid cells are inserted in a single transaction (one multi-row INSERT,
+    task hours recomputed once per task); the invalid cells are reported and skipped.
+    Parameters:
+    -----------
+    week: TimesheetWeek
+        Timesheet: optional ISO week and lines {id_projet, id_tache, commentaire, heures: {date: hours}}.
+    user: User
+        Logged-in user (injected via Depends).
+    db: Session
+        Injected SQLAlchemy session.
+    Return:
+    -------
+    dict
+        {"inserted", "failed", "resultats": [{"ligne", "date", "id_projet", "id_tache", "heures", "statut", ...}]}
+        where each result has "id_prestation" when inserted, or "message" on error.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.3 17/10/2026)
+    """
+    assert user is not None, "Utilisateur non connecté"
+    if not db.query(Collaborateur).filter_by(id_personnel=user.id_personnel).first():
+        raise HTTPException(status_code=403, detail="Seuls les collaborateurs peuvent encoder des prestations")
+    try:
+        bounds = week_bounds(week.semaine) if week.semaine else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Semaine invalide : {week.semaine} (format attendu : 2025-W23)")
+    cells = timesheet_cells(week)
+    if not cells:
+        raise HTTPException(status_code=400, detail="Aucune heure à encoder")
+    if len(cells) > MAX_TIMESHEET_CELLS:
+        raise HTTPException(status_code=400, detail=f"Trop de cellules ({len(cells)} > {MAX_TIMESHEET_CELLS})")
+
+    valid = validate_timesheet(db, user.id_personnel, cells, bounds)
+    inserted, pending = 0, valid
+    for attempt in range(ID_RETRIES):
+        rows = []
+        for cell, new_id in zip(pending, id_allocator.allocate("PC", len(pending))):
+            cell["id_prestation"] = new_id
+            rows.append({
+                "id_prestation": new_id,
+                "date": cell["date"],
+                "id_tache": cell["id_tache"],
+                "id_projet": cell["id_projet"],
+                "id_collaborateur": user.id_personnel,
+                "heures_effectuees": cell["heures"],
+                "mode_facturation": "horaire",
+                "facture_associee": None,
+                "taux_horaire": user.taux_honoraire_standard,
+                "commentaire": cell["commentaire"]
+            })
+        report = bulk_insert(db, "PrestationCollaborateur", rows, lines=list(range(len(pending))))
+        inserted += report["inserted"]
+        failed = []
+        for error in report["errors"]:
+            if error["ligne"] is not None:
+                failed.append(pending[error["ligne"]])
+                failed[-1]["message"] = error["message"]
+        # Rows whose identifier already exists collided with an identifier written explicitly (import)
+        taken = id_allocator.taken(db, "PrestationCollaborateur", [c["id_prestation"] for c in failed])
+        collided = [c for c in failed if c["id_prestation"] in taken]
+        for cell in failed:
+            cell.pop("id_prestation")
+        if not collided or attempt == ID_RETRIES - 1:
+            break
+        id_allocator.resync("PC")
+        for cell in collided:
+            cell.pop("message")
+        pending = collided
+    if inserted:
+        aggregates.refresh_tache(db, *{c["id_tache"] for c in valid if "message" not in c})
+
+    resultats = []
+    for cell in cells:
+        cell["statut"] = "erreur" if "message" in cell else "ok"
+        resultats.append(cell)
+    resultats.sort(key=lambda c: (c["ligne"], c["date"]))
+    return {"inserted": inserted, "failed": len(cells) - inserted, "resultats": resultats}
@@ -2,12 +2,19 @@
 # IMPORTS
 # ============================================
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, Query
+from sqlalchemy import select, or_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.database import SessionLocal
+from app.auth import get_current_user_async
+from app.database import get_db, get_async_db
 from app.models import Projet, Phase, Facture
-from app.schemas import ProjetCreate, ProjetOut, PhaseCreate, PhaseOut
+from app.schemas import ProjetCreate, ProjetOut, ProjetOption, PhaseCreate, PhaseOut
+from app.utils.dashboard_aggregates import aggregates
+from app.utils.id_allocator import id_allocator
+from app.utils.pagination import PageParams, page_model, paginate_async
+from app.utils.response_cache import response_cache
 
 # ============================================
 # ROUTER INITIALIZATION
@@ -15,46 +22,88 @@ from app.schemas import ProjetCreate, ProjetOut, PhaseCreate, PhaseOut
 
 router = APIRouter()
 
+CLOSED_PROJECT_STATUSES = ("termine", "clos", "cloture", "archive")
+"""Project statuses excluded from the project pickers (no more time can be encoded on them)."""
+
 # ============================================
-# DATABASE DEPENDENCY
+# ROUTE : List all projects
 # ============================================
-
-def get_db():
-    """Provides a database session for dependency injection.
-    Yields:
-    -------
-    Session: SQLAlchemy session instance.
+@router.get("/projects", response_model=list[page_model(ProjetOut)], response_model_exclude_unset=True)
+async def list_projects(request: Request, response: Response, page: PageParams = Depends(),
+                        db: AsyncSession = Depends(get_async_db)):
+    """Returns one page of projects, sorted by identifier (keyset pagination).
+    The date range filter applies to the project start date. The page is served
+    from `response_cache` (ETag / 304) until a project is written.
+    Parameters:
+    -----------
+    request : Request
+        Current request (cache key and conditional headers).
+    response : Response
+        Receives the `X-Next-Cursor` header.
+    page : PageParams
+        Pagination (limit, cursor), projection (fields) and filter parameters.
+    db : AsyncSession
+        Active asynchronous SQLAlchemy session for database interaction.
+    Returns:
+    --------
+    list[ProjetOut]
+        A page of project records; the next cursor is sent in the `X-Next-Cursor` header.
     Version:
     --------
     specification: Esteban Barracho (v.1 19/06/2025)
-    implement: Esteban Barracho (v.1 19/06/2025)
+    implement: Esteban Barracho (v.5 17/10/2026)
     """
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+    return await response_cache.respond_async(
+        request, ("Projet",), lambda: paginate_async(db, Projet, ProjetOut, page, response, date_column=Projet.date_debut),
+        response=response, model=list[page_model(ProjetOut)])
 
 # ============================================
-# ROUTE : List all projects
+# ROUTE : Project picker (typeahead)
 # ============================================
-@router.get("/projects", response_model=list[ProjetOut])
-def list_projects(db: Session = Depends(get_db)):
-    """Returns all projects registered in the system.
+@router.get("/projects/options", response_model=list[ProjetOption])
+async def project_options(request: Request, q: str = Query("", max_length=100), limit: int = Query(20, ge=1, le=100),
+                          user=Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
+    """Returns the active projects whose name or identifier starts with `q`,
+    with their identifier and name only, for the project pickers (time encoding).
+    The name prefix search uses IDX_Projet_nom, the identifier one the primary
+    key; the response is served from `response_cache` (ETag / 304, gzip).
     Parameters:
     -----------
-    db : Session
-        Active SQLAlchemy session for database interaction.
+    request : Request
+        Current request (cache key and conditional headers).
+    q : str
+        Case-insensitive prefix of the project name or identifier (all projects if empty).
+    limit : int
+        Maximum number of projects returned.
+    user : Personnel
+        Authenticated user (any role).
+    db : AsyncSession
+        Active asynchronous SQLAlchemy session.
     Returns:
     --------
-    list[ProjetOut]
-        List of all project records found in the database.
+    list[ProjetOption]
+        Active projects sorted by name.
     Version:
     --------
-    specification: Esteban Barracho (v.1 19/06/2025)
-    implement: Esteban Barracho (v.1 19/06/2025)
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
     """
-    return db.query(Projet).all()
+    assert user is not None, "Utilisateur non connecté"
+
+    async def build():
+        statement = (select(Projet.id_projet, Projet.nom_projet)
+                     .where(Projet.statut.notin_(CLOSED_PROJECT_STATUSES))
+                     .order_by(Projet.nom_projet, Projet.id_projet)
+                     .limit(limit))
+        prefix = q.strip()
+        if prefix:
+            pattern = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            statement = statement.where(or_(Projet.nom_projet.like(pattern, escape="\\"),
+                                            Projet.id_projet.like(pattern, escape="\\")))
+        result = await db.execute(statement)
+        return [{"id_projet": row.id_projet, "nom_projet": row.nom_projet} for row in result]
+
+    return await response_cache.respond_async(request, ("Projet",), build)
 
 # ============================================
 # ROUTE : Get a specific project
@@ -103,13 +152,15 @@ def create_project(project: ProjetCreate, db: Session = Depends(get_db)):
     Version:
     --------
     specification: Esteban Barracho (v.1 19/06/2025)
-    implement: Esteban Barracho (v.1 19/06/2025)
+    implement: Esteban Barracho (v.3 17/10/2026)
     """
     db_project = Projet(**project.dict())
     assert isinstance(db_project, Projet), "Objet créé invalide (Projet attendu)"
     db.add(db_project)
     db.commit()
     db.refresh(db_project)
+    id_allocator.advance("Projet", [db_project.id_projet])
+    response_cache.invalidate("Projet")
     return db_project
 
 # ============================================
@@ -157,13 +208,14 @@ def add_phase(id_projet: str, phase: PhaseCreate, db: Session = Depends(get_db))
     Version:
     --------
     specification: Esteban Barracho (v.1 19/06/2025)
-    implement: Esteban Barracho (v.1 19/06/2025)
+    implement: Esteban Barracho (v.2 17/10/2026)
     """
     new_phase = Phase(**phase.dict())
     assert isinstance(new_phase, Phase), "Objet créé invalide (Phase attendu)"
     db.add(new_phase)
     db.commit()
     db.refresh(new_phase)
+    id_allocator.advance("Phase", [new_phase.id_phase])
     return new_phase
 
 # ============================================
@@ -186,7 +238,7 @@ def delete_project(id_projet: str, db: Session = Depends(get_db)):
     Version:
     --------
     specification: Esteban Barracho (v.1 19/06/2025)
-    implement: Esteban Barracho (v.1 21/06/2025)
+    implement: Esteban Barracho (v.2 17/10/2026)
     """
     assert isinstance(id_projet, str), "L’identifiant de projet doit être une chaîne"
     project = db.query(Projet).filter(Projet.id_projet == id_projet).first()
@@ -194,6 +246,8 @@ def delete_project(id_projet: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Project not found")
     db.delete(project)
     db.commit()
+    aggregates.invalidate()
+    response_cache.invalidate("Projet")
     return {"message": f"Project {id_projet} deleted successfully"}
 
 # ============================================
@@ -224,6 +278,7 @@ def delete_phase(id_phase: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Phase not found")
     db.delete(phase)
     db.commit()
+    aggregates.invalidate()
     return {"message": f"Phase {id_phase} deleted successfully"}
 
 # ============================================
@@ -259,4 +314,5 @@ def delete_facture(id_facture: str, db: Session = Depends(get_db)):
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Deletion failed: {str(e)}")
+    aggregates.invalidate()
     return {"message": f"Facture {id_facture} deleted successfully"}
\ No newline at end of file
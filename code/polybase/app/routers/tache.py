@@ -2,13 +2,16 @@
 # IMPORTS
 # ============================================
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.auth import get_current_user
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app.models import Tache, Facture
 from app.schemas import TacheCreate, TacheOut
+from app.utils.dashboard_aggregates import aggregates
+from app.utils.pagination import PageParams, page_model, paginate_async
 
 # ============================================
 # ROUTER INITIALIZATION
@@ -20,23 +23,28 @@ router = APIRouter()
 # ROUTE : List all tasks
 # ============================================
 
-@router.get("/tasks", response_model=list[TacheOut])
-def list_tasks(db: Session = Depends(get_db)):
-    """Returns all tasks stored in the database.
+@router.get("/tasks", response_model=list[page_model(TacheOut)], response_model_exclude_unset=True)
+async def list_tasks(response: Response, page: PageParams = Depends(), db: AsyncSession = Depends(get_async_db)):
+    """Returns one page of tasks, sorted by identifier (keyset pagination).
+    The date range filter applies to the task start date.
     Parameters:
     -----------
-    db : Session
-        Active SQLAlchemy session for querying the database.
+    response : Response
+        Receives the `X-Next-Cursor` header.
+    page : PageParams
+        Pagination (limit, cursor), projection (fields) and filter parameters.
+    db : AsyncSession
+        Active asynchronous SQLAlchemy session for querying the database.
     Returns:
     --------
     list[TacheOut]
-        A list of all task records found in the database.
+        A page of task records; the next cursor is sent in the `X-Next-Cursor` header.
     Version:
     --------
     specification: Esteban Barracho (v.1 19/06/2025)
-    implement: Esteban Barracho (v.1 19/06/2025)
+    implement: Esteban Barracho (v.4 17/10/2026)
     """
-    return db.query(Tache).all()
+    return await paginate_async(db, Tache, TacheOut, page, response, date_column=Tache.date_debut)
 
 
 # ============================================
@@ -94,6 +102,7 @@ def create_task(task: TacheCreate, db: Session = Depends(get_db)):
     db.add(db_task)
     db.commit()
     db.refresh(db_task)
+    aggregates.refresh_tache(db, db_task.id_tache)
     return db_task
 
 # ============================================
@@ -129,6 +138,7 @@ def update_task(id_tache: str, updated_task: TacheCreate, db: Session = Depends(
         setattr(task, key, value)
     db.commit()
     db.refresh(task)
+    aggregates.refresh_tache(db, task.id_tache)
     return task
 
 # ============================================
@@ -159,6 +169,7 @@ def delete_task(id_tache: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Task not found")
     db.delete(task)
     db.commit()
+    aggregates.refresh_tache(db, id_tache)
     return {"message": "Task successfully deleted"}
 
 
@@ -195,6 +206,7 @@ def delete_facture(id_facture: str, db: Session = Depends(get_db)):
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Deletion failed: {str(e)}")
+    aggregates.invalidate()
     return {"message": f"Facture {id_facture} deleted successfully"}
 
 # ============================================
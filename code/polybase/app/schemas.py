@@ -4,7 +4,7 @@
 
 from pydantic import BaseModel
 from typing import Optional
-from datetime import date
+from datetime import date, datetime
 
 # ============================================
 # SCHEMAS: PROJECT
@@ -38,6 +38,16 @@ class ProjetOut(ProjetCreate):
     class Config:
         orm_mode = True
 
+class ProjetOption(BaseModel):
+    """Schema of a project in the project pickers (identifier and name only).
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+    id_projet: str
+    nom_projet: str
+
 # ============================================
 # SCHEMAS: PHASE
 # ============================================
@@ -256,6 +266,28 @@ class PrestationOut(PrestationCreate):
     class Config:
         orm_mode = True
 
+class TimesheetLine(BaseModel):
+    """One line of a weekly timesheet: a project (and optional task) with the hours of each day.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+    id_projet: str
+    id_tache: Optional[str] = None
+    commentaire: str = ""
+    heures: dict[date, float]
+
+class TimesheetWeek(BaseModel):
+    """Weekly timesheet of the logged-in collaborator (grid of days × projects).
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+    semaine: Optional[str] = None
+    lignes: list[TimesheetLine]
+
 # ============================================
 # SCHEMAS: COST
 # ============================================
@@ -372,7 +404,7 @@ class ImportLogOut(BaseModel):
     Version:
     --------
     specification: Esteban Barracho (v.1 19/06/2025)
-    implement: Esteban Barracho (v.2 26/06/2025)
+    implement: Esteban Barracho (v.4 17/10/2026)
     """
     id_import: str
     source: str
@@ -380,6 +412,8 @@ class ImportLogOut(BaseModel):
     date_import: date
     statut: str
     message_log: str
+    suggestion_ia: Optional[str] = None
+    derniere_maj: Optional[datetime] = None
     id_projet: Optional[str] = None
     class Config:
         orm_mode = True
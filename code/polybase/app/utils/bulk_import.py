@@ -0,0 +1,272 @@
+# ============================================
+# IMPORTS
+# ============================================
+
+import csv
+import os
+import tempfile
+from datetime import date, datetime
+
+from sqlalchemy import text
+
+from app.database import DB_LOCAL_INFILE
+from app.utils.id_allocator import id_allocator
+from app.utils.task_hours import deferred_task_hours
+
+# ============================================
+# BULK IMPORT CONFIGURATION
+# ============================================
+
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))
+"""Number of rows sent in one multi-row INSERT (executemany).
+Version:
+--------
+specification: Esteban Barracho (v.1 17/10/2026)
+implement: Esteban Barracho (v.1 17/10/2026)
+"""
+
+LOAD_DATA_MIN_ROWS = int(os.getenv("IMPORT_LOAD_DATA_MIN_ROWS", "50000"))
+"""Row count from which `LOAD DATA LOCAL INFILE` is used (only if DB_LOCAL_INFILE is enabled).
+Version:
+--------
+specification: Esteban Barracho (v.1 17/10/2026)
+implement: Esteban Barracho (v.1 17/10/2026)
+"""
+
+MAX_LOGGED_ERRORS = 20
+"""Maximum number of batch errors detailed in the ImportLog message."""
+
+# ============================================
+# BATCHED INSERTION
+# ============================================
+
+def _insert_batch(db, sql, batch: list, lines: list, report: dict):
+    """Inserts one batch inside a savepoint; on failure, retries row by row to isolate the bad rows."""
+    try:
+        with db.begin_nested():
+            db.execute(sql, batch)
+        report["inserted"] += len(batch)
+        return
+    except Exception:
+        pass
+    for offset, row in enumerate(batch):
+        try:
+            with db.begin_nested():
+                db.execute(sql, row)
+            report["inserted"] += 1
+        except Exception as e:
+            report["failed"] += 1
+            report["errors"].append({"ligne": lines[offset], "message": str(getattr(e, "orig", e))})
+
+def _infile_value(value):
+    """Writes a value for LOAD DATA with the default escape character: NULL as \\N, backslashes doubled."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, str):
+        return value.replace("\\", "\\\\")
+    return value
+
+def _load_data_infile(db, table: str, columns: list, rows: list, report: dict):
+    """Loads all rows through a temporary CSV file and `LOAD DATA LOCAL INFILE`.
+    Missing values (None) are written as \\N so that MySQL stores NULL: with
+    LOCAL, invalid values are not rejected but converted (0, '0000-00-00')."""
+    with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False, newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerows([_infile_value(row[c]) for c in columns] for row in rows)
+        path = f.name
+    try:
+        cols = ", ".join(f"`{c}`" for c in columns)
+        result = db.execute(text(
+            f"LOAD DATA LOCAL INFILE :path INTO TABLE `{table}` CHARACTER SET utf8mb4 "
+            f"FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' "
+            f"LINES TERMINATED BY '\\n' ({cols})"
+        ), {"path": path})
+        report["inserted"] += result.rowcount
+        skipped = len(rows) - result.rowcount
+        if skipped:
+            report["failed"] += skipped
+            report["errors"].append({"ligne": None, "message": f"{skipped} ligne(s) ignorée(s) par LOAD DATA (doublons ou valeurs invalides)"})
+    finally:
+        os.remove(path)
+
+def bulk_insert(db, table: str, rows: list, batch_size: int = IMPORT_BATCH_SIZE, first_line: int = 2,
+                use_load_data: bool = None, progress=None, lines: list = None) -> dict:
+    """Inserts rows into a table by batches of multi-row INSERT statements.
+    Each batch runs in a savepoint: a failing batch is replayed row by row so
+    that only the invalid rows are skipped and reported with their line number
+    in the source file. Very large imports can go through
+    `LOAD DATA LOCAL INFILE` when the server and DB_LOCAL_INFILE allow it; if
+    that fails, the batched path is used instead. Prestations are inserted in
+    the bulk mode of `deferred_task_hours`: the task hours are recomputed once
+    per task before the commit instead of once per row by the triggers. After
+    the commit, the identifier sequence of the table is moved past the
+    identifiers of the rows (`id_allocator.advance`).
+    Parameters:
+    -----------
+    db (Session): Active SQLAlchemy session.
+    table (str): Target SQL table (columns already aligned on the table).
+    rows (list[dict]): Rows to insert, all with the same keys (None for a missing value).
+    batch_size (int): Number of rows per INSERT batch.
+    first_line (int): Line number of the first row in the source file (2 = after the Excel header).
+    use_load_data (bool): Forces (True) or disables (False) LOAD DATA; None chooses from LOAD_DATA_MIN_ROWS.
+    progress (callable): Optional callback receiving the report after each batch.
+    lines (list[int]): Line number of every row in the source file (overrides first_line).
+    Returns:
+    --------
+    dict: {"inserted": int, "failed": int, "errors": [{"ligne", "message"}], "methode": str}
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.5 17/10/2026)
+    """
+    assert batch_size > 0, "La taille de lot doit être positive"
+    report = {"inserted": 0, "failed": 0, "errors": [], "methode": "executemany"}
+    if not rows:
+        return report
+    columns = list(rows[0].keys())
+    if lines is None:
+        lines = list(range(first_line, first_line + len(rows)))
+
+    if use_load_data is None:
+        use_load_data = len(rows) >= LOAD_DATA_MIN_ROWS
+    with deferred_task_hours(db, table, rows):
+        if use_load_data and DB_LOCAL_INFILE and db.get_bind().dialect.name == "mysql":
+            try:
+                with db.begin_nested():
+                    _load_data_infile(db, table, columns, rows, report)
+                report["methode"] = "load_data"
+            except Exception as e:
+                report = {"inserted": 0, "failed": 0, "errors": [], "methode": "executemany"}
+                report["errors"].append({"ligne": None, "message": f"LOAD DATA indisponible, insertion par lots : {e}"})
+
+        if report["methode"] == "executemany":
+            keys = ", ".join(f"`{k}`" for k in columns)
+            vals = ", ".join(f":{k}" for k in columns)
+            sql = text(f"INSERT INTO `{table}` ({keys}) VALUES ({vals})")
+            for start in range(0, len(rows), batch_size):
+                _insert_batch(db, sql, rows[start:start + batch_size], lines[start:start + batch_size], report)
+                if progress:
+                    progress(report)
+    db.commit()
+    column = id_allocator.id_column(table)
+    if report["inserted"] and column in columns:
+        id_allocator.advance(table, (row[column] for row in rows))
+    if report["methode"] == "load_data" and progress:
+        progress(report)
+    return report
+
+# ============================================
+# IMPORT SUMMARY (IMPORTLOG)
+# ============================================
+
+def import_statut(report: dict) -> str:
+    """Final ImportLog status of an import report: "succès", "partiel" or "échec"."""
+    if report["failed"] == 0:
+        return "succès"
+    return "partiel" if report["inserted"] > 0 else "échec"
+
+def import_message(report: dict) -> str:
+    """Human-readable summary of an import report (counts and first errors)."""
+    lines = [f"{report['inserted']} ligne(s) insérée(s), {report['failed']} en échec ({report['methode']})."]
+    for error in report["errors"][:MAX_LOGGED_ERRORS]:
+        prefix = f"Ligne {error['ligne']}" if error["ligne"] is not None else "Import"
+        lines.append(f"{prefix} : {error['message']}")
+    if len(report["errors"]) > MAX_LOGGED_ERRORS:
+        lines.append(f"… {len(report['errors']) - MAX_LOGGED_ERRORS} autre(s) erreur(s).")
+    return "\n".join(lines)
+
+def create_import_log(db, source: str, table: str, statut: str, message: str) -> str:
+    """Inserts a new `ImportLog` row and returns its identifier (`derniere_maj` set to now).
+    Parameters:
+    -----------
+    db (Session): Active SQLAlchemy session.
+    source (str): Name of the imported file.
+    table (str): Target table.
+    statut (str): Import status.
+    message (str): Log message.
+    Returns:
+    --------
+    str: Identifier of the ImportLog row.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.3 17/10/2026)
+    """
+    id_import = id_allocator.next_id("IMP")
+    db.execute(text(
+        "INSERT INTO ImportLog (id_import, source, type_donnee, date_import, statut, message_log, derniere_maj) "
+        "VALUES (:id, :source, :type_donnee, :date_import, :statut, :message_log, :maintenant)"
+    ), {
+        "id": id_import,
+        "source": source[:100],
+        "type_donnee": table[:50],
+        "date_import": date.today(),
+        "statut": statut,
+        "message_log": message,
+        "maintenant": datetime.now()
+    })
+    db.commit()
+    return id_import
+
+def update_import_log(db, id_import: str, statut: str, message: str):
+    """Updates the status and the message of an `ImportLog` row, and its `derniere_maj` time.
+    Parameters:
+    -----------
+    db (Session): Active SQLAlchemy session.
+    id_import (str): Identifier of the ImportLog row.
+    statut (str): Import status.
+    message (str): Log message.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.2 17/10/2026)
+    """
+    db.execute(text("UPDATE ImportLog SET statut = :statut, message_log = :message_log, derniere_maj = :maintenant "
+                    "WHERE id_import = :id"),
+               {"id": id_import, "statut": statut, "message_log": message, "maintenant": datetime.now()})
+    db.commit()
+
+def save_import_suggestion(db, id_import: str, suggestion: str):
+    """Stores the AI suggestion of an import with its `ImportLog` row.
+    Parameters:
+    -----------
+    db (Session): Active SQLAlchemy session.
+    id_import (str): Identifier of the ImportLog row.
+    suggestion (str): Suggestion returned by OpenRouter.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+    db.execute(text("UPDATE ImportLog SET suggestion_ia = :suggestion WHERE id_import = :id"),
+               {"id": id_import, "suggestion": suggestion})
+    db.commit()
+
+def write_import_log(db, source: str, table: str, report: dict, id_import: str = None) -> str:
+    """Writes the summary of an import into the `ImportLog` table.
+    Parameters:
+    -----------
+    db (Session): Active SQLAlchemy session.
+    source (str): Name of the imported file.
+    table (str): Target table.
+    report (dict): Result of `bulk_insert`.
+    id_import (str): Existing ImportLog row to complete (import job), or None to create one.
+    Returns:
+    --------
+    str: Identifier of the ImportLog row, or None if it could not be written.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.2 17/10/2026)
+    """
+    try:
+        if id_import:
+            update_import_log(db, id_import, import_statut(report), import_message(report))
+            return id_import
+        return create_import_log(db, source, table, import_statut(report), import_message(report))
+    except Exception as e:
+        db.rollback()
+        print(f"⚠️  Journal d'import non enregistré : {e}")
+        return None
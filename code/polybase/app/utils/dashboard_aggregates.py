@@ -0,0 +1,393 @@
+# ============================================
+# IMPORTS
+# ============================================
+
+import os
+import threading
+import time
+from decimal import Decimal
+
+from sqlalchemy import func, case
+
+from app.models import Tache, ProjectionFacturation
+
+# ============================================
+# TABLES FEEDING THE AGGREGATES
+# ============================================
+
+SOURCE_TABLES = {
+    "Tache", "PrestationCollaborateur", "ProjectionFacturation",
+    "Projet", "Phase", "Facture", "Client"
+}
+"""Tables whose writes (including cascades) can change a dashboard aggregate.
+Version:
+--------
+specification: Esteban Barracho (v.1 17/10/2026)
+implement: Esteban Barracho (v.1 17/10/2026)
+"""
+
+AGGREGATES_TTL = int(os.getenv("AGGREGATES_TTL", "60"))
+"""Lifetime (seconds) of a loaded store. Invalidations are local to the
+process: with several workers, this bounds how long another worker may serve
+indicators older than a write.
+Version:
+--------
+specification: Esteban Barracho (v.1 17/10/2026)
+implement: Esteban Barracho (v.1 17/10/2026)
+"""
+
+REBUILD_ATTEMPTS = 3
+"""Number of rebuilds tried by a read when invalidations keep arriving during the reload."""
+
+# ============================================
+# CONVERSION HELPER
+# ============================================
+
+def _to_decimal(value) -> Decimal:
+    """Converts a numeric database value to Decimal (None counts as zero).
+    Parameters:
+    -----------
+    value: int | float | Decimal | None
+        Raw value returned by the database driver.
+    Returns:
+    --------
+    Decimal: Exact decimal value.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+    if value is None:
+        return Decimal(0)
+    if isinstance(value, Decimal):
+        return value
+    return Decimal(str(value))
+
+# ============================================
+# DASHBOARD AGGREGATE STORE
+# ============================================
+
+class DashboardAggregates:
+    """In-process materialization of the dashboard indicators.
+    The store keeps the contribution of every task and every billing projection
+    so that a create/update/delete only applies the difference between the old
+    and the new contribution. Dashboard reads are then simple lookups instead of
+    scans of `Tache` and `ProjectionFacturation`.
+    The store is loaded lazily on first read. Writes that cannot be tracked row
+    by row (cascading deletes, generic admin routes, Excel imports) call
+    `invalidate()` and the next read rebuilds it. A loaded store expires after
+    AGGREGATES_TTL seconds, which bounds the staleness caused by the writes of
+    other workers. Every invalidation, rebuild and row refresh increments a
+    generation counter: a rebuild or a refresh that read the database while the
+    generation changed is discarded (a discarded refresh invalidates the store,
+    since its rows may be newer or older than those applied in between).
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.3 17/10/2026)
+    """
+
+    def __init__(self, ttl: int = AGGREGATES_TTL):
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._loaded_at = 0.0
+        self._generation = 0
+        self._ttl = ttl
+        self._taches = {}
+        self._projections = {}
+        self._taches_retard = set()
+        self._heures_depassees = Decimal(0)
+        self._facturation = {}
+
+    # ----- Internal contribution handling -----
+
+    def _apply_tache(self, id_tache, contribution):
+        old = self._taches.pop(id_tache, None)
+        if old is not None:
+            self._heures_depassees -= old[1]
+            self._taches_retard.discard(id_tache)
+        if contribution is not None:
+            self._taches[id_tache] = contribution
+            self._heures_depassees += contribution[1]
+            if contribution[0]:
+                self._taches_retard.add(id_tache)
+
+    def _apply_projection(self, id_projection, contribution):
+        old = self._projections.pop(id_projection, None)
+        if old is not None:
+            totals = self._facturation[old[0]]
+            totals[0] -= old[1]
+            totals[1] -= old[2]
+            totals[2] -= 1
+            if totals[2] == 0:
+                del self._facturation[old[0]]
+        if contribution is not None:
+            self._projections[id_projection] = contribution
+            totals = self._facturation.setdefault(contribution[0], [Decimal(0), Decimal(0), 0])
+            totals[0] += contribution[1]
+            totals[1] += contribution[2]
+            totals[2] += 1
+
+    @staticmethod
+    def _tache_contribution(row):
+        return bool(row.alerte_retard), _to_decimal(row.heures_depassees)
+
+    @staticmethod
+    def _projection_contribution(row):
+        return row.id_projet, _to_decimal(row.montant_projete), _to_decimal(row.montant_facturable_actuel)
+
+    # ----- Loading -----
+
+    def rebuild(self, db):
+        """Recomputes the whole store from the database (recovery command).
+        Parameters:
+        -----------
+        db (Session): Active SQLAlchemy session.
+        Returns:
+        --------
+        dict: Number of tasks and projections loaded, and "applique" (False if an
+        invalidation happened during the reading and the snapshot was discarded).
+        Version:
+        --------
+        specification: Esteban Barracho (v.1 17/10/2026)
+        implement: Esteban Barracho (v.3 17/10/2026)
+        """
+        with self._lock:
+            generation = self._generation
+        taches = db.query(Tache.id_tache, Tache.alerte_retard, Tache.heures_depassees).all()
+        projections = db.query(
+            ProjectionFacturation.id_projection,
+            ProjectionFacturation.id_projet,
+            ProjectionFacturation.montant_projete,
+            ProjectionFacturation.montant_facturable_actuel
+        ).all()
+        with self._lock:
+            if self._generation != generation:
+                return {"taches": len(taches), "projections": len(projections), "applique": False}
+            self._taches = {}
+            self._projections = {}
+            self._taches_retard = set()
+            self._heures_depassees = Decimal(0)
+            self._facturation = {}
+            for t in taches:
+                self._apply_tache(t.id_tache, self._tache_contribution(t))
+            for p in projections:
+                self._apply_projection(p.id_projection, self._projection_contribution(p))
+            self._loaded = True
+            self._loaded_at = time.monotonic()
+            self._generation += 1
+        return {"taches": len(taches), "projections": len(projections), "applique": True}
+
+    def ensure_loaded(self, db):
+        """Builds the store on first use, after an invalidation or once AGGREGATES_TTL has elapsed.
+        Parameters:
+        -----------
+        db (Session): Active SQLAlchemy session.
+        Version:
+        --------
+        specification: Esteban Barracho (v.1 17/10/2026)
+        implement: Esteban Barracho (v.2 17/10/2026)
+        """
+        for _ in range(REBUILD_ATTEMPTS):
+            if self._loaded and time.monotonic() - self._loaded_at <= self._ttl:
+                return
+            if self.rebuild(db)["applique"]:
+                return
+
+    def invalidate(self):
+        """Marks the store as stale; the next read triggers a rebuild.
+        Version:
+        --------
+        specification: Esteban Barracho (v.1 17/10/2026)
+        implement: Esteban Barracho (v.2 17/10/2026)
+        """
+        with self._lock:
+            self._invalidate_locked()
+
+    def _invalidate_locked(self):
+        self._loaded = False
+        self._generation += 1
+
+    def invalidate_for(self, table: str):
+        """Invalidates the store when a write touches a table feeding it,
+        directly or through an ON DELETE CASCADE.
+        Parameters:
+        -----------
+        table (str): Name of the modified SQL table.
+        Version:
+        --------
+        specification: Esteban Barracho (v.1 17/10/2026)
+        implement: Esteban Barracho (v.1 17/10/2026)
+        """
+        if table in SOURCE_TABLES:
+            self.invalidate()
+
+    # ----- Incremental maintenance -----
+
+    def _claim(self, generation: int) -> bool:
+        """Under the lock: True (and a new generation) if nothing was applied or
+        invalidated since `generation` was read, otherwise invalidates the store."""
+        if self._generation != generation:
+            self._invalidate_locked()
+            return False
+        self._generation += 1
+        return True
+
+    def refresh_tache(self, db, *ids_tache):
+        """Re-reads the given tasks by primary key and applies the difference.
+        A task that no longer exists is removed from the store. Prestation
+        writes call this as well because the `heures_depassees` column is
+        maintained by database triggers. If another refresh, a rebuild or an
+        invalidation happened during the reading, the store is invalidated
+        instead, so that writes landing out of order cannot leave a stale row.
+        Parameters:
+        -----------
+        db (Session): Active SQLAlchemy session (after commit).
+        ids_tache (str): Identifiers of the modified tasks (None values are ignored).
+        Version:
+        --------
+        specification: Esteban Barracho (v.1 17/10/2026)
+        implement: Esteban Barracho (v.3 17/10/2026)
+        """
+        ids = {i for i in ids_tache if i}
+        if not ids:
+            return
+        with self._lock:
+            if not self._loaded:
+                self._invalidate_locked()  # une reconstruction en cours ne voit peut-être pas cette écriture
+                return
+            generation = self._generation
+        rows = {t.id_tache: t for t in db.query(
+            Tache.id_tache, Tache.alerte_retard, Tache.heures_depassees
+        ).filter(Tache.id_tache.in_(ids))}
+        with self._lock:
+            if not self._claim(generation):
+                return
+            for id_tache in ids:
+                row = rows.get(id_tache)
+                self._apply_tache(id_tache, self._tache_contribution(row) if row else None)
+
+    def refresh_projection(self, db, *ids_projection):
+        """Re-reads the given billing projections by primary key and applies the difference.
+        Parameters:
+        -----------
+        db (Session): Active SQLAlchemy session (after commit).
+        ids_projection (str): Identifiers of the modified projections.
+        Version:
+        --------
+        specification: Esteban Barracho (v.1 17/10/2026)
+        implement: Esteban Barracho (v.3 17/10/2026)
+        """
+        ids = {i for i in ids_projection if i}
+        if not ids:
+            return
+        with self._lock:
+            if not self._loaded:
+                self._invalidate_locked()
+                return
+            generation = self._generation
+        rows = {p.id_projection: p for p in db.query(
+            ProjectionFacturation.id_projection,
+            ProjectionFacturation.id_projet,
+            ProjectionFacturation.montant_projete,
+            ProjectionFacturation.montant_facturable_actuel
+        ).filter(ProjectionFacturation.id_projection.in_(ids))}
+        with self._lock:
+            if not self._claim(generation):
+                return
+            for id_projection in ids:
+                row = rows.get(id_projection)
+                self._apply_projection(id_projection, self._projection_contribution(row) if row else None)
+
+    # ----- Reads -----
+
+    def taches_retard(self, db) -> int:
+        """Number of tasks with a delay alert."""
+        self.ensure_loaded(db)
+        return len(self._taches_retard)
+
+    def ids_taches_retard(self, db) -> list:
+        """Identifiers of the tasks with a delay alert."""
+        self.ensure_loaded(db)
+        with self._lock:
+            return sorted(self._taches_retard)
+
+    def heures_depassees(self, db) -> float:
+        """Total of exceeded hours across all tasks."""
+        self.ensure_loaded(db)
+        return float(self._heures_depassees)
+
+    def facturation(self, db) -> list:
+        """Projected vs. billable amounts per project."""
+        self.ensure_loaded(db)
+        with self._lock:
+            totals = sorted(self._facturation.items())
+        return [
+            {
+                "id_projet": id_projet,
+                "montant_projete": float(projete),
+                "montant_facturable_actuel": float(actuel),
+                "ecart": float(projete - actuel)
+            }
+            for id_projet, (projete, actuel, _) in totals
+        ]
+
+    # ----- Consistency check -----
+
+    def check(self, db) -> dict:
+        """Compares the incremental values, as currently held in memory, to a full SQL recomputation.
+        The store is not rebuilt first: a drift of the incremental maintenance
+        shows up in "ecarts" instead of being hidden by a fresh reload.
+        Parameters:
+        -----------
+        db (Session): Active SQLAlchemy session.
+        Returns:
+        --------
+        dict: {"statut": "chargé" | "non chargé", "coherent": bool | None, "ecarts": [<indicator differences>]}
+        ("coherent" is None while the store is not loaded: there is nothing to compare).
+        Version:
+        --------
+        specification: Esteban Barracho (v.1 17/10/2026)
+        implement: Esteban Barracho (v.2 17/10/2026)
+        """
+        with self._lock:
+            if not self._loaded:
+                return {"statut": "non chargé", "coherent": None, "ecarts": []}
+            obtenu = {
+                "taches_retard": len(self._taches_retard),
+                "heures_depassees": self._heures_depassees
+            }
+            for id_projet, (projete, actuel, _) in self._facturation.items():
+                obtenu[f"facturation:{id_projet}"] = (projete, actuel)
+
+        compteurs = db.query(
+            func.sum(case((Tache.alerte_retard == True, 1), else_=0)),
+            func.sum(Tache.heures_depassees)
+        ).one()
+        projets = db.query(
+            ProjectionFacturation.id_projet,
+            func.sum(ProjectionFacturation.montant_projete),
+            func.sum(ProjectionFacturation.montant_facturable_actuel)
+        ).group_by(ProjectionFacturation.id_projet).all()
+
+        attendu = {
+            "taches_retard": int(compteurs[0] or 0),
+            "heures_depassees": _to_decimal(compteurs[1])
+        }
+        for id_projet, projete, actuel in projets:
+            attendu[f"facturation:{id_projet}"] = (_to_decimal(projete), _to_decimal(actuel))
+
+        ecarts = [
+            {"indicateur": cle, "incremental": str(obtenu.get(cle)), "recalcul": str(attendu.get(cle))}
+            for cle in sorted(set(attendu) | set(obtenu))
+            if obtenu.get(cle) != attendu.get(cle)
+        ]
+        return {"statut": "chargé", "coherent": not ecarts, "ecarts": ecarts}
+
+aggregates = DashboardAggregates()
+"""Process-wide dashboard aggregate store shared by the routers.
+Version:
+--------
+specification: Esteban Barracho (v.1 17/10/2026)
+implement: Esteban Barracho (v.1 17/10/2026)
+"""
@@ -0,0 +1,118 @@
+# ============================================
+# IMPORTS
+# ============================================
+
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# ============================================
+# CACHE CONFIGURATION
+# ============================================
+
+AGENDA_CACHE_TTL = int(os.getenv("AGENDA_CACHE_TTL", "60"))
+"""Lifetime (seconds) of the Outlook events cached for a token and a period.
+Version:
+--------
+specification: Esteban Barracho (v.1 17/10/2026)
+implement: Esteban Barracho (v.1 17/10/2026)
+"""
+
+AGENDA_CACHE_SIZE = int(os.getenv("AGENDA_CACHE_SIZE", "512"))
+"""Maximum number of cached (token, period) entries (least recently used ones are evicted)."""
+
+# ============================================
+# GRAPH EVENT CACHE
+# ============================================
+
+class GraphEventCache:
+    """Short-lived cache of the Outlook events read live from Graph, per token and period.
+    The token is only kept as a hash in the keys. Concurrent requests for the
+    same key share one Graph call; a call keeps running (and fills the cache)
+    even if the request that started it stopped waiting for it.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+
+    def __init__(self, ttl: int = AGENDA_CACHE_TTL, max_size: int = AGENDA_CACHE_SIZE):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._ttl = ttl
+        self._max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(token: str, *window) -> str:
+        """Builds the cache key of a token and a period (the token itself is not stored)."""
+        return hashlib.sha256(token.encode()).hexdigest()[:32] + "|" + "|".join(map(str, window))
+
+    def get(self, key: str):
+        """Returns the cached events of a key, or None if absent or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, events: list):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self._ttl, events)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    async def fetch(self, key: str, load) -> list:
+        """Returns the cached events of a key, or loads them once for all concurrent callers.
+        Parameters:
+        -----------
+        key (str): Result of `key`.
+        load (callable): Coroutine function returning the events on a cache miss.
+        Returns:
+        --------
+        list[dict]: Events.
+        Version:
+        --------
+        specification: Esteban Barracho (v.1 17/10/2026)
+        implement: Esteban Barracho (v.1 17/10/2026)
+        """
+        events = self.get(key)
+        if events is not None:
+            return events
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._inflight[key] = asyncio.ensure_future(self._load(key, load))
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())  # erreur lue même sans appelant
+        return await asyncio.shield(task)
+
+    async def _load(self, key: str, load) -> list:
+        try:
+            events = await load()
+            self.put(key, events)
+            return events
+        finally:
+            self._inflight.pop(key, None)
+
+    def snapshot(self) -> dict:
+        """Returns the hit / miss counters and the number of cached entries."""
+        with self._lock:
+            return {"entrees": len(self._entries), "hits": self.hits, "misses": self.misses,
+                    "en_cours": len(self._inflight)}
+
+graph_cache = GraphEventCache()
+"""Process-wide cache of the live Outlook events shown in the agenda.
+Version:
+--------
+specification: Esteban Barracho (v.1 17/10/2026)
+implement: Esteban Barracho (v.1 17/10/2026)
+"""
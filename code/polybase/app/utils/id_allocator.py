@@ -0,0 +1,264 @@
+# ============================================
+# IMPORTS
+# ============================================
+
+import os
+import threading
+
+from sqlalchemy import select, text
+from sqlalchemy.exc import IntegrityError
+
+from app.database import SessionLocal
+from app.models import Base, IdSequence
+
+# ============================================
+# MANAGEMENT OF IDENTIFIER PREFIXES
+# ============================================
+
+table_prefixes = {
+    "Client": "CL",
+    "Personnel": "P",
+    "Projet": "PRJ",
+    "Facture": "F",
+    "Tache": "T",
+    "Phase": "PH",
+    "PlanificationCollaborateur": "PL",
+    "PrestationCollaborateur": "PC",
+    "Cout": "C",
+    "ImportLog": "IMP",
+    "Offre": "OFF",
+    "HonoraireReparti": "HR",
+    "ResponsableProjet": "P",
+    "Collaborateur": "P",
+    "Gerer": None,
+    "ProjectionFacturation": "PF"
+}
+"""Identifier prefix of every table (None: composite key, no generated identifier)."""
+
+# ============================================
+# ALLOCATOR CONFIGURATION
+# ============================================
+
+ID_BLOCK_SIZE = int(os.getenv("ID_BLOCK_SIZE", "50"))
+"""Number of identifiers a worker reserves at once for a prefix. The unused
+part of a block is lost when the worker stops (gaps, never duplicates).
+Version:
+--------
+specification: Esteban Barracho (v.1 17/10/2026)
+implement: Esteban Barracho (v.1 17/10/2026)
+"""
+
+ID_MAX_LENGTH = 10
+"""Length of the VARCHAR identifier columns."""
+
+ID_MIN_DIGITS = 3
+"""Minimum number of digits of the numeric part ("CL001")."""
+
+ID_RETRIES = 3
+"""Attempts of an insert whose generated identifier collides with one written explicitly meanwhile."""
+
+# ============================================
+# ID ALLOCATOR
+# ============================================
+
+class IdAllocator:
+    """Hands out sequential business identifiers (prefix + number) without probing the tables.
+    The next free number of each prefix is kept in the IdSequence table
+    (init.sql, mysql-init/upgrade.sql for existing databases). A
+    worker reserves a block of ID_BLOCK_SIZE numbers in a short transaction
+    of its own (row locked by SELECT ... FOR UPDATE, committed at once), then
+    serves the block from memory: several uvicorn workers never receive the
+    same number. The first reservation of a prefix starts after the highest
+    number already used by the tables carrying that prefix. Paths that write
+    identifiers chosen by the caller or a file (client and project creation,
+    Excel imports) move the sequence past them with `advance`; an insert that
+    still collides (block reserved by another worker before that) calls
+    `resync` and retries with a fresh identifier.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.3 17/10/2026)
+    """
+
+    def __init__(self, session_factory=SessionLocal, block_size: int = ID_BLOCK_SIZE):
+        assert block_size > 0, "La taille de bloc doit être positive"
+        self._lock = threading.Lock()
+        self._session_factory = session_factory
+        self._block_size = block_size
+        self._blocks = {}
+
+    # ----- Reservation -----
+
+    @staticmethod
+    def id_column(table: str):
+        """Returns the generated identifier column of a table, or None (composite key, no prefix)."""
+        model = Base.metadata.tables.get(table)
+        if not table_prefixes.get(table) or model is None:
+            return None
+        return list(model.primary_key.columns)[0].name
+
+    @staticmethod
+    def _highest_number(db, prefix: str) -> int:
+        """Returns the highest number used by the tables whose identifiers carry `prefix`."""
+        highest = 0
+        for table_name, table_prefix in table_prefixes.items():
+            table = Base.metadata.tables.get(table_name)
+            if table_prefix != prefix or table is None:
+                continue
+            column = list(table.primary_key.columns)[0]
+            for (value,) in db.execute(select(column).where(column.like(f"{prefix}%"))):
+                suffix = value[len(prefix):]
+                if suffix.isdigit():
+                    highest = max(highest, int(suffix))
+        return highest
+
+    def _reserve(self, prefix: str, size: int) -> int:
+        """Reserves `size` numbers for `prefix` and returns the first one."""
+        db = self._session_factory()
+        try:
+            for _ in range(3):
+                sequence = db.execute(
+                    select(IdSequence).where(IdSequence.prefixe == prefix).with_for_update()
+                ).scalar_one_or_none()
+                if sequence is not None:
+                    start = sequence.prochain
+                    sequence.prochain = start + size
+                    db.commit()
+                    return start
+                start = self._highest_number(db, prefix) + 1
+                db.add(IdSequence(prefixe=prefix, prochain=start + size))
+                try:
+                    db.commit()
+                    return start
+                except IntegrityError:
+                    db.rollback()  # un autre worker a créé la séquence entre-temps
+            raise RuntimeError(f"Impossible de réserver des identifiants pour le préfixe {prefix}")
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    # ----- Allocation -----
+
+    def allocate(self, prefix: str, count: int = 1) -> list:
+        """Returns `count` new identifiers for a prefix.
+        Parameters:
+        -----------
+        prefix (str): Identifier prefix (value of `table_prefixes`).
+        count (int): Number of identifiers requested.
+        Returns:
+        --------
+        list[str]: Identifiers such as "PC001", "PC002", ... (not necessarily consecutive).
+        Raises:
+        -------
+        OverflowError: if an identifier no longer fits in ID_MAX_LENGTH characters.
+        Version:
+        --------
+        specification: Esteban Barracho (v.1 17/10/2026)
+        implement: Esteban Barracho (v.1 17/10/2026)
+        """
+        assert prefix and count >= 0, "Préfixe et nombre d'identifiants requis"
+        numbers = []
+        with self._lock:
+            while len(numbers) < count:
+                block = self._blocks.get(prefix)
+                if block is None or block[0] >= block[1]:
+                    size = max(self._block_size, count - len(numbers))
+                    start = self._reserve(prefix, size)
+                    block = self._blocks[prefix] = [start, start + size]
+                taken = min(count - len(numbers), block[1] - block[0])
+                numbers.extend(range(block[0], block[0] + taken))
+                block[0] += taken
+        ids = [f"{prefix}{n:0{ID_MIN_DIGITS}d}" for n in numbers]
+        if ids and len(ids[-1]) > ID_MAX_LENGTH:
+            raise OverflowError(f"Identifiant {ids[-1]} trop long (maximum {ID_MAX_LENGTH} caractères)")
+        return ids
+
+    def next_id(self, prefix: str) -> str:
+        """Returns one new identifier for a prefix (see `allocate`)."""
+        return self.allocate(prefix)[0]
+
+    # ----- Explicit identifiers -----
+
+    def _move_past(self, prefix: str, number: int):
+        """Makes the sequence and the local block of `prefix` start after `number`."""
+        db = self._session_factory()
+        try:
+            db.execute(text("UPDATE IdSequence SET prochain = :suivant WHERE prefixe = :prefixe AND prochain < :suivant"),
+                       {"suivant": number + 1, "prefixe": prefix})
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+        with self._lock:
+            block = self._blocks.get(prefix)
+            if block is not None:
+                block[0] = max(block[0], min(number + 1, block[1]))
+
+    def advance(self, table: str, ids):
+        """Moves the sequence of a table past identifiers written explicitly (after their commit).
+        The write is already committed: a failure is only logged, the next
+        colliding insert resynchronizes the sequence (`resync`).
+        Parameters:
+        -----------
+        table (str): Table the identifiers were written to.
+        ids (Iterable[str]): Identifiers chosen by the caller or read from a file.
+        Version:
+        --------
+        specification: Esteban Barracho (v.1 17/10/2026)
+        implement: Esteban Barracho (v.1 17/10/2026)
+        """
+        prefix = table_prefixes.get(table)
+        if not prefix:
+            return
+        numbers = [int(i[len(prefix):]) for i in ids
+                   if isinstance(i, str) and i.startswith(prefix) and i[len(prefix):].isdigit()]
+        if not numbers:
+            return
+        try:
+            self._move_past(prefix, max(numbers))
+        except Exception as e:
+            print(f"⚠️  Séquence d'identifiants {prefix} non avancée : {e}")
+
+    def taken(self, db, table: str, ids) -> set:
+        """Returns those of `ids` that already exist in a table (collisions of generated identifiers)."""
+        column = self.id_column(table)
+        ids = list(ids)
+        if column is None or not ids:
+            return set()
+        model = Base.metadata.tables[table]
+        return {i for (i,) in db.execute(select(model.c[column]).where(model.c[column].in_(ids)))}
+
+    def resync(self, prefix: str):
+        """Moves the sequence of a prefix past the highest number found in the tables
+        (after an IntegrityError on a generated identifier).
+        Parameters:
+        -----------
+        prefix (str): Identifier prefix (value of `table_prefixes`).
+        Version:
+        --------
+        specification: Esteban Barracho (v.1 17/10/2026)
+        implement: Esteban Barracho (v.1 17/10/2026)
+        """
+        db = self._session_factory()
+        try:
+            highest = self._highest_number(db, prefix)
+        finally:
+            db.close()
+        self._move_past(prefix, highest)
+
+    def reset(self):
+        """Forgets the reserved blocks (the next allocations reserve new ones)."""
+        with self._lock:
+            self._blocks.clear()
+
+id_allocator = IdAllocator()
+"""Process-wide allocator of the business identifiers.
+Version:
+--------
+specification: Esteban Barracho (v.1 17/10/2026)
+implement: Esteban Barracho (v.1 17/10/2026)
+"""
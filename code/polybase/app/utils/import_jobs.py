@@ -0,0 +1,346 @@
+# ============================================
+# IMPORTS
+# ============================================
+
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from collections import deque, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import DateTime, text
+
+from app.database import SessionLocal
+from app.utils.bulk_import import create_import_log, update_import_log, import_statut, save_import_suggestion
+from app.utils.dashboard_aggregates import aggregates
+from app.utils.response_cache import response_cache
+from app.utils.openrouter_adapter import adapt_excel_to_table, SUGGESTION_PENDING
+from app.utils.scheduler import cross_worker_lock, lock_is_free
+from app.utils.search_index import search_index
+
+# ============================================
+# JOB CONFIGURATION
+# ============================================
+
+IMPORT_WORKERS = int(os.getenv("IMPORT_WORKERS", "2"))
+"""Number of imports processed in parallel (on different tables).
+Version:
+--------
+specification: Esteban Barracho (v.1 17/10/2026)
+implement: Esteban Barracho (v.1 17/10/2026)
+"""
+
+PROGRESS_PERSIST_INTERVAL = 5
+"""Minimum delay (seconds) between two progress writes into ImportLog."""
+
+IMPORT_LOCK_TIMEOUT = int(os.getenv("IMPORT_LOCK_TIMEOUT", "3600"))
+"""Maximum wait (seconds) for the import of a table running in another worker.
+Version:
+--------
+specification: Esteban Barracho (v.1 17/10/2026)
+implement: Esteban Barracho (v.1 17/10/2026)
+"""
+
+IMPORT_LOCK_RETRY = 5
+"""Delay (seconds) before a job whose table is locked by another worker tries the lock again."""
+
+ORPHAN_AFTER = 3 * PROGRESS_PERSIST_INTERVAL
+"""Delay (seconds) without ImportLog write after which a running import whose table lock is free is interrupted."""
+
+MAX_KEPT_JOBS = 200
+"""Number of finished jobs kept in memory (older ones are read back from ImportLog)."""
+
+RUNNING_STATUSES = ("en_attente", "en_cours")
+
+# ============================================
+# IMPORT JOB MANAGER
+# ============================================
+
+class ImportJobManager:
+    """Runs Excel imports in a worker pool instead of inside the HTTP request.
+    A job is identified by its ImportLog row, created as soon as the file is
+    received ("en_attente"), then updated while it runs ("en_cours") and when
+    it ends ("succès", "partiel" or "échec"). Imports targeting the same table
+    are queued and run one after the other; imports on different tables run
+    in parallel up to IMPORT_WORKERS. Across uvicorn workers, an import also
+    holds the MySQL named lock of its table (`cross_worker_lock`). The lock is
+    tried without waiting: while another worker holds it, the job stays queued
+    and tries again every IMPORT_LOCK_RETRY seconds, without keeping an import
+    thread or a pooled connection, and fails after IMPORT_LOCK_TIMEOUT. The AI
+    suggestion is stored with the ImportLog row as soon as it is ready.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.3 17/10/2026)
+    """
+
+    def __init__(self, workers: int = IMPORT_WORKERS):
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="import")
+        self._jobs = OrderedDict()
+        self._queues = {}
+
+    # ----- Submission -----
+
+    def create(self, db, table: str, source: str) -> str:
+        """Registers a new job in ImportLog and returns its identifier.
+        Parameters:
+        -----------
+        db (Session): Active SQLAlchemy session.
+        table (str): Target table.
+        source (str): Original file name.
+        Returns:
+        --------
+        str: Job identifier (= ImportLog.id_import).
+        Version:
+        --------
+        specification: Esteban Barracho (v.1 17/10/2026)
+        implement: Esteban Barracho (v.1 17/10/2026)
+        """
+        id_import = create_import_log(db, source, table, "en_attente", "Import en attente de traitement.")
+        with self._lock:
+            self._jobs[id_import] = {
+                "id": id_import,
+                "table": table,
+                "source": source,
+                "statut": "en_attente",
+                "parsed": None,
+                "inserted": 0,
+                "failed": 0,
+                "errors": [],
+                "suggestion": None,
+                "created_at": time.time(),
+                "started_at": None,
+                "finished_at": None
+            }
+        return id_import
+
+    def submit(self, id_import: str, file_path: str):
+        """Queues the processing of an uploaded file for a registered job.
+        Parameters:
+        -----------
+        id_import (str): Job identifier returned by `create`.
+        file_path (str): Path of the uploaded file on disk.
+        Version:
+        --------
+        specification: Esteban Barracho (v.1 17/10/2026)
+        implement: Esteban Barracho (v.1 17/10/2026)
+        """
+        with self._lock:
+            job = self._jobs[id_import]
+            job["file_path"] = file_path
+            queue = self._queues.get(job["table"])
+            if queue is not None:
+                queue.append(id_import)
+                return
+            self._queues[job["table"]] = deque()
+        self._executor.submit(self._run, id_import)
+
+    def fail(self, id_import: str, message: str):
+        """Marks a registered job as failed before it could be queued (e.g. upload write error).
+        Parameters:
+        -----------
+        id_import (str): Job identifier returned by `create`.
+        message (str): Cause of the failure.
+        Version:
+        --------
+        specification: Esteban Barracho (v.1 17/10/2026)
+        implement: Esteban Barracho (v.1 17/10/2026)
+        """
+        self._mark_failed(id_import, message, f"Import non démarré : {message}")
+
+    def _mark_failed(self, id_import: str, message: str, log_message: str):
+        with self._lock:
+            job = self._jobs.get(id_import)
+        if job is not None:
+            self._update(id_import, statut="échec", finished_at=time.time(),
+                         errors=job["errors"] + [{"ligne": None, "message": message}])
+        db = SessionLocal()
+        try:
+            update_import_log(db, id_import, "échec", log_message)
+        except Exception as log_error:
+            print(f"⚠️  Journal d'import non enregistré : {log_error}")
+        finally:
+            db.close()
+
+    def _next(self, table: str):
+        with self._lock:
+            queue = self._queues[table]
+            if not queue:
+                del self._queues[table]
+                return
+            id_import = queue.popleft()
+        self._executor.submit(self._run, id_import)
+
+    # ----- Processing -----
+
+    def _update(self, id_import: str, **fields):
+        with self._lock:
+            if id_import in self._jobs:
+                self._jobs[id_import].update(fields)
+
+    @staticmethod
+    def _save_suggestion(id_import: str, suggestion: str):
+        """Stores the suggestion in its own session: it may arrive from the AI thread, after the import."""
+        db = SessionLocal()
+        try:
+            save_import_suggestion(db, id_import, suggestion)
+        except Exception as e:
+            print(f"⚠️  Suggestion IA non enregistrée : {e}")
+        finally:
+            db.close()
+
+    def _run(self, id_import: str):
+        job = self._jobs[id_import]
+        table = job["table"]
+        waiting = False
+        try:
+            with cross_worker_lock(f"import_{table}") as acquired:
+                if acquired:
+                    self._import(id_import, job)
+                else:
+                    waiting = self._retry_later(id_import, job)
+                    if not waiting:
+                        raise RuntimeError(f"un autre import de la table {table} est toujours en cours")
+        except Exception as e:
+            self._mark_failed(id_import, str(e), f"Import interrompu : {e}")
+        finally:
+            if not waiting:
+                self._cleanup(id_import, job)
+
+    def _retry_later(self, id_import: str, job: dict) -> bool:
+        """Schedules another lock attempt for a job whose table is locked by another worker.
+        Returns False once the job has waited IMPORT_LOCK_TIMEOUT seconds."""
+        first_attempt = job.setdefault("lock_wait_since", time.monotonic())
+        if time.monotonic() - first_attempt >= IMPORT_LOCK_TIMEOUT:
+            return False
+        retry = threading.Timer(IMPORT_LOCK_RETRY, self._executor.submit, (self._run, id_import))
+        retry.daemon = True
+        retry.start()
+        return True
+
+    def _import(self, id_import: str, job: dict):
+        db = SessionLocal()
+        log_db = SessionLocal()
+        last_persist = [0.0]
+
+        def on_progress(**fields):
+            self._update(id_import, **fields)
+            if "suggestion" in fields:
+                self._save_suggestion(id_import, fields["suggestion"])
+                return
+            now = time.monotonic()
+            if now - last_persist[0] >= PROGRESS_PERSIST_INTERVAL:
+                last_persist[0] = now
+                update_import_log(log_db, id_import, "en_cours", self._progress_message(self._jobs[id_import]))
+
+        try:
+            self._update(id_import, statut="en_cours", started_at=time.time())
+            update_import_log(log_db, id_import, "en_cours", "Import en cours.")
+            report, suggestion = adapt_excel_to_table(table=job["table"], file_path=job["file_path"], db=db,
+                                                      source=job["source"], id_import=id_import,
+                                                      on_progress=on_progress)
+            final = {"suggestion": suggestion} if suggestion != SUGGESTION_PENDING else {}
+            self._update(id_import, statut=import_statut(report), inserted=report["inserted"], failed=report["failed"],
+                         errors=report["errors"], finished_at=time.time(), **final)
+        finally:
+            db.close()
+            log_db.close()
+
+    def _cleanup(self, id_import: str, job: dict):
+        table = job["table"]
+        try:
+            aggregates.invalidate_for(table)
+            response_cache.invalidate(table)
+            search_index.schedule_rebuild()
+            if os.path.exists(job["file_path"]):
+                os.remove(job["file_path"])
+            self._prune()
+        except Exception as cleanup_error:
+            print(f"⚠️  Nettoyage de l'import {id_import} incomplet : {cleanup_error}")
+        finally:
+            # The queue of the table must be drained whatever happens, or its next imports never start
+            self._next(table)
+
+    @staticmethod
+    def _progress_message(job: dict) -> str:
+        parsed = job["parsed"] if job["parsed"] is not None else "?"
+        return f"Import en cours : {parsed} ligne(s) lue(s), {job['inserted']} insérée(s), {job['failed']} en échec."
+
+    def _prune(self):
+        with self._lock:
+            finished = [k for k, j in self._jobs.items() if j["statut"] not in RUNNING_STATUSES]
+            for key in finished[:max(0, len(finished) - MAX_KEPT_JOBS)]:
+                del self._jobs[key]
+
+    # ----- Status -----
+
+    @staticmethod
+    def _orphaned(db, row) -> bool:
+        """Tells whether a running ImportLog row no longer has a worker processing it.
+        With a single process (other engines than MySQL), a job missing from
+        memory was lost in a restart. Across uvicorn workers the job may live
+        in another worker: it is only orphaned when nobody holds the lock of
+        its table and the row has not been written for a while (ORPHAN_AFTER
+        for a running import, IMPORT_LOCK_TIMEOUT for a queued one).
+        """
+        if db.get_bind().dialect.name != "mysql":
+            return True
+        if not lock_is_free(db, f"import_{row['type_donnee']}"):
+            return False
+        updated = row["derniere_maj"]
+        stale_after = ORPHAN_AFTER if row["statut"] == "en_cours" else IMPORT_LOCK_TIMEOUT
+        return updated is None or datetime.now() - updated > timedelta(seconds=stale_after)
+
+    def status(self, db, id_import: str) -> dict:
+        """Returns the progress of a job, from memory or, when another worker
+        (or a previous process) handled it, from ImportLog. A running job read
+        from ImportLog is only reported "interrompu" when it is orphaned.
+        Parameters:
+        -----------
+        db (Session): Active SQLAlchemy session.
+        id_import (str): Job identifier.
+        Returns:
+        --------
+        dict: Job state, or None if the job is unknown.
+        Version:
+        --------
+        specification: Esteban Barracho (v.1 17/10/2026)
+        implement: Esteban Barracho (v.3 17/10/2026)
+        """
+        with self._lock:
+            job = self._jobs.get(id_import)
+            if job is not None:
+                state = {k: v for k, v in job.items() if k not in ("file_path", "lock_wait_since")}
+                state["suggestion_prete"] = job["suggestion"] is not None
+                if job["statut"] == "en_attente" and job["table"] in self._queues:
+                    queue = list(self._queues[job["table"]])
+                    state["position"] = queue.index(id_import) + 1 if id_import in queue else 0
+                return state
+        row = db.execute(text(
+            "SELECT id_import, source, type_donnee, statut, message_log, suggestion_ia, derniere_maj "
+            "FROM ImportLog WHERE id_import = :id"
+        ).columns(derniere_maj=DateTime), {"id": id_import}).mappings().first()
+        if row is None:
+            return None
+        statut = row["statut"]
+        if statut in RUNNING_STATUSES and self._orphaned(db, row):
+            statut = "interrompu"
+        return {
+            "id": row["id_import"],
+            "table": row["type_donnee"],
+            "source": row["source"],
+            "statut": statut,
+            "message": row["message_log"],
+            "suggestion": row["suggestion_ia"],
+            "suggestion_prete": row["suggestion_ia"] is not None
+        }
+
+import_jobs = ImportJobManager()
+"""Process-wide import job manager used by the admin import routes.
+Version:
+--------
+specification: Esteban Barracho (v.1 17/10/2026)
+implement: Esteban Barracho (v.1 17/10/2026)
+"""
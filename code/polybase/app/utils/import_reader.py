@@ -0,0 +1,150 @@
+# ============================================
+# IMPORTS
+# ============================================
+
+import csv
+import os
+from itertools import islice
+
+import pandas as pd
+from openpyxl import load_workbook
+
+# ============================================
+# READER CONFIGURATION
+# ============================================
+
+IMPORT_CHUNK_ROWS = int(os.getenv("IMPORT_CHUNK_ROWS", "5000"))
+"""Number of source rows converted and inserted at a time during an import.
+Version:
+--------
+specification: Esteban Barracho (v.1 17/10/2026)
+implement: Esteban Barracho (v.1 17/10/2026)
+"""
+
+CSV_EXTENSIONS = {".csv", ".txt"}
+EXCEL_EXTENSIONS = {".xlsx", ".xlsm"}
+
+# ============================================
+# CHUNK
+# ============================================
+
+class ImportChunk:
+    """A block of consecutive source rows.
+    Attributes:
+    -----------
+    df (pd.DataFrame): Raw values of the rows, with the stripped header as columns.
+    lines (list[int]): Line number of every row in the source file (header = line 1).
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+
+    def __init__(self, df: pd.DataFrame, lines: list):
+        self.df = df
+        self.lines = lines
+
+# ============================================
+# STREAMING READERS
+# ============================================
+
+def _header(values) -> list:
+    return [str(v).strip() if v is not None else f"Unnamed: {i}" for i, v in enumerate(values)]
+
+def _iter_excel(file_path: str, chunk_rows: int):
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = _header(header)
+        width = len(columns)
+        line = 1
+        while True:
+            batch = list(islice(rows, chunk_rows))
+            if not batch:
+                return
+            values, lines = [], []
+            for row in batch:
+                line += 1
+                if all(v is None for v in row):
+                    continue
+                values.append(tuple(row[:width]) + (None,) * (width - len(row)))
+                lines.append(line)
+            if values:
+                yield ImportChunk(pd.DataFrame(values, columns=columns), lines)
+    finally:
+        workbook.close()
+
+def _iter_csv(file_path: str, chunk_rows: int):
+    with open(file_path, newline="", encoding="utf-8-sig") as f:
+        sample = f.read(64 * 1024)
+    try:
+        sep = csv.Sniffer().sniff(sample, delimiters=",;\t").delimiter
+    except csv.Error:
+        sep = ","
+    line = 2
+    for df in pd.read_csv(file_path, sep=sep, chunksize=chunk_rows, encoding="utf-8-sig", dtype=str,
+                          keep_default_na=False, na_values=[""], skip_blank_lines=False):
+        df.columns = [str(c).strip() for c in df.columns]
+        filled = df.notna().any(axis=1).tolist()
+        lines = [line + i for i, keep in enumerate(filled) if keep]
+        line += len(df)
+        if lines:
+            yield ImportChunk(df[filled].reset_index(drop=True), lines)
+
+def _iter_dataframe(file_path: str, chunk_rows: int):
+    df = pd.read_excel(file_path)
+    df.columns = df.columns.astype(str).str.strip()
+    for start in range(0, len(df), chunk_rows):
+        part = df.iloc[start:start + chunk_rows]
+        yield ImportChunk(part.reset_index(drop=True), list(range(start + 2, start + 2 + len(part))))
+
+def iter_import_chunks(file_path: str, chunk_rows: int = IMPORT_CHUNK_ROWS):
+    """Reads an import file block by block so that memory stays bounded by the chunk size.
+    `.xlsx`/`.xlsm` workbooks are read with openpyxl in read-only mode (first
+    sheet, first row = header, blank rows skipped); `.csv` files take a pandas
+    chunked fast path with delimiter detection. Other formats (e.g. `.xls`)
+    fall back to a full `pd.read_excel`.
+    Parameters:
+    -----------
+    file_path (str): Path of the file to import.
+    chunk_rows (int): Maximum number of rows per chunk.
+    Yields:
+    -------
+    ImportChunk: Raw rows of the chunk and their line numbers in the file.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+    assert chunk_rows > 0, "La taille de bloc doit être positive"
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension in EXCEL_EXTENSIONS:
+        return _iter_excel(file_path, chunk_rows)
+    if extension in CSV_EXTENSIONS:
+        return _iter_csv(file_path, chunk_rows)
+    return _iter_dataframe(file_path, chunk_rows)
+
+def estimate_rows(file_path: str):
+    """Estimates the number of data rows of a workbook from its declared dimension.
+    Parameters:
+    -----------
+    file_path (str): Path of the file to import.
+    Returns:
+    --------
+    int | None: Estimated row count, or None when it cannot be known without reading the file.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+    if os.path.splitext(file_path)[1].lower() not in EXCEL_EXTENSIONS:
+        return None
+    workbook = load_workbook(file_path, read_only=True)
+    try:
+        max_row = workbook.active.max_row
+        return max_row - 1 if max_row else None
+    finally:
+        workbook.close()
@@ -0,0 +1,272 @@
+# ============================================
+# IMPORTS
+# ============================================
+
+import argparse
+import sys
+from datetime import date
+
+from sqlalchemy import text
+
+from app.database import SessionLocal
+from app.utils.schema_catalog import schema_catalog
+
+# ============================================
+# SECONDARY INDEXES OF THE SCHEMA
+# ============================================
+
+RECOMMENDED_INDEXES = {
+    "IDX_Personnel_email": ("Personnel", ["email"]),
+    "IDX_Tache_statut": ("Tache", ["statut"]),
+    "IDX_Tache_alerte_retard": ("Tache", ["alerte_retard"]),
+    "IDX_Tache_dates": ("Tache", ["date_debut", "date_fin"]),
+    "IDX_Projet_nom": ("Projet", ["nom_projet"]),
+    "IDX_PrestationCollaborateur_date": ("PrestationCollaborateur", ["date"]),
+    "IDX_PlanificationCollaborateur_semaine": ("PlanificationCollaborateur", ["semaine"]),
+    "IDX_ProjectionFacturation_mois": ("ProjectionFacturation", ["mois"]),
+    "IDX_EvenementOutlook_boite_debut": ("EvenementOutlook", ["boite_mail", "date_debut"])
+}
+"""Secondary indexes declared in mysql-init/init.sql, checked on existing databases.
+Version:
+--------
+specification: Esteban Barracho (v.1 17/10/2026)
+implement: Esteban Barracho (v.4 17/10/2026)
+"""
+
+# ============================================
+# KNOWN QUERIES OF THE APPLICATION
+# ============================================
+
+KNOWN_QUERIES = [
+    {
+        "nom": "connexion",
+        "origine": "auth.authenticate_user",
+        "sql": "SELECT * FROM Personnel WHERE email = :email",
+        "params": {"email": "admin@polybase.local"}
+    },
+    {
+        "nom": "taches_en_retard",
+        "origine": "dashboard_aggregates / finance.get_alertes",
+        "sql": "SELECT id_tache FROM Tache WHERE alerte_retard = 1",
+        "params": {}
+    },
+    {
+        "nom": "taches_par_statut",
+        "origine": "dashboard (tâches ouvertes)",
+        "sql": "SELECT id_tache, nom_tache, date_fin FROM Tache WHERE statut IN ('a_faire', 'en_cours')",
+        "params": {}
+    },
+    {
+        "nom": "mes_taches",
+        "origine": "dashboard.dashboard_snapshot",
+        "sql": "SELECT DISTINCT t.id_tache, t.nom_tache, t.statut, t.date_debut, t.date_fin, t.alerte_retard "
+               "FROM Tache t JOIN PlanificationCollaborateur p ON p.id_tache = t.id_tache "
+               "WHERE p.id_collaborateur = :id AND t.statut != 'termine'",
+        "params": {"id": "P002"}
+    },
+    {
+        "nom": "projets_par_prefixe",
+        "origine": "project.project_options (encodage)",
+        "sql": "SELECT id_projet, nom_projet FROM Projet WHERE nom_projet LIKE :prefixe "
+               "ORDER BY nom_projet, id_projet LIMIT 20",
+        "params": {"prefixe": "Migr%"}
+    },
+    {
+        "nom": "prestations_par_periode",
+        "origine": "prestation.list_prestations (date_min / date_max)",
+        "sql": "SELECT id_prestation, date, id_projet, heures_effectuees FROM PrestationCollaborateur "
+               "WHERE date >= :date_min AND date <= :date_max ORDER BY date, id_prestation LIMIT 101",
+        "params": {"date_min": date(2025, 6, 1), "date_max": date(2025, 6, 30)}
+    },
+    {
+        "nom": "planning_semaine",
+        "origine": "planification (vue hebdomadaire)",
+        "sql": "SELECT * FROM PlanificationCollaborateur WHERE semaine = :semaine",
+        "params": {"semaine": "2025-W23"}
+    },
+    {
+        "nom": "projections_du_mois",
+        "origine": "projections de facturation mensuelles",
+        "sql": "SELECT * FROM ProjectionFacturation WHERE mois = :mois",
+        "params": {"mois": "2025-06"}
+    },
+    {
+        "nom": "evenements_outlook_periode",
+        "origine": "outlook_sync.sync_to_db",
+        "sql": "SELECT id_outlook, sujet, date_debut, date_fin, modifie_le FROM EvenementOutlook "
+               "WHERE boite_mail = :boite AND date_debut < :fin AND date_fin > :debut",
+        "params": {"boite": "me", "debut": date(2025, 6, 1), "fin": date(2025, 7, 1)}
+    },
+    {
+        "nom": "agenda_taches",
+        "origine": "outlook.get_agenda (tâches planifiées d'une période)",
+        "sql": "SELECT DISTINCT t.id_tache, t.nom_tache, t.date_debut, t.date_fin, t.statut "
+               "FROM Tache t JOIN PlanificationCollaborateur p ON p.id_tache = t.id_tache "
+               "WHERE p.id_collaborateur = :id AND t.date_debut < :fin AND t.date_fin >= :debut",
+        "params": {"id": "P002", "debut": date(2025, 6, 2), "fin": date(2025, 6, 9)}
+    },
+    {
+        "nom": "depassements_par_projet",
+        "origine": "finance.get_depassements",
+        "sql": "SELECT tp.id_projet, SUM(t.heures_depassees) FROM Tache t "
+               "JOIN (SELECT DISTINCT id_tache, id_projet FROM PrestationCollaborateur "
+               "WHERE id_tache IS NOT NULL AND id_projet IS NOT NULL) tp ON tp.id_tache = t.id_tache "
+               "WHERE t.heures_depassees > 0 GROUP BY tp.id_projet",
+        "params": {}
+    }
+]
+"""Queries issued by the routes on filtered columns, with representative parameters.
+Version:
+--------
+specification: Esteban Barracho (v.1 17/10/2026)
+implement: Esteban Barracho (v.4 17/10/2026)
+"""
+
+FULL_SCAN_TYPES = {"ALL": "scan complet de la table", "index": "parcours complet d'un index"}
+
+# ============================================
+# ANALYSIS
+# ============================================
+
+def explain(db, query: dict) -> list:
+    """Runs EXPLAIN on a known query.
+    Parameters:
+    -----------
+    db (Session): Active SQLAlchemy session (MySQL).
+    query (dict): Entry of KNOWN_QUERIES.
+    Returns:
+    --------
+    list[dict]: One row of the MySQL plan per accessed table.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+    return [dict(row) for row in db.execute(text(f"EXPLAIN {query['sql']}"), query["params"]).mappings()]
+
+def full_scans(plan: list) -> list:
+    """Lists the full scans of a plan.
+    A scan on a derived table (`<derived2>`) is ignored; a scan with
+    `possible_keys` means an index exists but the optimizer chose not to use
+    it (often a table still too small for the index to pay off).
+    Parameters:
+    -----------
+    plan (list[dict]): Result of `explain`.
+    Returns:
+    --------
+    list[dict]: {"table", "type", "probleme", "index_possibles", "lignes"} per flagged row.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+    alerts = []
+    for row in plan:
+        table = row.get("table") or ""
+        if row.get("type") not in FULL_SCAN_TYPES or table.startswith("<"):
+            continue
+        alerts.append({
+            "table": table,
+            "type": row["type"],
+            "probleme": FULL_SCAN_TYPES[row["type"]] + (" (index disponible mais ignoré)" if row.get("possible_keys") else ""),
+            "index_possibles": row.get("possible_keys"),
+            "lignes": row.get("rows")
+        })
+    return alerts
+
+def missing_indexes(db) -> list:
+    """Compares RECOMMENDED_INDEXES to the indexes of the database.
+    Parameters:
+    -----------
+    db (Session): Active SQLAlchemy session.
+    Returns:
+    --------
+    list[str]: CREATE INDEX statements of the missing indexes.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+    statements = []
+    for name, (table, columns) in RECOMMENDED_INDEXES.items():
+        if not schema_catalog.has_table(db, table):
+            continue
+        existing = [index["column_names"][:len(columns)] for index in schema_catalog.indexes(db, table)]
+        if columns not in existing:
+            statements.append(f"CREATE INDEX {name} ON {table} ({', '.join(columns)})")
+    return statements
+
+def advise(db) -> dict:
+    """Runs EXPLAIN on every known query and lists the full scans and missing indexes.
+    Parameters:
+    -----------
+    db (Session): Active SQLAlchemy session (MySQL).
+    Returns:
+    --------
+    dict: {"requetes": [{"nom", "origine", "plan", "alertes"}, ...], "index_manquants": [...]}
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+    report = []
+    for query in KNOWN_QUERIES:
+        try:
+            plan = explain(db, query)
+        except Exception as e:
+            db.rollback()
+            report.append({"nom": query["nom"], "origine": query["origine"], "erreur": str(e)})
+            continue
+        report.append({"nom": query["nom"], "origine": query["origine"], "plan": plan, "alertes": full_scans(plan)})
+    return {"requetes": report, "index_manquants": missing_indexes(db)}
+
+# ============================================
+# COMMAND LINE
+# ============================================
+
+def main(argv=None) -> int:
+    """Prints the advisor report for the database of the .env file (DB_* variables).
+    Exit code 1 when a query scans a table that has no usable index, or a
+    recommended index is missing, so that the command can gate a CI job
+    running against the MySQL container of docker-compose.yml.
+    Usage (from code/polybase):
+        python -m app.utils.index_advisor [--apply]
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+    parser = argparse.ArgumentParser(description="Analyse EXPLAIN des requêtes connues de PolyBase")
+    parser.add_argument("--apply", action="store_true", help="Crée les index recommandés manquants")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        report = advise(db)
+        failed = False
+        for query in report["requetes"]:
+            if "erreur" in query:
+                failed = True
+                print(f"❌ {query['nom']:<26} {query['erreur']}")
+                continue
+            if not query["alertes"]:
+                print(f"✅ {query['nom']:<26} ({query['origine']})")
+            for alert in query["alertes"]:
+                failed = failed or not alert["index_possibles"]
+                print(f"⚠️  {query['nom']:<26} {alert['table']} : {alert['probleme']} ({alert['lignes']} ligne(s))")
+        for statement in report["index_manquants"]:
+            if args.apply:
+                db.execute(text(statement))
+                print(f"🛠️  {statement}")
+            else:
+                failed = True
+                print(f"❌ Index manquant : {statement};")
+        if args.apply and report["index_manquants"]:
+            db.commit()
+            schema_catalog.invalidate()
+        return 1 if failed else 0
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,11 +2,18 @@
 # IMPORTS
 # ============================================
 
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+
 import pandas as pd
 import requests
 import json
 from app.database import SessionLocal
-from sqlalchemy import inspect, text
+from app.utils.bulk_import import bulk_insert, write_import_log, LOAD_DATA_MIN_ROWS
+from app.utils.import_reader import iter_import_chunks, estimate_rows
+from sqlalchemy import text
+from app.utils.schema_catalog import schema_catalog
+from app.utils.suggestion_cache import suggestion_cache, column_signature, sample_hash
 import time
 import sqlalchemy.exc
 
@@ -24,16 +31,80 @@ HEADERS = {
     "Content-Type": "application/json"
 }
 
+OPENROUTER_TIMEOUT = float(os.getenv("OPENROUTER_TIMEOUT", "30"))
+"""Timeout (seconds) of an OpenRouter request.
+Version:
+--------
+specification: Esteban Barracho (v.1 17/10/2026)
+implement: Esteban Barracho (v.1 17/10/2026)
+"""
+
+OPENROUTER_MODE = os.getenv("OPENROUTER_MODE", "async")
+"""How imports obtain the AI suggestion:
+"async" (the import never waits for the model, the suggestion is published when ready),
+"sync" (the import waits for the suggestion) or
+"stub" (local stand-in, no network call; for tests and offline development).
+Version:
+--------
+specification: Esteban Barracho (v.1 17/10/2026)
+implement: Esteban Barracho (v.1 17/10/2026)
+"""
+
+SUGGESTION_PENDING = "Suggestion IA en cours de génération…"
+
+_suggestion_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="openrouter")
+
 # ============================================
 # AI SUGGESTION FOR EXCEL STRUCTURE
 # ============================================
 
+def _call_openrouter(preview: list, table: str) -> str:
+    """Sends the preview rows to OpenRouter and returns the model answer (or an error message)."""
+    prompt = (
+        f"Voici un extrait d’un fichier Excel destiné à être importé dans une base SQL dans la table `{table}`.\n"
+        f"Données :\n{json.dumps(preview, indent=2, default=str, ensure_ascii=False)}\n\n"
+        "Peux-tu identifier des incohérences, des colonnes suspectes, des types mal alignés ou des fautes ? "
+        "Suggère des corrections ou améliorations pour que l’importation soit propre et cohérente avec une base relationnelle."
+    )
+
+    payload = {
+        "model": OPENROUTER_MODEL,
+        "messages": [
+            {"role": "user", "content": prompt}
+        ]
+    }
+
+    try:
+        response = requests.post(OPENROUTER_ENDPOINT, headers=HEADERS, json=payload, timeout=OPENROUTER_TIMEOUT)
+        if response.status_code == 200:
+            return response.json()["choices"][0]["message"]["content"]
+        else:
+            return f"❌ Erreur IA ({response.status_code}) : {response.text}"
+    except Exception as e:
+        return f"❌ Exception lors de l'appel OpenRouter : {e}"
+
+def _stub_suggestion(df: pd.DataFrame, table: str) -> str:
+    """Local stand-in for the AI model: compares the file columns to the table columns."""
+    db = SessionLocal()
+    try:
+        sql_columns = [col["name"] for col in schema_catalog.columns(db, table)]
+    finally:
+        db.close()
+    missing = [c for c in sql_columns if c not in df.columns]
+    extra = [c for c in df.columns if c not in sql_columns]
+    return (
+        f"Suggestion locale (sans IA) pour `{table}` : "
+        f"colonnes manquantes {missing or 'aucune'}, colonnes inutiles {extra or 'aucune'}."
+    )
+
 def suggest_structure_from_ia(df: pd.DataFrame, table: str) -> str:
     """Send a sample of the Excel file to the AI model via OpenRouter
     to detect any inconsistencies or structural errors.
     The Mistral model analyses the columns, types, and sample data
     to suggest corrections aimed at ensuring maximum compatibility
     with the target relational SQL database.
+    Answers are cached by (table, column signature, sample hash), so
+    re-importing a file with the same structure skips the model call.
     Parameters:
     ---------- -
     df: pd.DataFrame
@@ -47,38 +118,56 @@ def suggest_structure_from_ia(df: pd.DataFrame, table: str) -> str:
     Version:
     --------
     specification: Esteban Barracho (v.1 14/07/2025)
-    implement: Esteban Barracho (v.1 14/07/2025)
+    implement: Esteban Barracho (v.2 17/10/2026)
     """
+    if OPENROUTER_MODE == "stub":
+        return _stub_suggestion(df, table)
 
     preview = df.head(3).to_dict(orient="records")
-    prompt = (
-        f"Voici un extrait d’un fichier Excel destiné à être importé dans une base SQL dans la table `{table}`.\n"
-        f"Données :\n{json.dumps(preview, indent=2)}\n\n"
-        "Peux-tu identifier des incohérences, des colonnes suspectes, des types mal alignés ou des fautes ? "
-        "Suggère des corrections ou améliorations pour que l’importation soit propre et cohérente avec une base relationnelle."
-    )
+    signature = column_signature(df.columns)
+    sample = sample_hash(preview)
+    cached = suggestion_cache.get(table, signature, sample)
+    if cached is not None:
+        return cached
 
-    payload = {
-        "model": OPENROUTER_MODEL,
-        "messages": [
-            {"role": "user", "content": prompt}
-        ]
-    }
+    suggestion = _call_openrouter(preview, table)
+    if not suggestion.startswith("❌"):
+        suggestion_cache.put(table, signature, sample, suggestion)
+    return suggestion
 
-    try:
-        response = requests.post(OPENROUTER_ENDPOINT, headers=HEADERS, json=payload)
-        if response.status_code == 200:
-            return response.json()["choices"][0]["message"]["content"]
-        else:
-            return f"❌ Erreur IA ({response.status_code}) : {response.text}"
-    except Exception as e:
-        return f"❌ Exception lors de l'appel OpenRouter : {e}"
+def request_suggestion(df: pd.DataFrame, table: str) -> Future:
+    """Starts the AI suggestion of a file without blocking the caller.
+    A cached (or stub) suggestion is returned as an already completed future.
+    Parameters:
+    -----------
+    df: pd.DataFrame
+        Data from the Excel file to be evaluated (only the first rows are used).
+    table: str
+        Name of the target SQL table.
+    Return:
+    -------
+    Future
+        Future resolving to the suggestion text.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+    sample = df.head(3).copy()
+    if OPENROUTER_MODE != "stub":
+        preview = sample.to_dict(orient="records")
+        cached = suggestion_cache.get(table, column_signature(sample.columns), sample_hash(preview))
+        if cached is None:
+            return _suggestion_pool.submit(suggest_structure_from_ia, sample, table)
+    future = Future()
+    future.set_result(cached if OPENROUTER_MODE != "stub" else _stub_suggestion(sample, table))
+    return future
 
 # ============================================
 # REORDERING COLUMNS
 # ============================================
 
-def reorder_columns(df: pd.DataFrame, table: str):
+def reorder_columns(df: pd.DataFrame, table: str, verbose: bool = True):
     """Reorders the columns of the DataFrame to match
     the order defined in the target SQL table. Also displays
     missing and unnecessary columns.
@@ -88,6 +177,8 @@ def reorder_columns(df: pd.DataFrame, table: str):
         Data from the Excel file to be aligned.
     table: str
         Name of the SQL table to conform to.
+    verbose: bool
+        Prints the missing and unnecessary columns (first chunk only when streaming).
     Return:
     -------
     pd.DataFrame
@@ -96,17 +187,17 @@ def reorder_columns(df: pd.DataFrame, table: str):
     Version:
     --------
     specification: Esteban Barracho (v.1 14/07/2025)
-    implement: Esteban Barracho (v.1 14/07/2025)
+    implement: Esteban Barracho (v.2 17/10/2026)
     """
     db = SessionLocal()
     try:
-        inspector = inspect(db.get_bind())
-        sql_columns = [col["name"] for col in inspector.get_columns(table)]
+        sql_columns = [col["name"] for col in schema_catalog.columns(db, table)]
         df_cols = df.columns.tolist()
         missing = [col for col in sql_columns if col not in df_cols]
         extra = [col for col in df_cols if col not in sql_columns]
-        print(f"ℹ Colonnes manquantes: {missing}")
-        print(f"ℹ Colonnes inutiles: {extra}")
+        if verbose:
+            print(f"ℹ Colonnes manquantes: {missing}")
+            print(f"ℹ Colonnes inutiles: {extra}")
         ordered = [col for col in sql_columns if col in df.columns]
         return df[ordered]
     finally:
@@ -135,12 +226,11 @@ def fix_types(df: pd.DataFrame, table: str):
     Version:
     --------
     specification: Esteban Barracho (v.1 14/07/2025)
-    implement: Esteban Barracho (v.1 14/07/2025)
+    implement: Esteban Barracho (v.2 17/10/2026)
     """
     db = SessionLocal()
     try:
-        inspector = inspect(db.get_bind())
-        for col in inspector.get_columns(table):
+        for col in schema_catalog.columns(db, table):
             name = col["name"]
             sql_type = str(col["type"]).upper()
             if name not in df.columns:
@@ -188,78 +278,105 @@ def prepare_adaptation():
 # SMART ADAPTATION OF AN EXCEL FILE
 # ============================================
 
-def adapt_excel(file_path: str, table: str) -> tuple[list[dict], str]:
-    """Reads an Excel file, cleans columns and types,
-    calls AI for a suggestion, and returns rows
-    ready to insert + the suggestion.
+def prepare_rows(df: pd.DataFrame, table: str, verbose: bool = True) -> list[dict]:
+    """Aligns the columns and types of a DataFrame on an SQL table
+    and returns the rows ready to insert.
     Parameters:
     -----------
-    file_path: str
-        Path to the imported Excel file.
+    df: pd.DataFrame
+        Raw data read from the Excel file.
     table: str
         Name of the target SQL table.
+    verbose: bool
+        Prints the missing and unnecessary columns.
     Return:
     -------
-    tuple[list[dict], str]
-        Rows converted to the correct format + AI suggestion.
+    list[dict]
+        Rows converted to the correct format (None for an empty or invalid cell,
+        inserted as NULL).
     Version:
     --------
-    specification: Esteban Barracho (v.1.1 14/07/2025)
-    implement: Esteban Barracho (v.1.1 14/07/2025)
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.2 17/10/2026)
     """
-    df = pd.read_excel(file_path)
-    df.columns = df.columns.str.strip()
-
-    suggestion = suggest_structure_from_ia(df, table)
-    print("🧠 Suggestion IA :", suggestion)
-
-    df = reorder_columns(df, table)
-    df = fix_types(df, table)
-    rows = df.fillna("").to_dict(orient="records")
-
-    return rows, suggestion
+    df = reorder_columns(df, table, verbose)
+    df = fix_types(df, table).astype(object)
+    return df.where(df.notna(), None).to_dict(orient="records")
 
 # ============================================
 # ADAPTATION AND INTEGRATION EXCEL FILE
 # ============================================
 
-def adapt_excel_to_table(table: str, file_path: str, db):
+def adapt_excel_to_table(table: str, file_path: str, db, source: str = None, id_import: str = None,
+                         on_progress=None):
     """Automatically adapts an Excel file to an SQL table:
     adjusts columns, corrects types, calls on AI to
     suggest possible corrections, then inserts valid rows
-    into the database.
+    into the database by batches and writes an ImportLog summary.
+    The file is streamed by chunks of IMPORT_CHUNK_ROWS rows (openpyxl
+    read-only or chunked CSV) and each chunk is converted and inserted
+    before the next one is read, so memory does not grow with the file.
+    The AI call runs in parallel with the type conversion and the
+    insertion; unless OPENROUTER_MODE is "sync", the import does not wait
+    for it and `on_progress` receives the suggestion once it is ready.
     Parameters:
     -----------
     table: str
         Name of the target SQL table.
     file_path: str
-        Path to the Excel file to be imported.
+        Path to the Excel (.xlsx) or CSV file to be imported.
     db: Session
         Active SQLAlchemy session (passed by FastAPI).
+    source: str
+        Original file name recorded in ImportLog (defaults to the file path name).
+    id_import: str
+        Existing ImportLog row to complete (import job), or None to create one.
+    on_progress: callable
+        Optional callback receiving keyword updates: parsed, inserted, failed, suggestion.
     Return:
     -------
-    tuple[int, str]
-        Number of rows inserted into the database +
-        AI suggestion returned for display.
+    tuple[dict, str]
+        Import report of `bulk_insert` (inserted, failed, errors with
+        line numbers, method, id_import) + AI suggestion returned for display
+        (SUGGESTION_PENDING if it is not ready yet).
     Version:
     --------
     specification: Esteban Barracho (v.2 14/07/2025)
-    implement: Esteban Barracho (v.2 14/07/2025)
+    implement: Esteban Barracho (v.6 17/10/2026)
     """
-    rows, suggestion = adapt_excel(file_path, table)
-    if not rows:
-        return 0, suggestion
+    notify = on_progress or (lambda **fields: None)
+    estimated = estimate_rows(file_path)
+    use_load_data = estimated >= LOAD_DATA_MIN_ROWS if estimated is not None else None
+    report = {"inserted": 0, "failed": 0, "errors": [], "methode": "executemany"}
+    parsed = 0
+    future = None
 
-    columns = rows[0].keys()
-    keys = ", ".join([f"`{k}`" for k in columns])
-    vals = ", ".join([f":{k}" for k in columns])
-    sql = text(f"INSERT INTO `{table}` ({keys}) VALUES ({vals})")
-    count = 0
-    for row in rows:
-        try:
-            db.execute(sql, row)
-            count += 1
-        except Exception as e:
-            print(f"❌ Erreur ligne ignorée : {e}")
-    db.commit()
-    return count, suggestion
+    for chunk in iter_import_chunks(file_path):
+        if future is None:
+            future = request_suggestion(chunk.df, table)
+            future.add_done_callback(lambda f: notify(suggestion=f.result()))
+        rows = prepare_rows(chunk.df, table, verbose=parsed == 0)
+        parsed += len(rows)
+        notify(parsed=parsed)
+        done = dict(report)
+        chunk_report = bulk_insert(
+            db, table, rows, lines=chunk.lines, use_load_data=use_load_data,
+            progress=lambda r: notify(inserted=done["inserted"] + r["inserted"],
+                                      failed=done["failed"] + r["failed"])
+        )
+        report["inserted"] += chunk_report["inserted"]
+        report["failed"] += chunk_report["failed"]
+        report["errors"] += chunk_report["errors"]
+        report["methode"] = chunk_report["methode"]
+
+    if future is None:
+        suggestion = "Fichier vide : aucune suggestion."
+    elif OPENROUTER_MODE == "sync" or future.done():
+        suggestion = future.result()
+        print("🧠 Suggestion IA :", suggestion)
+    else:
+        suggestion = SUGGESTION_PENDING
+
+    report["id_import"] = write_import_log(db, source or os.path.basename(file_path), table, report,
+                                           id_import=id_import)
+    return report, suggestion
@@ -2,18 +2,24 @@
 # IMPORTS
 # ============================================
 
+import hashlib
+import json
 import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from os import getenv
 from urllib.parse import urlencode
 
 import msal
 import requests
+import requests.adapters
 from dotenv import load_dotenv
-from sqlalchemy import text
+from sqlalchemy import text, bindparam
 
 from app.database import SessionLocal
-from app.models import Tache
+from app.models import ExportOutlook, Tache
 
 # ============================================
 # LOADING .ENV
@@ -29,6 +35,65 @@ SCOPE = ["https://graph.microsoft.com/.default"]
 REDIRECT_URI = "http://localhost:8000/outlook/callback"
 OAUTH_SCOPE = ["Calendars.ReadWrite"]
 
+SYNC_WINDOW_DAYS = 30
+"""Number of days of calendar synchronized from today."""
+
+SYNC_BATCH_SIZE = 500
+"""Number of rows sent per multi-row INSERT / UPDATE / DELETE statement."""
+
+GRAPH_BASE_URL = os.getenv("GRAPH_BASE_URL", "https://graph.microsoft.com/v1.0").rstrip("/")
+"""Root of the Microsoft Graph API (can point to a local fake server for tests).
+Version:
+--------
+specification: Esteban Barracho (v.1 17/10/2026)
+implement: Esteban Barracho (v.1 17/10/2026)
+"""
+
+GRAPH_TIMEOUT = float(os.getenv("GRAPH_TIMEOUT", "15"))
+"""Timeout (seconds) of each Graph request."""
+
+GRAPH_PAGE_SIZE = 200
+"""Events requested per Graph page (`Prefer: odata.maxpagesize`)."""
+
+OUTLOOK_MAILBOXES = [m.strip() for m in os.getenv("OUTLOOK_MAILBOXES", "").split(",") if m.strip()]
+"""Mailboxes (user principal names) whose calendars are synchronized with the application token.
+Version:
+--------
+specification: Esteban Barracho (v.1 17/10/2026)
+implement: Esteban Barracho (v.1 17/10/2026)
+"""
+
+DELTA_RESET_DAYS = int(os.getenv("OUTLOOK_DELTA_RESET_DAYS", "7"))
+"""Age (days) of the synchronized period after which a full synchronization
+restarts the delta on a new period (the delta of a calendarView is bound to
+the period of its first request).
+Version:
+--------
+specification: Esteban Barracho (v.1 17/10/2026)
+implement: Esteban Barracho (v.1 17/10/2026)
+"""
+
+GRAPH_BATCH_SIZE = 20
+"""Maximum number of requests of a Graph JSON `$batch` call."""
+
+EXPORT_CONCURRENCY = int(os.getenv("OUTLOOK_EXPORT_CONCURRENCY", "4"))
+"""Number of `$batch` calls in flight at once during an export (Graph throttles
+more than 4 concurrent requests per mailbox).
+Version:
+--------
+specification: Esteban Barracho (v.1 17/10/2026)
+implement: Esteban Barracho (v.1 17/10/2026)
+"""
+
+EXPORT_MAX_RETRIES = 5
+"""Number of times the throttled requests of a `$batch` are sent again."""
+
+EXPORT_MAX_WAIT = 60
+"""Longest wait (seconds) honored for a `Retry-After` header."""
+
+RETRYABLE_STATUSES = (429, 503, 504)
+"""Graph answers sent again after `Retry-After` (throttling, temporary unavailability)."""
+
 # ============================================
 # SYNCHRONISATION FUNCTIONS
 # ============================================
@@ -52,108 +117,371 @@ def get_token():
     result = app.acquire_token_for_client(scopes=SCOPE)
     return result.get("access_token")
 
-def fetch_outlook_events(access_token):
-    """Retrieves Outlook events scheduled for the next 30 days.
+def graph_pages(http, url: str, token: str, params: dict = None):
+    """Follows the pages of a Graph collection (`@odata.nextLink`) until the last one.
+    Parameters:
+    -----------
+    http: requests.Session
+        Pooled HTTP session.
+    url: str
+        First page (collection URL, nextLink or deltaLink).
+    token: str
+        Valid OAuth2 access token.
+    params: dict, optional
+        Query parameters of the first request only (the links already carry them).
+    Returns:
+    --------
+    tuple[list[dict], str | None]: Items of every page, and the `@odata.deltaLink` of the last page.
+    Raises:
+    -------
+    DeltaExpiredError: if Graph no longer knows the delta token (410 Gone).
+    GraphError: for any other non-200 answer.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+    headers = {"Authorization": f"Bearer {token}", "Prefer": f"odata.maxpagesize={GRAPH_PAGE_SIZE}"}
+    items = []
+    while url:
+        response = http.get(url, headers=headers, params=params, timeout=GRAPH_TIMEOUT)
+        params = None
+        if response.status_code == 410:
+            raise DeltaExpiredError(f"Jeton delta expiré ({url})")
+        if response.status_code != 200:
+            raise GraphError(f"Erreur Graph {response.status_code} : {response.text[:200]}")
+        page = response.json()
+        items.extend(page.get("value", []))
+        url = page.get("@odata.nextLink")
+        if not url:
+            return items, page.get("@odata.deltaLink")
+    return items, None
+
+def fetch_outlook_events(access_token, start: datetime = None, end: datetime = None):
+    """Retrieves Outlook events scheduled for the next 30 days (every page).
     Parameters:
     -----------
     access_token: str
         Valid OAuth2 token for authentication.
+    start, end: datetime, optional
+        Period to retrieve (default: the next SYNC_WINDOW_DAYS days).
     Returns:
     --------
     list[dict]: List of events extracted from Microsoft Graph.
     Version:
     --------
     specification: Esteban Barracho (v.2 11/07/2025)
-    implement: Esteban Barracho (v.2 11/07/2025)
+    implement: Esteban Barracho (v.4 17/10/2026)
     """
     assert isinstance(access_token, str) and len(access_token) > 10, "Token OAuth2 invalide"
-    headers = {
-        "Authorization": f"Bearer {access_token}"
+    start = start or datetime.utcnow()
+    end = end or start + timedelta(days=SYNC_WINDOW_DAYS)
+    with requests.Session() as http:
+        events, _ = graph_pages(http, f"{GRAPH_BASE_URL}/me/calendarview", access_token,
+                                {"startdatetime": start.isoformat(), "enddatetime": end.isoformat()})
+    return events
+
+def parse_graph_datetime(value: str):
+    """Converts a Graph `dateTime` ("2025-06-02T08:00:00.0000000", UTC) to a naive datetime (None if missing)."""
+    return datetime.fromisoformat(value[:19]) if value else None
+
+def event_row(ev: dict, mailbox: str):
+    """Maps a Graph event to an EvenementOutlook row (None if it has no identifier or dates)."""
+    assert isinstance(ev, dict), "Événement Outlook invalide"
+    date_debut = parse_graph_datetime(ev.get("start", {}).get("dateTime", ""))
+    date_fin = parse_graph_datetime(ev.get("end", {}).get("dateTime", ""))
+    if not ev.get("id") or not date_debut or not date_fin:
+        return None
+    return {
+        "id_outlook": ev["id"],
+        "boite_mail": mailbox,
+        "sujet": (ev.get("subject") or "Sans titre")[:255],
+        "date_debut": date_debut,
+        "date_fin": date_fin,
+        "modifie_le": ev.get("lastModifiedDateTime")
     }
-    today = datetime.utcnow().isoformat()
-    future = (datetime.utcnow() + timedelta(days=30)).isoformat()
-    url = f"https://graph.microsoft.com/v1.0/me/calendarview?startdatetime={today}&enddatetime={future}"
-    response = requests.get(url, headers=headers)
-    assert response.status_code == 200, f"Erreur lors de la récupération des événements Outlook: {response.status_code}"
-    return response.json().get("value", [])
-
-def sync_to_db(events):
-    """Inserts Outlook events into PlanificationCollaborateur, without duplicates.
+
+def _as_datetime(value):
+    """Normalizes a DATETIME read through a driver returning strings (SQLite) to a datetime."""
+    return datetime.fromisoformat(str(value)) if value is not None and not isinstance(value, datetime) else value
+
+def _batches(items: list, size: int = SYNC_BATCH_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def _upsert_events(db, rows: list) -> tuple:
+    """Writes new or changed events by batches: multi-row INSERT for the unknown
+    identifiers, multi-row UPDATE for the known ones (e.g. moved from another period).
+    Returns (inserted, updated)."""
+    known = set()
+    for batch in _batches([r["id_outlook"] for r in rows]):
+        known.update(i for (i,) in db.execute(
+            text("SELECT id_outlook FROM EvenementOutlook WHERE id_outlook IN :ids")
+            .bindparams(bindparam("ids", expanding=True)), {"ids": batch}))
+    inserts = [r for r in rows if r["id_outlook"] not in known]
+    updates = [r for r in rows if r["id_outlook"] in known]
+    for batch in _batches(inserts):
+        db.execute(text("""
+            INSERT INTO EvenementOutlook (id_outlook, boite_mail, sujet, date_debut, date_fin, modifie_le)
+            VALUES (:id_outlook, :boite_mail, :sujet, :date_debut, :date_fin, :modifie_le)
+        """), batch)
+    for batch in _batches(updates):
+        db.execute(text("""
+            UPDATE EvenementOutlook
+            SET boite_mail = :boite_mail, sujet = :sujet, date_debut = :date_debut,
+                date_fin = :date_fin, modifie_le = :modifie_le
+            WHERE id_outlook = :id_outlook
+        """), batch)
+    return len(inserts), len(updates)
+
+def _delete_events(db, ids: list) -> int:
+    """Deletes events by batches of identifiers and returns the number of deleted rows."""
+    deleted = 0
+    for batch in _batches(ids):
+        deleted += db.execute(text("DELETE FROM EvenementOutlook WHERE id_outlook IN :ids")
+                              .bindparams(bindparam("ids", expanding=True)), {"ids": batch}).rowcount
+    return deleted
+
+def sync_to_db(events, mailbox: str = "me", start: datetime = None, end: datetime = None, db=None) -> dict:
+    """Synchronizes the Outlook events of a mailbox over a period into EvenementOutlook.
+    Set-based: the events already stored for the period are read with one
+    query, compared in memory with the Graph events, and the differences are
+    written by batches (multi-row INSERT, UPDATE and DELETE) in one
+    transaction. A stored event missing from `events` was deleted or moved
+    out of the period in Outlook, and is deleted.
     Parameters:
     -----------
     events: list[dict]
-        List of events retrieved from Outlook.
-
+        Complete list of the Graph events of the period (calendarView).
+    mailbox: str
+        Synchronized mailbox ("me" for the delegated token).
+    start, end: datetime
+        Period covered by `events` (default: the next SYNC_WINDOW_DAYS days).
+    db: Session, optional
+        Session to use (a new one is opened and closed otherwise). The caller commits.
+    Returns:
+    --------
+    dict: {"inserted", "updated", "deleted", "unchanged", "ignored"} counts.
     Version:
     --------
     specification: Esteban Barracho (v.2 11/07/2025)
-    implement: Esteban Barracho (v.2 11/07/2025)
+    implement: Esteban Barracho (v.4 17/10/2026)
     """
     assert isinstance(events, list), "Événements Outlook mal formatés (liste attendue)"
+    start = start or datetime.utcnow()
+    end = end or start + timedelta(days=SYNC_WINDOW_DAYS)
+    report = {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": 0, "ignored": 0}
+
+    incoming = {}
+    for ev in events:
+        row = event_row(ev, mailbox)
+        if row is None:
+            report["ignored"] += 1
+            continue
+        incoming[row["id_outlook"]] = row
+
+    own_session = db is None
+    db = db or SessionLocal()
+    try:
+        existing = {row.id_outlook: row for row in db.execute(text("""
+            SELECT id_outlook, sujet, date_debut, date_fin, modifie_le
+            FROM EvenementOutlook
+            WHERE boite_mail = :boite AND date_debut < :fin AND date_fin > :debut
+        """), {"boite": mailbox, "debut": start, "fin": end})}
+        changed = []
+        for id_outlook, row in incoming.items():
+            old = existing.get(id_outlook)
+            if old is not None and (old.sujet, _as_datetime(old.date_debut), _as_datetime(old.date_fin),
+                                    old.modifie_le) == (row["sujet"], row["date_debut"], row["date_fin"],
+                                                        row["modifie_le"]):
+                report["unchanged"] += 1
+            else:
+                changed.append(row)
+        report["inserted"], report["updated"] = _upsert_events(db, changed)
+        report["deleted"] = _delete_events(db, [i for i in existing if i not in incoming])
+        if own_session:
+            db.commit()
+        return report
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        if own_session:
+            db.close()
+
+# ============================================
+# INCREMENTAL (DELTA) SYNCHRONISATION
+# ============================================
+
+class GraphError(RuntimeError):
+    """Non-200 answer of Microsoft Graph."""
+
+class DeltaExpiredError(GraphError):
+    """The delta token stored for a mailbox is no longer valid (410 Gone): a full synchronization is needed."""
+
+def apply_delta(db, mailbox: str, items: list) -> dict:
+    """Applies the items of a delta round: changed events are upserted, `@removed` ones deleted.
+    Parameters:
+    -----------
+    db: Session
+        Active SQLAlchemy session (the caller commits).
+    mailbox: str
+        Synchronized mailbox.
+    items: list[dict]
+        Items returned by `calendarView/delta`.
+    Returns:
+    --------
+    dict: {"inserted", "updated", "deleted", "unchanged", "ignored"} counts.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+    changed, removed, ignored = {}, set(), 0
+    for item in items:
+        if "@removed" in item:
+            removed.add(item.get("id"))
+            changed.pop(item.get("id"), None)
+            continue
+        row = event_row(item, mailbox)
+        if row is None:
+            ignored += 1
+            continue
+        changed[row["id_outlook"]] = row
+        removed.discard(row["id_outlook"])
+    inserted, updated = _upsert_events(db, list(changed.values()))
+    return {"inserted": inserted, "updated": updated, "deleted": _delete_events(db, [i for i in removed if i]),
+            "unchanged": 0, "ignored": ignored}
+
+def delta_sync(mailbox: str, token: str, http=None, now: datetime = None) -> dict:
+    """Synchronizes one mailbox incrementally with `calendarView/delta`.
+    The first run (or a run after DELTA_RESET_DAYS, or after the token expired)
+    downloads the whole SYNC_WINDOW_DAYS period, reconciles it with
+    `sync_to_db` and stores the `deltaLink` of the mailbox in SynchroOutlook.
+    Later runs call the stored `deltaLink` and only receive the events created,
+    changed or deleted since, which `apply_delta` writes. Events and link are
+    committed together, so an interrupted run is replayed from the previous link.
+    Parameters:
+    -----------
+    mailbox: str
+        User principal name (or id) of the mailbox.
+    token: str
+        Application access token (`get_token`).
+    http: requests.Session, optional
+        Pooled HTTP session (a new one is opened otherwise).
+    now: datetime, optional
+        Current UTC time (tests).
+    Returns:
+    --------
+    dict: Counts of `sync_to_db` / `apply_delta`, plus "mode" ("complet" or "delta").
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+    now = now or datetime.utcnow()
+    own_http = http is None
+    http = http or requests.Session()
     db = SessionLocal()
     try:
-        for ev in events:
-            assert isinstance(ev, dict), "Événement Outlook invalide"
-            sujet = ev.get("subject", "Sans titre")
-            date_debut = ev.get("start", {}).get("dateTime", "")
-            date_fin = ev.get("end", {}).get("dateTime", "")
-            if not date_debut or not date_fin:
-                continue
-            date_debut = date_debut[:19]
-            date_fin = date_fin[:19]
-            exists = db.execute(text("""
-                                     SELECT 1
-                                     FROM PlanificationCollaborateur
-                                     WHERE sujet = :s
-                                       AND date_debut = :d1
-                                       AND date_fin = :d2
-                                     """), {"s": sujet, "d1": date_debut, "d2": date_fin}).first()
-            if exists:
-                continue
+        state = db.execute(text("SELECT delta_link, debut_fenetre FROM SynchroOutlook WHERE boite_mail = :boite"),
+                           {"boite": mailbox}).first()
+        report = None
+        if state and state.delta_link and now - _as_datetime(state.debut_fenetre) < timedelta(days=DELTA_RESET_DAYS):
+            try:
+                items, delta_link = graph_pages(http, state.delta_link, token)
+                report = apply_delta(db, mailbox, items)
+                report["mode"] = "delta"
+                start = _as_datetime(state.debut_fenetre)
+            except DeltaExpiredError:
+                report = None
+        if report is None:
+            start, end = now, now + timedelta(days=SYNC_WINDOW_DAYS)
+            items, delta_link = graph_pages(http, f"{GRAPH_BASE_URL}/users/{mailbox}/calendarView/delta", token,
+                                            {"startDateTime": start.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                                             "endDateTime": end.strftime("%Y-%m-%dT%H:%M:%SZ")})
+            report = sync_to_db([i for i in items if "@removed" not in i], mailbox, start, end, db=db)
+            report["mode"] = "complet"
+        params = {"boite": mailbox, "lien": delta_link, "debut": start,
+                  "fin": start + timedelta(days=SYNC_WINDOW_DAYS), "maintenant": now}
+        if state:
             db.execute(text("""
-                            INSERT INTO PlanificationCollaborateur (sujet, date_debut, date_fin, source)
-                            VALUES (:s, :d1, :d2, 'outlook')
-                            """), {"s": sujet, "d1": date_debut, "d2": date_fin})
+                UPDATE SynchroOutlook
+                SET delta_link = :lien, debut_fenetre = :debut, fin_fenetre = :fin, derniere_synchro = :maintenant
+                WHERE boite_mail = :boite
+            """), params)
+        else:
+            db.execute(text("""
+                INSERT INTO SynchroOutlook (boite_mail, delta_link, debut_fenetre, fin_fenetre, derniere_synchro)
+                VALUES (:boite, :lien, :debut, :fin, :maintenant)
+            """), params)
         db.commit()
-    except Exception as e:
+        return report
+    except Exception:
         db.rollback()
-        print(f"❌ Erreur de sync Outlook: {e}")
+        raise
     finally:
         db.close()
+        if own_http:
+            http.close()
 
-def launch_sync():
-    """Launches full synchronization from Outlook to the database.
+def launch_sync() -> dict:
+    """Launches the synchronization of the OUTLOOK_MAILBOXES calendars to the database.
     This function performs the following steps:
     Retrieves the client token,
-    Extracts Outlook events,
-    Inserts filtered events into the database.
+    Synchronizes every mailbox incrementally (`delta_sync`) over one pooled HTTP session,
+    Reports the counts of each mailbox.
+    Returns:
+    --------
+    dict: Report of each mailbox (counts, or {"erreur": message}).
     Version:
     --------
     specification: Esteban Barracho (v.2 11/07/2025)
-    implement: Esteban Barracho (v.2 11/07/2025)
+    implement: Esteban Barracho (v.4 17/10/2026)
     """
+    reports = {}
     try:
         token = get_token()
-        events = fetch_outlook_events(token)
-        sync_to_db(events)
-        print(f"✔ Outlook sync terminé : {len(events)} événements analysés.")
     except Exception as e:
         print(f"❌ Outlook sync échouée: {e}")
+        return reports
+    with requests.Session() as http:
+        for mailbox in OUTLOOK_MAILBOXES:
+            try:
+                report = reports[mailbox] = delta_sync(mailbox, token, http)
+                print(f"✔ Outlook sync {mailbox} ({report['mode']}) : {report['inserted']} ajoutés, "
+                      f"{report['updated']} modifiés, {report['deleted']} supprimés, "
+                      f"{report['unchanged']} inchangés.")
+            except Exception as e:
+                reports[mailbox] = {"erreur": str(e)}
+                print(f"❌ Outlook sync {mailbox} échouée: {e}")
+    return reports
+
+def is_configured() -> bool:
+    """Tells whether the application credentials and at least one mailbox are configured."""
+    return all([getenv("GRAPH_CLIENT_ID"), getenv("GRAPH_TENANT_ID"), getenv("GRAPH_CLIENT_SECRET")]) \
+        and bool(OUTLOOK_MAILBOXES)
 
-def synchronize_outlook():
-    """Main entry point called when the backend starts up.
+def synchronize_outlook() -> dict:
+    """Main entry point of the synchronization (background scheduler or command line).
     This function triggers the retrieval of Outlook events
     and their insertion into the database, if necessary.
+    Returns:
+    --------
+    dict: Report of each mailbox (empty if the synchronization is not configured).
     Version:
     --------
     specification: Esteban Barracho (v.2 11/07/2025)
-    implement: Esteban Barracho (v.2 11/07/2025)
+    implement: Esteban Barracho (v.3 17/10/2026)
     """
     if not all([getenv("GRAPH_CLIENT_ID"), getenv("GRAPH_TENANT_ID"), getenv("GRAPH_CLIENT_SECRET")]):
         print("⚠️  Identifiants Outlook manquants, synchronisation ignorée.")
-        return
+        return {}
+    if not OUTLOOK_MAILBOXES:
+        print("⚠️  Aucune boîte Outlook configurée (OUTLOOK_MAILBOXES), synchronisation ignorée.")
+        return {}
     print("🔄 Synchronisation Outlook en cours...")
-    launch_sync()
+    return launch_sync()
 
 def get_oauth_url():
     """Dynamically builds the redirect URL for OAuth2 authentication.
@@ -206,49 +534,219 @@ def exchange_code_for_token(code: str):
     assert isinstance(token, str) and len(token) > 10, "Échec de récupération du token OAuth2"
     return token
 
-def create_events_from_db(db, token: str):
-    """Creates events in Outlook based on important system tasks.
+# ============================================
+# EXPORT OF TASKS TO OUTLOOK ($batch)
+# ============================================
+
+def task_event(t) -> dict:
+    """Builds the Graph event of a task: all-day event from its start date to the day after its end date."""
+    return {
+        "subject": t.nom_tache,
+        "isAllDay": True,
+        "start": {"dateTime": f"{t.date_debut.isoformat()}T00:00:00", "timeZone": "UTC"},
+        "end": {"dateTime": f"{(t.date_fin + timedelta(days=1)).isoformat()}T00:00:00", "timeZone": "UTC"},
+        "body": {"contentType": "Text", "content": t.description or "Tâche PolyBase"}
+    }
+
+def _retry_after(headers: dict, attempt: int) -> float:
+    """Delay requested by a throttled answer (Retry-After, in seconds), or an exponential backoff."""
+    value = {k.lower(): v for k, v in (headers or {}).items()}.get("retry-after")
+    try:
+        return min(float(value), EXPORT_MAX_WAIT)
+    except (TypeError, ValueError):
+        return min(2 ** attempt, EXPORT_MAX_WAIT)
+
+def send_batch(http, token: str, requests_: list, sleep=time.sleep) -> dict:
+    """Sends up to GRAPH_BATCH_SIZE requests in one JSON `$batch` call, retrying the throttled ones.
+    Requests answered 429 / 503 / 504 (or the whole batch, when it is
+    throttled) are sent again after the longest `Retry-After` of the round,
+    at most EXPORT_MAX_RETRIES times. A PATCH answered 404 (event deleted in
+    Outlook) is sent again as a POST, so the event is recreated.
+    Parameters:
+    -----------
+    http: requests.Session
+        Pooled HTTP session.
+    token: str
+        Valid OAuth2 access token.
+    requests_: list[dict]
+        Graph `$batch` requests ({"id", "method", "url", "body", "headers"}), ids unique.
+    sleep: callable, optional
+        Waiting function (tests).
+    Returns:
+    --------
+    dict: {request id: (status, event id or None, error or None)}.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+    assert len(requests_) <= GRAPH_BATCH_SIZE, f"{GRAPH_BATCH_SIZE} requêtes maximum par $batch"
+    headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
+    pending = {r["id"]: r for r in requests_}
+    results = {}
+    for attempt in range(EXPORT_MAX_RETRIES + 1):
+        response = http.post(f"{GRAPH_BASE_URL}/$batch", json={"requests": list(pending.values())},
+                             headers=headers, timeout=GRAPH_TIMEOUT)
+        wait = None
+        if response.status_code in RETRYABLE_STATUSES:
+            wait = _retry_after(response.headers, attempt)
+        elif response.status_code != 200:
+            raise GraphError(f"Erreur Graph $batch {response.status_code} : {response.text[:200]}")
+        else:
+            for answer in response.json().get("responses", []):
+                request = pending.get(answer.get("id"))
+                if request is None:
+                    continue
+                status = int(answer.get("status", 0))
+                body = answer.get("body") or {}
+                if status in (200, 201):
+                    results[request["id"]] = (status, body.get("id"), None)
+                    del pending[request["id"]]
+                elif status in RETRYABLE_STATUSES:
+                    wait = max(wait or 0, _retry_after(answer.get("headers"), attempt))
+                elif status == 404 and request["method"] == "PATCH":
+                    pending[request["id"]] = {**request, "method": "POST", "url": request["url"].rsplit("/", 1)[0]}
+                    wait = wait or 0
+                else:
+                    error = body.get("error", {}).get("message") if isinstance(body, dict) else None
+                    results[request["id"]] = (status, None, error or f"Erreur Graph {status}")
+                    del pending[request["id"]]
+        if not pending:
+            break
+        if attempt < EXPORT_MAX_RETRIES and wait:
+            sleep(wait)
+    for request_id in pending:
+        results[request_id] = (429, None, "Limite de requêtes Graph atteinte, réessayer plus tard")
+    return results
+
+def export_tasks(db, token: str, mailbox: str = "me", ids_tache: list = None, delegated: bool = False,
+                 http=None, sleep=time.sleep) -> dict:
+    """Exports tasks to an Outlook calendar through JSON `$batch` calls.
+    Tasks already exported to the mailbox (ExportOutlook) are updated with a
+    PATCH of their event instead of being created again, and skipped when
+    their event content did not change since the last export. The requests are
+    grouped by GRAPH_BATCH_SIZE and at most EXPORT_CONCURRENCY batches are in
+    flight at once over one pooled HTTP session; the mappings are written in
+    one transaction at the end.
     Parameters:
     -----------
     db: Session
         Active SQLAlchemy session.
     token: str
-        Valid access token for Microsoft Graph.
+        Access token: delegated, or of the application (`get_token`).
+    mailbox: str
+        User principal name of the mailbox, or "me" (calendar of the token's user).
+    ids_tache: list[str], optional
+        Tasks to export (default: every feasible task with dates).
+    delegated: bool
+        Writes in the calendar of the token's user (/me) while keeping the mappings under `mailbox`.
+    http: requests.Session, optional
+        Pooled HTTP session (a new one is opened otherwise).
+    sleep: callable, optional
+        Waiting function (tests).
     Returns:
     --------
-    int: Number of events successfully created.
+    dict: {"created", "updated", "unchanged", "failed", "errors": {id_tache: message}}.
     Version:
     --------
-    specification: Esteban Barracho (v.2 11/07/2025)
-    implement: Esteban Barracho (v.2 11/07/2025)
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
     """
     assert db, "Session DB invalide"
     assert isinstance(token, str) and len(token) > 10, "Token OAuth2 invalide"
+    query = db.query(Tache).filter(Tache.est_realisable == 1, Tache.date_debut.isnot(None), Tache.date_fin.isnot(None))
+    if ids_tache is not None:
+        query = query.filter(Tache.id_tache.in_(ids_tache))
+    taches = query.all()
+    mappings = {m.id_tache: m for m in db.query(ExportOutlook).filter(ExportOutlook.boite_mail == mailbox)}
 
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json"
-    }
-    taches = db.query(Tache).filter(Tache.est_realisable == 1).limit(5).all()
-    count = 0
+    events_url = "/me/events" if delegated or mailbox == "me" else f"/users/{mailbox}/events"
+    report = {"created": 0, "updated": 0, "unchanged": 0, "failed": 0, "errors": {}}
+    requests_, fingerprints = [], {}
     for t in taches:
-        assert t.date_debut and t.date_fin, f"Tâche {t.nom_tache} sans date"
-        payload = {
-            "subject": t.nom_tache,
-            "start": {
-                "dateTime": t.date_debut.strftime("%Y-%m-%dT%H:%M:%S"),
-                "timeZone": "UTC"
-            },
-            "end": {
-                "dateTime": t.date_fin.strftime("%Y-%m-%dT%H:%M:%S"),
-                "timeZone": "UTC"
-            },
-            "body": {
-                "contentType": "Text",
-                "content": t.description or "Tâche PolyBase"
-            }
-        }
-        res = requests.post("https://graph.microsoft.com/v1.0/me/events", json=payload, headers=headers)
-        if res.status_code in [200, 201]:
-            count += 1
-    return count
+        event = task_event(t)
+        fingerprints[t.id_tache] = hashlib.sha1(json.dumps(event, sort_keys=True).encode()).hexdigest()
+        mapping = mappings.get(t.id_tache)
+        if mapping is not None and mapping.empreinte == fingerprints[t.id_tache]:
+            report["unchanged"] += 1
+        elif mapping is not None:
+            requests_.append({"id": t.id_tache, "method": "PATCH", "url": f"{events_url}/{mapping.id_outlook}",
+                              "body": event, "headers": {"Content-Type": "application/json"}})
+        else:
+            event["transactionId"] = hashlib.sha1(f"{mailbox}|{t.id_tache}".encode()).hexdigest()
+            requests_.append({"id": t.id_tache, "method": "POST", "url": events_url,
+                              "body": event, "headers": {"Content-Type": "application/json"}})
+
+    own_http = http is None
+    if own_http:
+        http = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=EXPORT_CONCURRENCY)
+        http.mount("https://", adapter)
+        http.mount("http://", adapter)
+    results = {}
+    try:
+        chunks = [requests_[i:i + GRAPH_BATCH_SIZE] for i in range(0, len(requests_), GRAPH_BATCH_SIZE)]
+        with ThreadPoolExecutor(max_workers=EXPORT_CONCURRENCY) as pool:
+            futures = {pool.submit(send_batch, http, token, chunk, sleep): chunk for chunk in chunks}
+            for future, chunk in futures.items():
+                try:
+                    results.update(future.result())
+                except Exception as e:
+                    results.update({r["id"]: (0, None, str(e)) for r in chunk})
+    finally:
+        if own_http:
+            http.close()
+
+    now = datetime.utcnow()
+    for id_tache, (status, id_outlook, error) in results.items():
+        if error or not id_outlook:
+            report["failed"] += 1
+            report["errors"][id_tache] = error or "Réponse Graph sans identifiant d'événement"
+            continue
+        mapping = mappings.get(id_tache)
+        if mapping is None:
+            db.add(ExportOutlook(id_tache=id_tache, boite_mail=mailbox, id_outlook=id_outlook,
+                                 empreinte=fingerprints[id_tache], exporte_le=now))
+            report["created"] += 1
+        else:
+            report["created" if status == 201 else "updated"] += 1
+            mapping.id_outlook, mapping.empreinte, mapping.exporte_le = id_outlook, fingerprints[id_tache], now
+    db.commit()
+    return report
+
+def create_events_from_db(db, token: str):
+    """Creates (or updates) in Outlook the events of the feasible tasks, with `export_tasks`.
+    Parameters:
+    -----------
+    db: Session
+        Active SQLAlchemy session.
+    token: str
+        Valid access token for Microsoft Graph.
+    Returns:
+    --------
+    int: Number of events successfully created or updated.
+    Version:
+    --------
+    specification: Esteban Barracho (v.2 11/07/2025)
+    implement: Esteban Barracho (v.3 17/10/2026)
+    """
+    report = export_tasks(db, token)
+    return report["created"] + report["updated"]
+
+# ============================================
+# COMMAND LINE
+# ============================================
+
+def main():
+    """Runs one synchronization from the command line (e.g. from cron):
+        python -m app.utils.outlook_sync
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+    reports = synchronize_outlook()
+    return 1 if any("erreur" in r for r in reports.values()) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+# ============================================
+# IMPORTS
+# ============================================
+
+import base64
+import json
+from datetime import date
+from functools import lru_cache
+from typing import Optional
+
+from fastapi import HTTPException, Query, Response
+from pydantic import create_model
+from sqlalchemy import and_, or_, inspect, select
+
+# ============================================
+# PAGINATION LIMITS
+# ============================================
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# ============================================
+# QUERY PARAMETERS SHARED BY THE LIST ROUTES
+# ============================================
+
+class PageParams:
+    """Query parameters accepted by every paginated list endpoint.
+    Parameters:
+    -----------
+    limit (int): Maximum number of rows returned (capped at MAX_LIMIT).
+    cursor (str): Opaque keyset cursor returned in the `X-Next-Cursor` header of the previous page.
+    fields (str): Comma-separated list of columns to return (projection).
+    id_projet (str): Optional project filter.
+    id_collaborateur (str): Optional collaborator filter.
+    date_min (date): Optional lower bound (inclusive) on the route's date column.
+    date_max (date): Optional upper bound (inclusive) on the route's date column.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+
+    def __init__(self,
+                 limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+                 cursor: Optional[str] = Query(None),
+                 fields: Optional[str] = Query(None),
+                 id_projet: Optional[str] = Query(None),
+                 id_collaborateur: Optional[str] = Query(None),
+                 date_min: Optional[date] = Query(None),
+                 date_max: Optional[date] = Query(None)):
+        self.limit = limit
+        self.cursor = cursor
+        self.fields = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+        self.filters = {k: v for k, v in {"id_projet": id_projet, "id_collaborateur": id_collaborateur}.items() if v}
+        self.date_min = date_min
+        self.date_max = date_max
+
+# ============================================
+# RESPONSE MODEL OF A PAGE
+# ============================================
+
+@lru_cache(maxsize=None)
+def page_model(schema):
+    """Returns the response model of a paginated list of `schema`: every field
+    keeps its type but becomes optional, since `fields` may select a subset.
+    The list routes declare `response_model=list[page_model(schema)]` with
+    `response_model_exclude_unset=True`, so only the selected fields are sent.
+    Parameters:
+    -----------
+    schema: Pydantic output schema of the route.
+    Returns:
+    --------
+    type[BaseModel]: Model "<schema>Page" (cached per schema).
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+    fields = {name: (Optional[field.annotation], None) for name, field in schema.model_fields.items()}
+    return create_model(f"{schema.__name__}Page", **fields)
+
+# ============================================
+# CURSOR ENCODING
+# ============================================
+
+def encode_cursor(values: list) -> str:
+    """Encodes the sort key of the last returned row as an opaque URL-safe cursor.
+    Parameters:
+    -----------
+    values (list): Sort key values (dates are stored in ISO format).
+    Returns:
+    --------
+    str: Base64 cursor.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+    raw = json.dumps([v.isoformat() if isinstance(v, date) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor: str, key_columns: list) -> list:
+    """Decodes a cursor produced by `encode_cursor` for the given key columns.
+    Parameters:
+    -----------
+    cursor (str): Base64 cursor received from the client.
+    key_columns (list): Columns of the sort key, in order.
+    Returns:
+    --------
+    list: Typed sort key values.
+    Raises:
+    -------
+    HTTPException (400): If the cursor is malformed.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+        assert isinstance(values, list) and len(values) == len(key_columns)
+        return [
+            date.fromisoformat(v) if col.type.python_type is date else v
+            for v, col in zip(values, key_columns)
+        ]
+    except Exception:
+        raise HTTPException(status_code=400, detail="Curseur de pagination invalide")
+
+# ============================================
+# KEYSET PAGINATION WITH FIELD PROJECTION
+# ============================================
+
+def _page_statement(model, schema, page: PageParams, filters: dict, date_column, sort_by_date: bool):
+    filters = filters or {}
+    columns = model.__table__.columns
+    exposed = [name for name in schema.model_fields if name in columns]
+    fields = page.fields or exposed
+    unknown = [f for f in fields if f not in exposed]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Champs inconnus : {', '.join(unknown)}")
+    unsupported = [f for f in page.filters if f not in filters]
+    if unsupported or ((page.date_min or page.date_max) and date_column is None):
+        raise HTTPException(status_code=400, detail=f"Filtre non supporté : {', '.join(unsupported) or 'date'}")
+
+    pk = inspect(model).primary_key[0]
+    key_columns = [date_column, pk] if sort_by_date else [pk]
+    selected = [columns[f] for f in fields] + [c for c in key_columns if c.name not in fields]
+    statement = select(*selected)
+
+    for name, value in page.filters.items():
+        statement = statement.where(filters[name] == value)
+    if page.date_min:
+        statement = statement.where(date_column >= page.date_min)
+    if page.date_max:
+        statement = statement.where(date_column <= page.date_max)
+    if page.cursor:
+        last = decode_cursor(page.cursor, key_columns)
+        if sort_by_date:
+            statement = statement.where(or_(date_column > last[0], and_(date_column == last[0], pk > last[1])))
+        else:
+            statement = statement.where(pk > last[0])
+
+    statement = statement.order_by(*key_columns).limit(page.limit + 1)
+    return statement, fields, key_columns
+
+def _page_content(rows, fields: list, key_columns: list, limit: int, response: Response) -> list:
+    if len(rows) > limit:
+        rows = rows[:limit]
+        if response is not None:
+            response.headers[NEXT_CURSOR_HEADER] = encode_cursor([getattr(rows[-1], c.name) for c in key_columns])
+    return [{f: getattr(row, f) for f in fields} for row in rows]
+
+def paginate(db, model, schema, page: PageParams, response: Response = None, filters: dict = None,
+             date_column=None, sort_by_date: bool = False) -> list:
+    """Returns one page of `model` rows using keyset (seek) pagination.
+    Only the requested columns (or, by default, the fields of `schema`) are
+    selected, as plain dicts (no ORM objects); the route's response model
+    (`page_model(schema)`) validates and serializes them. The cursor of the
+    next page is set in the `X-Next-Cursor` header of the injected `response`.
+    Parameters:
+    -----------
+    db (Session): Active SQLAlchemy session.
+    model: ORM model to list.
+    schema: Pydantic output schema defining the exposed fields.
+    page (PageParams): Pagination, projection and filter parameters.
+    response (Response): Response injected in the route, receiving the `X-Next-Cursor` header.
+    filters (dict): Supported filters, mapping a PageParams filter name to a column.
+    date_column: Column used by the date range filter (and by the sort if `sort_by_date`).
+    sort_by_date (bool): Seeks on (date_column, primary key) instead of the primary key alone.
+    Returns:
+    --------
+    list[dict]: Rows of the page, restricted to the selected fields.
+    Raises:
+    -------
+    HTTPException (400): Unknown field, unsupported filter or invalid cursor.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.3 17/10/2026)
+    """
+    statement, fields, key_columns = _page_statement(model, schema, page, filters, date_column, sort_by_date)
+    return _page_content(db.execute(statement).all(), fields, key_columns, page.limit, response)
+
+async def paginate_async(db, model, schema, page: PageParams, response: Response = None, filters: dict = None,
+                         date_column=None, sort_by_date: bool = False) -> list:
+    """Asynchronous version of `paginate`, for the list routes served by the async engine.
+    Parameters:
+    -----------
+    db (AsyncSession): Active asynchronous SQLAlchemy session.
+    model, schema, page, response, filters, date_column, sort_by_date: See `paginate`.
+    Returns:
+    --------
+    list[dict]: Rows of the page, restricted to the selected fields.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.2 17/10/2026)
+    """
+    statement, fields, key_columns = _page_statement(model, schema, page, filters, date_column, sort_by_date)
+    result = await db.execute(statement)
+    return _page_content(result.all(), fields, key_columns, page.limit, response)
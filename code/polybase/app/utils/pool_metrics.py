@@ -0,0 +1,174 @@
+# ============================================
+# IMPORTS
+# ============================================
+
+import threading
+import time
+from collections import deque
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# ============================================
+# METRICS CONFIGURATION
+# ============================================
+
+WAIT_SAMPLES = 2000
+"""Number of recent checkout wait times kept for the percentiles."""
+
+# ============================================
+# POOL METRICS
+# ============================================
+
+class PoolMetrics:
+    """Counters and checkout wait times of one SQLAlchemy connection pool.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.2 17/10/2026)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=WAIT_SAMPLES)
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.pings = 0
+        self.max_wait = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            self._waits.append(seconds)
+            self.max_wait = max(self.max_wait, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def incr(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self) -> dict:
+        """Returns the counters and the p50/p95/p99 checkout wait (milliseconds)."""
+        with self._lock:
+            waits = sorted(self._waits)
+            counters = {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connexions_ouvertes": self.connects,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "pings": self.pings
+            }
+            max_wait = self.max_wait
+
+        def percentile(p):
+            if not waits:
+                return 0.0
+            return round(waits[min(len(waits) - 1, int(len(waits) * p))] * 1000, 3)
+
+        counters["attente_ms"] = {
+            "p50": percentile(0.50),
+            "p95": percentile(0.95),
+            "p99": percentile(0.99),
+            "max": round(max_wait * 1000, 3),
+            "echantillons": len(waits)
+        }
+        return counters
+
+pool_metrics = PoolMetrics()
+"""Process-wide metrics of the synchronous connection pool (`engine`).
+Version:
+--------
+specification: Esteban Barracho (v.1 17/10/2026)
+implement: Esteban Barracho (v.2 17/10/2026)
+"""
+
+async_pool_metrics = PoolMetrics()
+"""Process-wide metrics of the asynchronous connection pool (`async_engine`).
+Version:
+--------
+specification: Esteban Barracho (v.1 17/10/2026)
+implement: Esteban Barracho (v.1 17/10/2026)
+"""
+
+# ============================================
+# INSTRUMENTED POOL
+# ============================================
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool measuring how long each checkout waits for a free connection.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.2 17/10/2026)
+    """
+
+    metrics = pool_metrics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        self.metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """Instrumented pool of the asyncio engines, reporting to `async_pool_metrics`.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+
+    metrics = async_pool_metrics
+
+def instrument_engine(engine, pre_ping: str = "always", idle_ping_after: float = 30, metrics: PoolMetrics = pool_metrics):
+    """Registers the pool listeners: counters and the "idle" pre-ping strategy.
+    With `pre_ping="idle"` a connection is only pinged when it has been idle in
+    the pool for more than `idle_ping_after` seconds; a dead connection raises
+    DisconnectionError so that the pool transparently opens a new one.
+    Parameters:
+    -----------
+    engine (Engine): SQLAlchemy engine to instrument (`AsyncEngine.sync_engine` for asyncio engines).
+    pre_ping (str): "always" (handled by `pool_pre_ping`), "idle" or "off".
+    idle_ping_after (float): Idle time (seconds) after which the "idle" strategy pings.
+    metrics (PoolMetrics): Counters updated by the listeners.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.2 17/10/2026)
+    """
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        metrics.incr("connects")
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.incr("checkouts")
+        last_checkin = connection_record.info.get("last_checkin")
+        if pre_ping != "idle" or last_checkin is None or time.monotonic() - last_checkin < idle_ping_after:
+            return
+        metrics.incr("pings")
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("SELECT 1")
+        except Exception:
+            raise exc.DisconnectionError()
+        finally:
+            cursor.close()
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        metrics.incr("checkins")
+        connection_record.info["last_checkin"] = time.monotonic()
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.incr("invalidations")
@@ -0,0 +1,300 @@
+# ============================================
+# IMPORTS
+# ============================================
+
+import gzip
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from functools import lru_cache
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+from pydantic import TypeAdapter
+
+from app.models import Base
+
+# ============================================
+# CACHE CONFIGURATION
+# ============================================
+
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "256"))
+"""Maximum number of cached responses (least recently used ones are evicted).
+Version:
+--------
+specification: Esteban Barracho (v.1 17/10/2026)
+implement: Esteban Barracho (v.1 17/10/2026)
+"""
+
+RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "300"))
+"""Lifetime (seconds) of a cached response. Invalidations are local to the
+process: with several workers, this bounds how long another worker may serve
+a response older than a write.
+Version:
+--------
+specification: Esteban Barracho (v.1 17/10/2026)
+implement: Esteban Barracho (v.1 17/10/2026)
+"""
+
+SCHEMA_TAG = "schema"
+"""Tag of the responses built from the schema metadata (invalidated by /admin/schema/refresh)."""
+
+GZIP_MIN_SIZE = int(os.getenv("RESPONSE_CACHE_GZIP_MIN_SIZE", "1024"))
+"""Size (bytes) from which a cached body is also stored gzip-compressed, and
+served compressed to the clients sending `Accept-Encoding: gzip`.
+Version:
+--------
+specification: Esteban Barracho (v.1 17/10/2026)
+implement: Esteban Barracho (v.1 17/10/2026)
+"""
+
+CACHED_HEADERS = ("x-next-cursor",)
+"""Headers of the original response kept with the cached body."""
+
+# ============================================
+# RESPONSE MODELS
+# ============================================
+
+@lru_cache(maxsize=None)
+def _adapter(model) -> TypeAdapter:
+    """Validator of a route's response model (cached per model)."""
+    return TypeAdapter(model)
+
+# ============================================
+# CASCADES
+# ============================================
+
+def _dependent_tables() -> dict:
+    """Maps every table to itself and to the tables reached by its foreign keys' ON DELETE CASCADE."""
+    children = {}
+    for table in Base.metadata.tables.values():
+        for fk in table.foreign_keys:
+            children.setdefault(fk.column.table.name, set()).add(table.name)
+    dependents = {}
+    for name in Base.metadata.tables:
+        seen, stack = set(), [name]
+        while stack:
+            current = stack.pop()
+            if current not in seen:
+                seen.add(current)
+                stack.extend(children.get(current, ()))
+        dependents[name] = seen
+    return dependents
+
+# ============================================
+# RESPONSE CACHE
+# ============================================
+
+class ResponseCache:
+    """In-process LRU cache of the JSON responses of the read-mostly reference endpoints.
+    An entry is keyed by path and query string and tagged with the tables it
+    was built from. Responses carry an ETag (hash of the body) and a
+    Last-Modified date, and `Cache-Control: no-cache` so that browsers
+    revalidate them: a matching If-None-Match / If-Modified-Since gets a
+    `304 Not Modified` without a body. Bodies of GZIP_MIN_SIZE bytes or more
+    are compressed once, when stored. Writes call `invalidate(table)`, which
+    drops the entries tagged with the table or with a table its deletion
+    cascades to, and bumps the generation of those tables: a response whose
+    build raced an invalidation of one of its tables is served but not cached.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.3 17/10/2026)
+    """
+
+    def __init__(self, max_size: int = RESPONSE_CACHE_SIZE, ttl: int = RESPONSE_CACHE_TTL):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._max_size = max_size
+        self._ttl = ttl
+        self._dependents = None
+        self._generations = {}
+        self._global_generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.invalidations = 0
+
+    # ----- Lookups -----
+
+    @staticmethod
+    def _key(request) -> str:
+        query = "&".join(sorted(request.url.query.split("&"))) if request.url.query else ""
+        return f"{request.url.path}?{query}"
+
+    def _get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if time.time() - entry["created_at"] > self._ttl:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def _generation(self, tags: tuple) -> tuple:
+        """Generation of the tables of a response (call under the lock)."""
+        return self._global_generation, tuple(self._generations.get(tag, 0) for tag in tags)
+
+    def _put(self, key: str, tags: tuple, response, generation: tuple) -> dict:
+        body = bytes(response.body)
+        now = time.time()
+        etag = hashlib.sha1(body).hexdigest()
+        entry = {
+            "body": body,
+            "gzip": gzip.compress(body, compresslevel=6) if len(body) >= GZIP_MIN_SIZE else None,
+            "media_type": response.media_type,
+            "headers": {h: response.headers[h] for h in CACHED_HEADERS if h in response.headers},
+            "etag": f'"{etag}"',
+            "etag_gzip": f'"{etag}-gzip"',
+            "last_modified": formatdate(int(now), usegmt=True),
+            "created_at": now,
+            "tags": set(tags)
+        }
+        with self._lock:
+            if self._generation(tags) != generation:
+                return entry
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+        return entry
+
+    def _respond(self, request, entry: dict) -> Response:
+        compressed = entry["gzip"] is not None and "gzip" in request.headers.get("accept-encoding", "")
+        headers = {
+            **entry["headers"],
+            "ETag": entry["etag_gzip"] if compressed else entry["etag"],
+            "Last-Modified": entry["last_modified"],
+            "Cache-Control": "private, no-cache",
+            "Vary": "Accept-Encoding"
+        }
+        if self._not_modified(request, entry):
+            with self._lock:
+                self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+        if compressed:
+            headers["Content-Encoding"] = "gzip"
+            return Response(content=entry["gzip"], media_type=entry["media_type"], headers=headers)
+        return Response(content=entry["body"], media_type=entry["media_type"], headers=headers)
+
+    @staticmethod
+    def _not_modified(request, entry: dict) -> bool:
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+            return entry["etag"] in tags or entry["etag_gzip"] in tags \
+                or if_none_match.strip() == "*"
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since:
+            try:
+                return parsedate_to_datetime(entry["last_modified"]) <= parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def _store(self, key: str, tags: tuple, generation: tuple, content, response=None, model=None) -> dict:
+        if not isinstance(content, Response):
+            if model is not None:
+                adapter = _adapter(model)
+                content = adapter.dump_python(adapter.validate_python(content), mode="json", exclude_unset=True)
+            headers = {h: response.headers[h] for h in CACHED_HEADERS if response is not None and h in response.headers}
+            content = JSONResponse(content=jsonable_encoder(content), headers=headers)
+        return self._put(key, tags, content, generation)
+
+    def respond(self, request, tags: tuple, build, response=None, model=None) -> Response:
+        """Serves a cached response, or builds, caches and serves it.
+        The returned Response bypasses the route's `response_model`: routes
+        pass it as `model` so that the content is validated before being cached.
+        Parameters:
+        -----------
+        request (Request): Current request (path, query string and conditional headers).
+        tags (tuple[str]): Tables (or SCHEMA_TAG) the response is built from.
+        build (callable): Returns the content (or a JSONResponse) on a cache miss.
+        response (Response): Response injected in the route; its CACHED_HEADERS set by `build` are kept.
+        model: Response model of the route (validated, unset fields excluded).
+        Returns:
+        --------
+        Response: 200 with the body, or 304 if the client copy is still valid.
+        Version:
+        --------
+        specification: Esteban Barracho (v.1 17/10/2026)
+        implement: Esteban Barracho (v.3 17/10/2026)
+        """
+        key = self._key(request)
+        entry = self._get(key)
+        if entry is None:
+            with self._lock:
+                generation = self._generation(tags)
+            entry = self._store(key, tags, generation, build(), response, model)
+        return self._respond(request, entry)
+
+    async def respond_async(self, request, tags: tuple, build, response=None, model=None) -> Response:
+        """Same as `respond` for the `async def` routes: `build` is a coroutine function.
+        Version:
+        --------
+        specification: Esteban Barracho (v.1 17/10/2026)
+        implement: Esteban Barracho (v.3 17/10/2026)
+        """
+        key = self._key(request)
+        entry = self._get(key)
+        if entry is None:
+            with self._lock:
+                generation = self._generation(tags)
+            entry = self._store(key, tags, generation, await build(), response, model)
+        return self._respond(request, entry)
+
+    # ----- Invalidation -----
+
+    def invalidate(self, table: str = None):
+        """Drops the responses built from a table, from the tables its deletion cascades to,
+        or every response when no table is given.
+        Parameters:
+        -----------
+        table (str): Modified SQL table, or SCHEMA_TAG.
+        Version:
+        --------
+        specification: Esteban Barracho (v.1 17/10/2026)
+        implement: Esteban Barracho (v.2 17/10/2026)
+        """
+        if self._dependents is None:
+            self._dependents = _dependent_tables()
+        tables = self._dependents.get(table, {table})
+        with self._lock:
+            self.invalidations += 1
+            if table is None:
+                self._global_generation += 1
+                self._entries.clear()
+                return
+            for name in tables:
+                self._generations[name] = self._generations.get(name, 0) + 1
+            for key in [k for k, e in self._entries.items() if e["tags"] & tables]:
+                del self._entries[key]
+
+    def snapshot(self) -> dict:
+        """Returns the hit / miss / 304 counters and the number of cached responses."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entrees": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "not_modified": self.not_modified,
+                "invalidations": self.invalidations,
+                "taux_hit": round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
+response_cache = ResponseCache()
+"""Process-wide cache of the reference endpoints (clients, offers, projects, admin tables and structures).
+Version:
+--------
+specification: Esteban Barracho (v.1 17/10/2026)
+implement: Esteban Barracho (v.1 17/10/2026)
+"""
@@ -0,0 +1,224 @@
+# ============================================
+# IMPORTS
+# ============================================
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from sqlalchemy import text
+
+from app.database import SessionLocal
+from app.models import TachePlanifiee
+
+# ============================================
+# SCHEDULER CONFIGURATION
+# ============================================
+
+OUTLOOK_SYNC_INTERVAL = int(os.getenv("OUTLOOK_SYNC_INTERVAL", "900"))
+"""Period (seconds) of the Outlook synchronization job (0 disables it).
+Version:
+--------
+specification: Esteban Barracho (v.1 17/10/2026)
+implement: Esteban Barracho (v.1 17/10/2026)
+"""
+
+LOCK_PREFIX = "polybase_"
+"""Prefix of the MySQL named locks taken by the jobs."""
+
+# ============================================
+# CROSS-WORKER LOCK
+# ============================================
+
+@contextmanager
+def cross_worker_lock(name: str, timeout: int = 0):
+    """Takes a MySQL named lock (GET_LOCK) for the duration of the block.
+    The lock belongs to the connection of a dedicated session, so it is
+    released by RELEASE_LOCK or, if the worker dies, when its connection
+    closes. Other database engines have a single process: the lock is always granted.
+    Parameters:
+    -----------
+    name (str): Name of the lock (shared by all the uvicorn workers).
+    timeout (int): Seconds to wait for the lock (0: fail at once if it is held).
+    Returns:
+    --------
+    bool (yielded): True if this worker holds the lock.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.2 17/10/2026)
+    """
+    db = SessionLocal()
+    acquired = False
+    try:
+        if db.get_bind().dialect.name != "mysql":
+            acquired = True
+            yield True
+            return
+        acquired = db.execute(text("SELECT GET_LOCK(:nom, :attente)"),
+                              {"nom": LOCK_PREFIX + name, "attente": timeout}).scalar() == 1
+        yield acquired
+    finally:
+        if acquired and db.get_bind().dialect.name == "mysql":
+            db.execute(text("SELECT RELEASE_LOCK(:nom)"), {"nom": LOCK_PREFIX + name})
+        db.close()
+
+def lock_is_free(db, name: str) -> bool:
+    """Tells whether no worker holds a cross-worker lock (IS_FREE_LOCK).
+    Other database engines have a single process: the lock is reported free.
+    Parameters:
+    -----------
+    db (Session): Active SQLAlchemy session.
+    name (str): Name of the lock, as given to `cross_worker_lock`.
+    Returns:
+    --------
+    bool: True if the lock is free.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+    if db.get_bind().dialect.name != "mysql":
+        return True
+    return db.execute(text("SELECT IS_FREE_LOCK(:nom)"), {"nom": LOCK_PREFIX + name}).scalar() == 1
+
+# ============================================
+# BACKGROUND SCHEDULER
+# ============================================
+
+class BackgroundScheduler:
+    """Runs the startup tasks and the periodic jobs of the API in a daemon thread.
+    The startup tasks (database wait, schema warm-up) run first, then the
+    application is reported ready; the periodic jobs (Outlook synchronization)
+    never delay the first request. Each job run takes a cross-worker lock and,
+    under it, reads the last run of the job shared by all the workers
+    (TachePlanifiee, created by init.sql or mysql-init/upgrade.sql): with
+    several uvicorn workers, a run is skipped while another worker holds the
+    lock or when another worker ran the job less than its interval ago, so the
+    job runs once per interval across the workers.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.3 17/10/2026)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._startup = {}
+        self._jobs = {}
+        self.ready = False
+        self.startup_errors = {}
+
+    # ----- Registration -----
+
+    def add_startup_task(self, name: str, func):
+        """Registers a task run once, before the application is reported ready."""
+        self._startup[name] = func
+
+    def add_job(self, name: str, func, interval: int):
+        """Registers a job run every `interval` seconds (first run right after the startup tasks)."""
+        assert interval > 0, "L'intervalle d'une tâche planifiée doit être positif"
+        self._jobs[name] = {"func": func, "interval": interval, "next_run": 0.0, "running": False,
+                            "last_run": None, "last_status": None, "last_error": None, "duration": None}
+
+    # ----- Execution -----
+
+    def _claim_run(self, name: str, interval: int) -> float:
+        """Under the lock of the job: records the run in TachePlanifiee and returns 0 when
+        the job is due, otherwise returns the seconds left before its next shared run."""
+        db = SessionLocal()
+        try:
+            now = datetime.utcnow()
+            state = db.get(TachePlanifiee, name)
+            if state is None:
+                db.add(TachePlanifiee(nom=name, derniere_execution=now))
+            else:
+                left = interval - (now - state.derniere_execution).total_seconds()
+                if left > 0:
+                    return left
+                state.derniere_execution = now
+            db.commit()
+            return 0
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _run_job(self, name: str, job: dict):
+        start = time.monotonic()
+        with self._lock:
+            job["running"] = True
+        status, error, wait = "ok", None, job["interval"]
+        try:
+            with cross_worker_lock(name) as acquired:
+                if not acquired:
+                    status = "ignoree"  # verrou détenu par un autre worker
+                elif left := self._claim_run(name, job["interval"]):
+                    status, wait = "ignoree", left  # exécutée récemment par un autre worker
+                else:
+                    job["func"]()
+        except Exception as e:
+            status, error = "echec", str(e)
+            print(f"❌ Tâche planifiée {name} échouée : {e}")
+        with self._lock:
+            job.update(running=False, last_run=datetime.utcnow().isoformat(timespec="seconds"),
+                       last_status=status, last_error=error, duration=round(time.monotonic() - start, 3),
+                       next_run=time.monotonic() + wait)
+
+    def _run(self):
+        for name, func in self._startup.items():
+            try:
+                func()
+            except Exception as e:
+                self.startup_errors[name] = str(e)
+                print(f"⚠️  Tâche de démarrage {name} ignorée : {e}")
+        self.ready = True
+        while not self._stop.is_set():
+            for name, job in list(self._jobs.items()):
+                if self._stop.is_set():
+                    break
+                if time.monotonic() >= job["next_run"]:
+                    self._run_job(name, job)
+            next_run = min((job["next_run"] for job in self._jobs.values()), default=time.monotonic() + 60)
+            self._stop.wait(max(1.0, next_run - time.monotonic()))
+
+    def start(self):
+        """Starts the scheduler thread (idempotent) and returns immediately.
+        Version:
+        --------
+        specification: Esteban Barracho (v.1 17/10/2026)
+        implement: Esteban Barracho (v.1 17/10/2026)
+        """
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="polybase-scheduler", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5):
+        """Asks the scheduler thread to stop after the current job and waits for it."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def snapshot(self) -> dict:
+        """Returns the readiness, the startup errors and the state of every job."""
+        with self._lock:
+            return {
+                "pret": self.ready,
+                "erreurs_demarrage": dict(self.startup_errors),
+                "taches": {name: {k: v for k, v in job.items() if k not in ("func", "next_run")}
+                           for name, job in self._jobs.items()}
+            }
+
+scheduler = BackgroundScheduler()
+"""Process-wide background scheduler (started by main.startup_event).
+Version:
+--------
+specification: Esteban Barracho (v.1 17/10/2026)
+implement: Esteban Barracho (v.1 17/10/2026)
+"""
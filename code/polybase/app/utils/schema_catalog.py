@@ -0,0 +1,152 @@
+# ============================================
+# IMPORTS
+# ============================================
+
+import os
+import threading
+import time
+
+from sqlalchemy import inspect
+
+from app.database import SessionLocal
+
+# ============================================
+# CACHE CONFIGURATION
+# ============================================
+
+SCHEMA_CACHE_TTL = int(os.getenv("SCHEMA_CACHE_TTL", "300"))
+"""Lifetime (seconds) of the reflected schema before it is read again from information_schema.
+Version:
+--------
+specification: Esteban Barracho (v.1 17/10/2026)
+implement: Esteban Barracho (v.1 17/10/2026)
+"""
+
+# ============================================
+# SCHEMA CATALOG
+# ============================================
+
+class SchemaCatalog:
+    """Process-wide cache of the database schema (columns, primary keys,
+    foreign keys, secondary indexes and ENUM values of every table).
+    The whole schema is reflected in one pass with the SQLAlchemy Inspector
+    (`get_multi_*`), on startup or on first use, and kept for
+    `SCHEMA_CACHE_TTL` seconds. `invalidate()` forces a new reflection, e.g.
+    after a migration applied while the server is running.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.2 17/10/2026)
+    """
+
+    def __init__(self, ttl: int = SCHEMA_CACHE_TTL):
+        self._lock = threading.Lock()
+        self._ttl = ttl
+        self._tables = None
+        self._loaded_at = 0.0
+
+    # ----- Reflection -----
+
+    @staticmethod
+    def _reflect(bind) -> dict:
+        inspector = inspect(bind)
+        columns = inspector.get_multi_columns()
+        pks = inspector.get_multi_pk_constraint()
+        fks = inspector.get_multi_foreign_keys()
+        indexes = inspector.get_multi_indexes()
+        tables = {}
+        for (_, table), cols in columns.items():
+            pk = pks.get((None, table)) or {}
+            tables[table] = {
+                "columns": cols,
+                "column_map": {c["name"]: c for c in cols},
+                "pk": pk.get("constrained_columns") or [],
+                "foreign_keys": fks.get((None, table)) or [],
+                "indexes": indexes.get((None, table)) or [],
+                "enums": {c["name"]: list(c["type"].enums) for c in cols if hasattr(c["type"], "enums")}
+            }
+        return tables
+
+    def _snapshot(self, db) -> dict:
+        tables = self._tables
+        if tables is not None and time.monotonic() - self._loaded_at < self._ttl:
+            return tables
+        with self._lock:
+            if self._tables is None or time.monotonic() - self._loaded_at >= self._ttl:
+                self._tables = self._reflect(db.get_bind())
+                self._loaded_at = time.monotonic()
+            return self._tables
+
+    def warm_up(self):
+        """Reflects the schema at startup so that the first admin request does not pay for it.
+        Version:
+        --------
+        specification: Esteban Barracho (v.1 17/10/2026)
+        implement: Esteban Barracho (v.1 17/10/2026)
+        """
+        db = SessionLocal()
+        try:
+            self._snapshot(db)
+        finally:
+            db.close()
+
+    def invalidate(self):
+        """Drops the cached schema; the next access reflects it again.
+        Version:
+        --------
+        specification: Esteban Barracho (v.1 17/10/2026)
+        implement: Esteban Barracho (v.1 17/10/2026)
+        """
+        with self._lock:
+            self._tables = None
+
+    # ----- Lookups -----
+
+    def table_names(self, db) -> list:
+        """Names of the tables of the schema (views excluded)."""
+        return sorted(self._snapshot(db))
+
+    def has_table(self, db, table: str) -> bool:
+        """True if the table exists in the schema."""
+        return table in self._snapshot(db)
+
+    def columns(self, db, table: str) -> list:
+        """Inspector column dicts of a table, in SQL order (empty if the table is unknown)."""
+        return self._snapshot(db).get(table, {}).get("columns", [])
+
+    def column_map(self, db, table: str) -> dict:
+        """Inspector column dicts of a table, keyed by column name."""
+        return self._snapshot(db).get(table, {}).get("column_map", {})
+
+    def primary_key(self, db, table: str) -> list:
+        """Primary key columns of a table."""
+        return self._snapshot(db).get(table, {}).get("pk", [])
+
+    def foreign_keys(self, db, table: str) -> list:
+        """Inspector foreign key dicts of a table."""
+        return self._snapshot(db).get(table, {}).get("foreign_keys", [])
+
+    def indexes(self, db, table: str) -> list:
+        """Inspector index dicts of a table (primary key excluded)."""
+        return self._snapshot(db).get(table, {}).get("indexes", [])
+
+    def fk_map(self, db, table: str) -> dict:
+        """Maps each constrained column of a table to its referenced table, e.g. {"id_client": "Client"}."""
+        fk_map = {}
+        for fk in self.foreign_keys(db, table):
+            if fk.get("constrained_columns") and fk.get("referred_table"):
+                for col in fk["constrained_columns"]:
+                    fk_map[col] = fk["referred_table"]
+        return fk_map
+
+    def enum_values(self, db, table: str, column: str) -> list:
+        """Allowed values of an ENUM column (empty if the column is not an ENUM)."""
+        return self._snapshot(db).get(table, {}).get("enums", {}).get(column, [])
+
+schema_catalog = SchemaCatalog()
+"""Process-wide schema catalog shared by the admin routes, the Excel adaptation and the search index.
+Version:
+--------
+specification: Esteban Barracho (v.1 17/10/2026)
+implement: Esteban Barracho (v.1 17/10/2026)
+"""
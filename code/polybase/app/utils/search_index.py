@@ -0,0 +1,416 @@
+# ============================================
+# IMPORTS
+# ============================================
+
+import threading
+import time
+import unicodedata
+
+import Levenshtein
+import numpy as np
+from sqlalchemy import text
+
+from app.database import SessionLocal
+from app.utils.schema_catalog import schema_catalog
+
+# ============================================
+# SEARCH CONFIGURATION
+# ============================================
+
+MAX_DISTANCE = 3
+"""Maximum Levenshtein distance for a value to be returned (same threshold as the former scan)."""
+
+MAX_VALUE_LENGTH = 100
+"""Longer values cannot be within MAX_DISTANCE of a search query and are not indexed."""
+
+CANDIDATE_LIMIT = 2000
+"""Maximum number of trigram candidates verified with Levenshtein for one query."""
+
+DELTA_LIMIT = 5000
+"""Number of values added since the last freeze before the postings are compacted."""
+
+INDEX_MAX_AGE = 600
+"""Age (seconds) after which the index is rebuilt in the background."""
+
+EXCLUDED_COLUMNS = {"password"}
+
+# ============================================
+# NORMALIZATION
+# ============================================
+
+def normalize(value) -> str:
+    """Normalizes a value for fuzzy matching: lower case, accents removed, spaces collapsed.
+    Parameters:
+    -----------
+    value: Any database value.
+    Returns:
+    --------
+    str: Normalized text.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+    decomposed = unicodedata.normalize("NFKD", str(value).lower())
+    return " ".join("".join(c for c in decomposed if not unicodedata.combining(c)).split())
+
+def trigrams(value: str) -> set:
+    """Returns the padded trigrams of a normalized value.
+    Parameters:
+    -----------
+    value (str): Normalized text.
+    Returns:
+    --------
+    set[str]: Trigrams of "  value ".
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+    padded = f"  {value} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+# ============================================
+# INDEX STATE
+# ============================================
+
+class _IndexState:
+    """Data of one generation of the index.
+    Distinct normalized values get an integer id. Frozen postings are numpy
+    arrays (trigram -> value ids); values added afterwards go to small Python
+    delta postings until the next compaction.
+    """
+
+    def __init__(self):
+        self.values = []
+        self.lengths = []
+        self.refs = []
+        self.value_ids = {}
+        self.row_values = {}
+        self.postings = {}
+        self.frozen_lengths = np.zeros(0, dtype=np.int32)
+        self.frozen_count = 0
+        self.delta = {}
+
+    def add(self, table: str, pk: tuple, column: str, raw):
+        if raw is None or column in EXCLUDED_COLUMNS:
+            return
+        value = normalize(raw)
+        if not value or len(value) > MAX_VALUE_LENGTH:
+            return
+        value_id = self.value_ids.get(value)
+        if value_id is None:
+            value_id = len(self.values)
+            self.value_ids[value] = value_id
+            self.values.append(value)
+            self.lengths.append(len(value))
+            self.refs.append([])
+            for gram in trigrams(value):
+                self.delta.setdefault(gram, []).append(value_id)
+        self.refs[value_id].append((table, column, pk))
+        self.row_values.setdefault((table, pk), []).append(value_id)
+
+    def remove_row(self, table: str, pk: tuple):
+        for value_id in self.row_values.pop((table, pk), []):
+            self.refs[value_id] = [r for r in self.refs[value_id] if (r[0], r[2]) != (table, pk)]
+
+    def freeze(self):
+        for gram, ids in self.delta.items():
+            added = np.asarray(ids, dtype=np.int32)
+            current = self.postings.get(gram)
+            self.postings[gram] = added if current is None else np.concatenate((current, added))
+        self.delta = {}
+        self.frozen_lengths = np.asarray(self.lengths, dtype=np.int32)
+        self.frozen_count = len(self.values)
+
+    def candidates(self, grams: set, length: int) -> dict:
+        """Returns {value_id: shared trigram count} for values that may be within MAX_DISTANCE."""
+        # q-gram lemma: "  value " has length + 1 trigrams and one edit destroys at most 3 of
+        # them; counted on distinct trigrams, since a repeated trigram is only shared once
+        min_shared = max(1, len(grams) - 3 * MAX_DISTANCE)
+        found = {}
+        arrays = [self.postings[g] for g in grams if g in self.postings]
+        if arrays and self.frozen_count:
+            counts = np.bincount(np.concatenate(arrays), minlength=self.frozen_count)
+            mask = (counts >= min_shared) & (np.abs(self.frozen_lengths - length) <= MAX_DISTANCE)
+            ids = np.flatnonzero(mask)
+            if len(ids) > CANDIDATE_LIMIT:
+                ids = ids[np.argpartition(-counts[ids], CANDIDATE_LIMIT)[:CANDIDATE_LIMIT]]
+            found = dict(zip(ids.tolist(), counts[ids].tolist()))
+        for gram in grams:
+            for value_id in self.delta.get(gram, ()):
+                found[value_id] = found.get(value_id, 0) + 1
+        return {
+            i: c for i, c in found.items()
+            if c >= min_shared and abs(self.lengths[i] - length) <= MAX_DISTANCE
+        }
+
+# ============================================
+# SEARCH INDEX
+# ============================================
+
+class SearchIndex:
+    """Trigram inverted index over every value of the business tables.
+    A query is answered by counting shared trigrams (numpy), filtering on the
+    length window allowed by MAX_DISTANCE, then verifying only the best
+    candidates with Levenshtein. Rows are indexed whole, including those beyond
+    the 200-row window of the former scan.
+    The admin CRUD routes keep it up to date row by row; other writes are
+    picked up by a background rebuild once the index is older than INDEX_MAX_AGE.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._state = None
+        self._tables = {}
+        self._built_at = 0.0
+        self._rebuilding = False
+        self._rebuild_again = False
+        self._pending = []
+
+    # ----- Schema -----
+
+    @staticmethod
+    def _read_tables(db) -> dict:
+        tables = {}
+        for table in schema_catalog.table_names(db):
+            if table.startswith("Vue"):
+                continue
+            pk = schema_catalog.primary_key(db, table)
+            columns = [c["name"] for c in schema_catalog.columns(db, table)]
+            if pk:
+                tables[table] = {"pk": pk, "columns": columns}
+        return tables
+
+    # ----- Building -----
+
+    def load(self, tables: dict, rows) -> dict:
+        """Replaces the index with the given rows.
+        Parameters:
+        -----------
+        tables (dict): {table: {"pk": [columns], "columns": [columns]}}.
+        rows: Iterable of (table, row mapping).
+        Returns:
+        --------
+        dict: Number of tables, distinct values and rows indexed.
+        Version:
+        --------
+        specification: Esteban Barracho (v.1 17/10/2026)
+        implement: Esteban Barracho (v.1 17/10/2026)
+        """
+        state = _IndexState()
+        for table, row in rows:
+            meta = tables[table]
+            pk = tuple(row[c] for c in meta["pk"])
+            for column in meta["columns"]:
+                state.add(table, pk, column, row[column])
+        state.freeze()
+        with self._lock:
+            self._tables = tables
+            self._state = state
+            self._built_at = time.monotonic()
+        return {"tables": len(tables), "valeurs": len(state.values), "lignes": len(state.row_values)}
+
+    def build(self, db):
+        """Builds the whole index synchronously from the database.
+        Parameters:
+        -----------
+        db (Session): Active SQLAlchemy session.
+        Returns:
+        --------
+        dict: Number of tables, distinct values and rows indexed.
+        Version:
+        --------
+        specification: Esteban Barracho (v.1 17/10/2026)
+        implement: Esteban Barracho (v.1 17/10/2026)
+        """
+        tables = self._read_tables(db)
+
+        def rows():
+            for table in tables:
+                result = db.execute(text(f"SELECT * FROM `{table}`"),
+                                    execution_options={"stream_results": True, "yield_per": 1000})
+                for row in result.mappings():
+                    yield table, row
+
+        return self.load(tables, rows())
+
+    def _rebuild_background(self):
+        db = SessionLocal()
+        try:
+            self.build(db)
+            with self._lock:
+                pending, self._pending = self._pending, []
+            for table, key in pending:
+                self.refresh_row(db, table, key)
+        except Exception as e:
+            print(f"❌ Reconstruction de l'index de recherche échouée : {e}")
+        finally:
+            with self._lock:
+                self._rebuilding = False
+                again, self._rebuild_again = self._rebuild_again, False
+            db.close()
+            if again:
+                self.schedule_rebuild()
+
+    def ensure_ready(self, db):
+        """Builds the index on first use and schedules a background rebuild when it is too old.
+        Parameters:
+        -----------
+        db (Session): Active SQLAlchemy session.
+        Version:
+        --------
+        specification: Esteban Barracho (v.1 17/10/2026)
+        implement: Esteban Barracho (v.1 17/10/2026)
+        """
+        if self._state is None:
+            with self._lock:
+                if self._state is None:
+                    self.build(db)
+            return
+        if time.monotonic() - self._built_at > INDEX_MAX_AGE:
+            self.schedule_rebuild()
+
+    def schedule_rebuild(self):
+        """Rebuilds the index in a background thread; the current index keeps serving queries.
+        A request made while a rebuild runs starts another one once it ends.
+        Version:
+        --------
+        specification: Esteban Barracho (v.1 17/10/2026)
+        implement: Esteban Barracho (v.2 17/10/2026)
+        """
+        with self._lock:
+            if self._state is None:
+                return
+            if self._rebuilding:
+                self._rebuild_again = True
+                return
+            self._rebuilding = True
+        threading.Thread(target=self._rebuild_background, daemon=True).start()
+
+    # ----- Incremental maintenance -----
+
+    def _row_pk(self, table: str, key: dict):
+        """Returns the indexed primary key tuple of a row, or None when `key` does not cover it."""
+        meta = self._tables.get(table)
+        if meta is None or any(c not in key for c in meta["pk"]):
+            return None
+        return tuple(key[c] for c in meta["pk"])
+
+    def refresh_row(self, db, table: str, key: dict):
+        """Re-indexes one row after an insert or an update.
+        A key that does not cover every primary key column (composite keys
+        addressed by their first column only) cannot identify the row: the
+        whole index is rebuilt in the background instead.
+        Parameters:
+        -----------
+        db (Session): Active SQLAlchemy session (after commit).
+        table (str): Table name.
+        key (dict): {primary key column: value} of the row.
+        Version:
+        --------
+        specification: Esteban Barracho (v.1 17/10/2026)
+        implement: Esteban Barracho (v.2 17/10/2026)
+        """
+        meta = self._tables.get(table)
+        if self._state is None or meta is None:
+            return
+        pk = self._row_pk(table, key)
+        if pk is None:
+            self.schedule_rebuild()
+            return
+        where = " AND ".join(f"`{c}` = :k{i}" for i, c in enumerate(meta["pk"]))
+        row = db.execute(text(f"SELECT * FROM `{table}` WHERE {where}"),
+                         {f"k{i}": v for i, v in enumerate(pk)}).mappings().first()
+        with self._lock:
+            if self._rebuilding:
+                self._pending.append((table, dict(zip(meta["pk"], pk))))
+            state = self._state
+            state.remove_row(table, pk)
+            if row is not None:
+                stored = tuple(row[c] for c in meta["pk"])
+                state.remove_row(table, stored)
+                for column in meta["columns"]:
+                    state.add(table, stored, column, row[column])
+            if sum(len(ids) for ids in state.delta.values()) > DELTA_LIMIT:
+                state.freeze()
+
+    def remove_row(self, table: str, key: dict):
+        """Removes one deleted row from the index.
+        A key that does not cover every primary key column triggers a
+        background rebuild, as in `refresh_row`.
+        Parameters:
+        -----------
+        table (str): Table name.
+        key (dict): {primary key column: value} of the row.
+        Version:
+        --------
+        specification: Esteban Barracho (v.1 17/10/2026)
+        implement: Esteban Barracho (v.2 17/10/2026)
+        """
+        if self._state is None or table not in self._tables:
+            return
+        pk = self._row_pk(table, key)
+        if pk is None:
+            self.schedule_rebuild()
+            return
+        with self._lock:
+            if self._rebuilding:
+                self._pending.append((table, dict(key)))
+            self._state.remove_row(table, pk)
+
+    # ----- Query -----
+
+    def search(self, query: str, k: int = 50) -> list:
+        """Returns the k best matches of a query, ranked by Levenshtein distance.
+        Parameters:
+        -----------
+        query (str): Raw search string.
+        k (int): Maximum number of (table, column, row) hits returned.
+        Returns:
+        --------
+        list[dict]: {"table", "col", "pk", "score"} sorted by score, then table and column.
+        Version:
+        --------
+        specification: Esteban Barracho (v.1 17/10/2026)
+        implement: Esteban Barracho (v.1 17/10/2026)
+        """
+        q = normalize(query)
+        if not q:
+            return []
+        with self._lock:
+            state = self._state
+            candidates = state.candidates(trigrams(q), len(q))
+            scored = []
+            for value_id, shared in candidates.items():
+                if not state.refs[value_id]:
+                    continue
+                score = Levenshtein.distance(q, state.values[value_id], score_cutoff=MAX_DISTANCE)
+                if score <= MAX_DISTANCE:
+                    scored.append((score, -shared, value_id))
+            scored.sort()
+            hits = []
+            for score, _, value_id in scored:
+                for table, column, pk in sorted(state.refs[value_id], key=lambda r: (r[0], r[1])):
+                    hits.append({"table": table, "col": column, "pk": pk, "score": score})
+                if len(hits) >= k:
+                    break
+        hits = hits[:k]
+        hits.sort(key=lambda h: (h["score"], h["table"], h["col"]))
+        return hits
+
+    def primary_key(self, table: str) -> list:
+        """Returns the primary key columns of an indexed table."""
+        return self._tables[table]["pk"]
+
+search_index = SearchIndex()
+"""Process-wide search index used by the admin global search.
+Version:
+--------
+specification: Esteban Barracho (v.1 17/10/2026)
+implement: Esteban Barracho (v.1 17/10/2026)
+"""
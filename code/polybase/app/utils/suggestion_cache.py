@@ -0,0 +1,167 @@
+# ============================================
+# IMPORTS
+# ============================================
+
+import hashlib
+import json
+import os
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+# ============================================
+# CACHE CONFIGURATION
+# ============================================
+
+SUGGESTION_CACHE_FILE = os.getenv("SUGGESTION_CACHE_FILE", os.path.join("uploaded_files", "ia_suggestions.json"))
+"""JSON file where the AI suggestions are persisted between restarts.
+Version:
+--------
+specification: Esteban Barracho (v.1 17/10/2026)
+implement: Esteban Barracho (v.1 17/10/2026)
+"""
+
+SUGGESTION_CACHE_SIZE = int(os.getenv("SUGGESTION_CACHE_SIZE", "500"))
+"""Maximum number of cached suggestions (least recently used ones are evicted)."""
+
+SUGGESTION_CACHE_TTL = int(os.getenv("SUGGESTION_CACHE_TTL", str(90 * 24 * 3600)))
+"""Lifetime (seconds) of a cached suggestion."""
+
+# ============================================
+# CACHE KEYS
+# ============================================
+
+def column_signature(columns) -> str:
+    """Normalized column signature: names stripped, lowercased, without accents, sorted."""
+    names = []
+    for c in columns:
+        name = unicodedata.normalize("NFKD", str(c).strip().lower())
+        names.append("".join(ch for ch in name if not unicodedata.combining(ch)))
+    return "|".join(sorted(names))
+
+def sample_hash(records: list) -> str:
+    """Stable hash of the sample rows sent to the AI model."""
+    raw = json.dumps(records, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+# ============================================
+# SUGGESTION CACHE
+# ============================================
+
+class SuggestionCache:
+    """LRU + TTL cache of the OpenRouter structure suggestions, persisted on disk.
+    Entries are keyed by (table, column signature, sample hash): the prompt
+    asks the model about the inconsistencies of the sample rows themselves,
+    so a suggestion is only reused for a file with the same sample.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.2 17/10/2026)
+    """
+
+    def __init__(self, path: str = SUGGESTION_CACHE_FILE, max_size: int = SUGGESTION_CACHE_SIZE,
+                 ttl: int = SUGGESTION_CACHE_TTL):
+        self._lock = threading.Lock()
+        self._path = path
+        self._max_size = max_size
+        self._ttl = ttl
+        self._entries = None
+        self.hits = 0
+        self.misses = 0
+
+    # ----- Persistence -----
+
+    def _load(self):
+        if self._entries is not None:
+            return
+        self._entries = OrderedDict()
+        if self._path and os.path.exists(self._path):
+            try:
+                with open(self._path, encoding="utf-8") as f:
+                    for key, entry in json.load(f):
+                        self._entries[key] = entry
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Cache des suggestions IA illisible, ignoré : {e}")
+
+    def _save(self):
+        if not self._path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self._path) or ".", exist_ok=True)
+            tmp = f"{self._path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(list(self._entries.items()), f, ensure_ascii=False)
+            os.replace(tmp, self._path)
+        except OSError as e:
+            print(f"⚠️  Cache des suggestions IA non enregistré : {e}")
+
+    # ----- Lookups -----
+
+    @staticmethod
+    def _key(table: str, signature: str, sample: str) -> str:
+        return f"{table}\x1f{signature}\x1f{sample}"
+
+    def get(self, table: str, signature: str, sample: str):
+        """Returns the cached suggestion for a file, or None.
+        Parameters:
+        -----------
+        table (str): Target table.
+        signature (str): Column signature (`column_signature`).
+        sample (str): Sample hash (`sample_hash`).
+        Returns:
+        --------
+        str | None: Cached suggestion.
+        Version:
+        --------
+        specification: Esteban Barracho (v.1 17/10/2026)
+        implement: Esteban Barracho (v.2 17/10/2026)
+        """
+        with self._lock:
+            self._load()
+            now = time.time()
+            for key in [k for k, e in self._entries.items() if now - e["created_at"] > self._ttl]:
+                del self._entries[key]
+            key = self._key(table, signature, sample)
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]["suggestion"]
+
+    def put(self, table: str, signature: str, sample: str, suggestion: str):
+        """Stores a suggestion, evicts the least recently used entries and persists the cache.
+        Parameters:
+        -----------
+        table (str): Target table.
+        signature (str): Column signature (`column_signature`).
+        sample (str): Sample hash (`sample_hash`).
+        suggestion (str): Suggestion returned by the AI model.
+        Version:
+        --------
+        specification: Esteban Barracho (v.1 17/10/2026)
+        implement: Esteban Barracho (v.1 17/10/2026)
+        """
+        with self._lock:
+            self._load()
+            key = self._key(table, signature, sample)
+            self._entries[key] = {"suggestion": suggestion, "created_at": time.time()}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+            self._save()
+
+    def clear(self):
+        """Empties the cache (memory and disk)."""
+        with self._lock:
+            self._entries = OrderedDict()
+            self._save()
+
+suggestion_cache = SuggestionCache()
+"""Process-wide cache of the OpenRouter suggestions.
+Version:
+--------
+specification: Esteban Barracho (v.1 17/10/2026)
+implement: Esteban Barracho (v.1 17/10/2026)
+"""
@@ -0,0 +1,131 @@
+# ============================================
+# IMPORTS
+# ============================================
+
+from contextlib import contextmanager
+
+from sqlalchemy import event, text, bindparam
+from sqlalchemy.pool import Pool
+
+# ============================================
+# DEFERRED MODE CONFIGURATION
+# ============================================
+
+DEFERRED_HOURS_VARIABLE = "@polybase_heures_differees"
+"""MySQL session variable read by the prestation triggers of init.sql: while it
+is set, they skip the per-row update of Tache.heures_prestees.
+Version:
+--------
+specification: Esteban Barracho (v.1 17/10/2026)
+implement: Esteban Barracho (v.1 17/10/2026)
+"""
+
+DEFERRED_FLAG = "polybase_heures_differees"
+"""Key of the pool connection record info marking a connection with the bulk mode set."""
+
+HOURS_TABLES = {"PrestationCollaborateur"}
+"""Tables whose triggers maintain the hours of the tasks."""
+
+RECOMPUTE_CHUNK = 500
+"""Number of task identifiers recomputed per UPDATE statement."""
+
+# ============================================
+# SET-BASED RECOMPUTATION
+# ============================================
+
+RECOMPUTE_SQL = text("""
+    UPDATE Tache t
+        LEFT JOIN (SELECT id_tache, SUM(heures_effectuees) AS total
+                   FROM PrestationCollaborateur
+                   WHERE id_tache IN :ids
+                   GROUP BY id_tache) p ON p.id_tache = t.id_tache
+    SET t.heures_prestees  = COALESCE(p.total, 0),
+        t.heures_depassees = GREATEST(COALESCE(p.total, 0) - t.heures_estimees, 0)
+    WHERE t.id_tache IN :ids
+""").bindparams(bindparam("ids", expanding=True))
+
+def recompute_task_hours(db, ids_tache) -> int:
+    """Recomputes the performed and exceeded hours of some tasks from their prestations.
+    One grouped UPDATE per RECOMPUTE_CHUNK tasks, whatever the number of prestations.
+    Parameters:
+    -----------
+    db (Session): Active SQLAlchemy session (MySQL).
+    ids_tache (iterable[str]): Identifiers of the tasks to recompute.
+    Returns:
+    --------
+    int: Number of tasks recomputed.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+    ids = sorted({i for i in ids_tache if i})
+    for start in range(0, len(ids), RECOMPUTE_CHUNK):
+        db.execute(RECOMPUTE_SQL, {"ids": ids[start:start + RECOMPUTE_CHUNK]})
+    return len(ids)
+
+# ============================================
+# BULK MODE
+# ============================================
+
+def _clear_deferred_mode(dbapi_connection) -> None:
+    """Resets the bulk mode variable on a DBAPI connection (outside the session, which may be failed)."""
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"SET {DEFERRED_HOURS_VARIABLE} = NULL")
+    finally:
+        cursor.close()
+
+@event.listens_for(Pool, "checkin")
+def _reset_deferred_mode(dbapi_connection, connection_record):
+    """Safety net of `deferred_task_hours`: the pool reset on return is a ROLLBACK,
+    which keeps the session variables, so a connection still flagged is reset
+    here, or discarded if that fails, before another request can check it out.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.1 17/10/2026)
+    """
+    if not connection_record.info.pop(DEFERRED_FLAG, False) or dbapi_connection is None:
+        return
+    try:
+        _clear_deferred_mode(dbapi_connection)
+    except Exception as e:
+        connection_record.invalidate(e)
+
+@contextmanager
+def deferred_task_hours(db, table: str, rows: list):
+    """Bulk mode for the insertion of many prestations.
+    The per-row triggers are switched off on the session's connection, and the
+    hours of every task referenced by `rows` are recomputed once, in the same
+    transaction, when the block ends without error. The block must not commit:
+    the session variable lives on the connection held by the transaction.
+    The variable is reset on the DBAPI connection itself, so that a failed
+    session cannot prevent it; if even that fails, the connection stays
+    flagged and is reset (or discarded) when it returns to the pool.
+    Does nothing for other tables or other database engines.
+    Parameters:
+    -----------
+    db (Session): Active SQLAlchemy session.
+    table (str): Target table of the insertion.
+    rows (list[dict]): Rows inserted in the block.
+    Version:
+    --------
+    specification: Esteban Barracho (v.1 17/10/2026)
+    implement: Esteban Barracho (v.2 17/10/2026)
+    """
+    if table not in HOURS_TABLES or db.get_bind().dialect.name != "mysql":
+        yield
+        return
+    connection = db.connection().connection
+    connection.info[DEFERRED_FLAG] = True
+    db.execute(text(f"SET {DEFERRED_HOURS_VARIABLE} = 1"))
+    try:
+        yield
+        recompute_task_hours(db, (row.get("id_tache") for row in rows))
+    finally:
+        try:
+            _clear_deferred_mode(connection.dbapi_connection)
+            connection.info.pop(DEFERRED_FLAG, None)
+        except Exception as e:
+            print(f"⚠️  Mode différé des heures non réinitialisé (connexion réinitialisée au retour dans le pool) : {e}")
@@ -0,0 +1,139 @@
+# ============================================
+# BENCHMARK : ROUTES SYNCHRONES vs ASYNCHRONES SOUS CHARGE
+# ============================================
+# Envoie N clients simultanés sur deux routes équivalentes : une route `def`
+# (pymysql, exécutée dans le threadpool de Starlette, 40 threads par défaut)
+# et une route `async def` (aiomysql, AsyncSession). Chaque requête exécute
+# `SELECT SLEEP(latence)` pour simuler une requête lente ou un aller-retour
+# réseau vers MySQL. L'application est appelée en mémoire (ASGITransport) :
+# seul l'accès à la base est réel.
+#
+# Les deux moteurs ont la même taille de pool ; pour que le plafond mesuré
+# soit celui du threadpool et non celui du pool, --pool-size doit dépasser 40.
+# Le client en mémoire coûte lui-même du CPU (quelques centaines de req/s) :
+# la latence simulée doit rester assez longue pour dominer ce coût.
+#
+# Usage (depuis code/polybase, variables DB_* du .env) :
+#     python -m benchmarks.bench_async_routes --clients 500 --requests 2000 --pool-size 100
+# ============================================
+
+import argparse
+import asyncio
+import math
+import statistics
+import time
+
+import httpx
+from fastapi import FastAPI, Depends
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from app.database import SQLALCHEMY_DATABASE_URL, ASYNC_DATABASE_URL
+
+# ============================================
+# APPLICATION DE TEST
+# ============================================
+
+LATENCY_SQL = "SELECT SLEEP(:latence)"
+
+def build_app(sync_engine, async_engine, latency: float) -> FastAPI:
+    """Construit une application avec la même requête servie en `def` (/sync) et en `async def` (/async)."""
+    SyncSession = sessionmaker(bind=sync_engine)
+    AsyncSession = async_sessionmaker(async_engine)
+
+    def get_sync_db():
+        db = SyncSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def get_async_db():
+        async with AsyncSession() as db:
+            yield db
+
+    app = FastAPI()
+
+    @app.get("/sync")
+    def route_sync(db=Depends(get_sync_db)):
+        db.execute(text(LATENCY_SQL), {"latence": latency})
+        return {"ok": True}
+
+    @app.get("/async")
+    async def route_async(db=Depends(get_async_db)):
+        await db.execute(text(LATENCY_SQL), {"latence": latency})
+        return {"ok": True}
+
+    return app
+
+# ============================================
+# CHARGE
+# ============================================
+
+async def run_load(app: FastAPI, path: str, clients: int, requests: int) -> dict:
+    """Lance `clients` clients concurrents qui se partagent `requests` requêtes sur `path`."""
+    durations, errors = [], 0
+    remaining = [requests]
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        async def worker():
+            nonlocal errors
+            while remaining[0] > 0:
+                remaining[0] -= 1
+                start = time.perf_counter()
+                response = await client.get(path)
+                durations.append(time.perf_counter() - start)
+                if response.status_code != 200:
+                    errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(clients)))
+        total = time.perf_counter() - start
+
+    durations.sort()
+    return {
+        "req_s": len(durations) / total,
+        "p50": statistics.median(durations) * 1000,
+        "p95": durations[max(0, math.ceil(len(durations) * 0.95) - 1)] * 1000,
+        "erreurs": errors
+    }
+
+# ============================================
+# MAIN
+# ============================================
+
+async def compare(app: FastAPI, clients: int, requests: int):
+    for label, path in (("def", "/sync"), ("async def", "/async")):
+        result = await run_load(app, path, clients, requests)
+        print(f"{label:<10} {result['req_s']:8.1f} req/s   p50 {result['p50']:8.1f} ms   "
+              f"p95 {result['p95']:8.1f} ms   erreurs {result['erreurs']}")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=500, help="Nombre de clients simultanés")
+    parser.add_argument("--requests", type=int, default=2000, help="Nombre total de requêtes par route")
+    parser.add_argument("--latency", type=float, default=0.2, help="Durée (s) de la requête SQL simulée")
+    parser.add_argument("--pool-size", type=int, default=100, help="Connexions par moteur (sans overflow)")
+    args = parser.parse_args()
+
+    pool = {"pool_size": args.pool_size, "max_overflow": 0, "pool_timeout": 120}
+    sync_engine = create_engine(SQLALCHEMY_DATABASE_URL, **pool)
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, **pool)
+    app = build_app(sync_engine, async_engine, args.latency)
+
+    print(f"{args.clients} clients, {args.requests} requêtes, latence SQL {args.latency * 1000:.0f} ms, "
+          f"pool de {args.pool_size} connexions")
+
+    async def run():
+        try:
+            await compare(app, args.clients, args.requests)
+        finally:
+            await async_engine.dispose()
+
+    asyncio.run(run())
+    sync_engine.dispose()
+
+if __name__ == "__main__":
+    main()
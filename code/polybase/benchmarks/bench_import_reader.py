@@ -0,0 +1,107 @@
+# ============================================
+# BENCHMARK : LECTURE DES FICHIERS D'IMPORT
+# ============================================
+# Compare la lecture complète utilisée auparavant par adapt_excel
+# (pd.read_excel + fillna + to_dict) à la lecture par blocs de
+# app/utils/import_reader.py. Chaque lecture tourne dans un processus neuf
+# pour mesurer sa durée et son pic de mémoire résidente (au-delà de la
+# mémoire occupée par les imports). Aucune base n'est nécessaire.
+#
+# Usage (depuis code/polybase) :
+#     python -m benchmarks.bench_import_reader --rows 500000
+# ============================================
+
+import argparse
+import os
+import random
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+
+import pandas as pd
+from openpyxl import Workbook
+
+from app.utils.import_reader import iter_import_chunks, IMPORT_CHUNK_ROWS
+
+# ============================================
+# GÉNÉRATION DU CLASSEUR
+# ============================================
+
+HEADER = ["id_prestation", "id_collaborateur", "id_tache", "date", "heures", "mode_facturation", "commentaire"]
+
+def write_workbook(path: str, rows: int, seed: int):
+    """Écrit un classeur de prestations synthétiques en mode write-only."""
+    rng = random.Random(seed)
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(HEADER)
+    start = date(2025, 1, 1)
+    for i in range(rows):
+        sheet.append([
+            f"PC{i:07d}",
+            f"P{rng.randrange(200):03d}",
+            f"T{rng.randrange(5000):04d}",
+            start + timedelta(days=rng.randrange(365)),
+            round(rng.uniform(0.5, 8), 2),
+            rng.choice(["horaire", "forfait"]),
+            "" if rng.random() < 0.5 else "Réunion de chantier"
+        ])
+    workbook.save(path)
+
+# ============================================
+# MÉTHODES COMPARÉES
+# ============================================
+
+def read_full(path: str) -> int:
+    """Ancienne lecture : tout le classeur en mémoire, puis une liste de dicts."""
+    df = pd.read_excel(path)
+    df.columns = df.columns.str.strip()
+    rows = df.fillna("").to_dict(orient="records")
+    return len(rows)
+
+def read_chunks(path: str) -> int:
+    """Lecture par blocs : seules les lignes du bloc courant sont en mémoire."""
+    count = 0
+    for chunk in iter_import_chunks(path):
+        rows = chunk.df.fillna("").to_dict(orient="records")
+        count += len(rows)
+    return count
+
+def _run(fn, path: str) -> tuple:
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    count = fn(path)
+    duration = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return count, duration, (peak - baseline) / 1024
+
+def measure(label: str, fn, path: str):
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        count, duration, peak_mb = pool.submit(_run, fn, path).result()
+    print(f"{label:<10} {count} lignes   {duration:7.1f} s   pic mémoire {peak_mb:8.1f} Mo")
+
+# ============================================
+# MAIN
+# ============================================
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=500_000, help="Nombre de lignes du classeur")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skip-full", action="store_true", help="Ne mesure pas l'ancienne lecture (lente)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "prestations.xlsx")
+        start = time.perf_counter()
+        write_workbook(path, args.rows, args.seed)
+        print(f"Classeur de {args.rows} lignes écrit en {time.perf_counter() - start:.1f} s "
+              f"({os.path.getsize(path) / 2 ** 20:.1f} Mo), blocs de {IMPORT_CHUNK_ROWS} lignes")
+        measure("par blocs", read_chunks, path)
+        if not args.skip_full:
+            measure("complète", read_full, path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# ============================================
+# BENCHMARK : RECHERCHE GLOBALE (INDEX vs SCAN)
+# ============================================
+# Compare l'index trigramme de app/utils/search_index.py au scan Levenshtein
+# exhaustif qu'utilisait /admin/search/{query}. Aucune base n'est nécessaire :
+# les valeurs sont générées en mémoire.
+#
+# Usage (depuis code/polybase) :
+#     python -m benchmarks.bench_search_index --values 1000000 --queries 50 --edits 3
+# ============================================
+
+import argparse
+import math
+import random
+import statistics
+import string
+import time
+
+import Levenshtein
+
+from app.utils.search_index import SearchIndex, MAX_DISTANCE, normalize
+
+# ============================================
+# DONNÉES SYNTHÉTIQUES
+# ============================================
+
+PRENOMS = ["Jean", "Marie", "Lucas", "Emma", "Louis", "Chloé", "Hugo", "Léa", "Noah", "Julie"]
+NOMS = ["Dupont", "Martin", "Bernard", "Dubois", "Lambert", "Leroy", "Moreau", "Simon", "Laurent", "Michel"]
+MOTS = ["audit", "étude", "chantier", "stabilité", "réseau", "pont", "bureau", "toiture", "parking", "école"]
+
+def random_value(rng: random.Random) -> str:
+    """Génère une valeur proche de celles des tables (noms, libellés, identifiants, e-mails)."""
+    kind = rng.randrange(4)
+    if kind == 0:
+        return f"{rng.choice(PRENOMS)} {rng.choice(NOMS)}"
+    if kind == 1:
+        return f"{rng.choice(MOTS).capitalize()} {rng.choice(MOTS)} {rng.randrange(1000)}"
+    if kind == 2:
+        return f"{rng.choice('PTFC')}{rng.randrange(10 ** 6):06d}"
+    user = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10)))
+    return f"{user}@{rng.choice(NOMS).lower()}.be"
+
+def typo(rng: random.Random, value: str, edits: int = 1) -> str:
+    """Introduit `edits` fautes de frappe (substitutions de caractères)."""
+    for _ in range(edits):
+        i = rng.randrange(len(value))
+        value = value[:i] + rng.choice(string.ascii_lowercase) + value[i + 1:]
+    return value
+
+# ============================================
+# MÉTHODES COMPARÉES
+# ============================================
+
+def brute_force(values: list, query: str) -> list:
+    """Reproduit l'ancien search_global : une distance de Levenshtein par valeur.
+    La normalisation de l'index est appliquée pour que les résultats soient comparables."""
+    q = normalize(query)
+    hits = []
+    for i, v in enumerate(values):
+        distance = Levenshtein.distance(q, normalize(v))
+        if distance <= MAX_DISTANCE:
+            hits.append((distance, i))
+    hits.sort()
+    return hits
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+def summary(label: str, durations: list):
+    durations = sorted(durations)
+    p95 = durations[math.ceil(len(durations) * 0.95) - 1]
+    print(f"{label:<12} médiane {statistics.median(durations):9.2f} ms   p95 {p95:9.2f} ms   max {durations[-1]:9.2f} ms")
+
+# ============================================
+# MAIN
+# ============================================
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--values", type=int, default=1_000_000, help="Nombre de valeurs indexées")
+    parser.add_argument("--queries", type=int, default=50, help="Nombre de requêtes mesurées")
+    parser.add_argument("--scan-queries", type=int, default=5, help="Requêtes mesurées pour le scan (lent)")
+    parser.add_argument("--edits", type=int, default=1, help="Fautes de frappe par requête (1 à MAX_DISTANCE)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    values = [random_value(rng) for _ in range(args.values)]
+    tables = {"Bench": {"pk": ["id"], "columns": ["valeur"]}}
+    rows = (("Bench", {"id": i, "valeur": v}) for i, v in enumerate(values))
+
+    index = SearchIndex()
+    _, build_ms = timed(index.load, tables, rows)
+    print(f"Index construit sur {args.values} valeurs en {build_ms / 1000:.1f} s")
+
+    queries = [typo(rng, rng.choice(values), args.edits) for _ in range(args.queries)]
+
+    index_ms = []
+    for q in queries:
+        _, ms = timed(index.search, q, 50)
+        index_ms.append(ms)
+    summary("index", index_ms)
+
+    scan_ms = []
+    missed = 0
+    for q in queries[:args.scan_queries]:
+        expected, ms = timed(brute_force, values, q)
+        scan_ms.append(ms)
+        found = {hit["pk"][0] for hit in index.search(q, 50)}
+        best = {i for d, i in expected[:50] if d == expected[0][0]} if expected else set()
+        missed += len(best - found)
+    summary("scan", scan_ms)
+    print(f"Meilleurs résultats du scan absents de l'index : {missed}")
+
+if __name__ == "__main__":
+    main()
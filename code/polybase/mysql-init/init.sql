@@ -203,6 +203,8 @@ create table ImportLog (
                            date_import date not null,
                            statut varchar(20) not null,
                            message_log TEXT not null,
+                           suggestion_ia TEXT,
+                           derniere_maj datetime,
                            id_projet varchar(10),
                            constraint ID_ImportLog_ID primary key (id_import),
                            foreign key (id_projet) references Projet(id_projet) ON DELETE CASCADE
@@ -219,6 +221,82 @@ CREATE TABLE Offre (
                        id_client varchar(10),
                        foreign key (id_client) references Client(id_client) ON DELETE CASCADE
 )DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- TABLE DES ÉVÉNEMENTS OUTLOOK (cf. app/utils/outlook_sync.py)
+-- Copie locale des calendriers synchronisés, clé = identifiant Graph de l'événement.
+create table EvenementOutlook (
+                                  id_outlook varchar(255) not null,
+                                  boite_mail varchar(100) not null,
+                                  sujet varchar(255) not null,
+                                  date_debut datetime not null,
+                                  date_fin datetime not null,
+                                  modifie_le varchar(40),
+                                  constraint ID_EvenementOutlook_ID primary key (id_outlook)
+)DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- TABLE DE L'ÉTAT DE SYNCHRONISATION OUTLOOK (deltaLink Graph par boîte)
+create table SynchroOutlook (
+                                boite_mail varchar(100) not null,
+                                delta_link TEXT,
+                                debut_fenetre datetime not null,
+                                fin_fenetre datetime not null,
+                                derniere_synchro datetime not null,
+                                constraint ID_SynchroOutlook_ID primary key (boite_mail)
+)DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- TABLE DES TÂCHES EXPORTÉES VERS OUTLOOK (cf. app/utils/outlook_sync.py)
+-- Événement Graph créé pour chaque tâche et boîte : les réexports le mettent à jour.
+create table ExportOutlook (
+                               boite_mail varchar(100) not null,
+                               id_tache varchar(10) not null,
+                               id_outlook varchar(255) not null,
+                               empreinte char(40) not null,
+                               exporte_le datetime not null,
+                               constraint ID_ExportOutlook_ID primary key (boite_mail, id_tache),
+                               foreign key (id_tache) references Tache(id_tache) ON DELETE CASCADE
+)DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- TABLE DES SÉQUENCES D'IDENTIFIANTS (cf. app/utils/id_allocator.py)
+-- Prochain numéro libre par préfixe ; chaque worker en réserve des blocs.
+create table IdSequence (
+                            prefixe varchar(10) not null,
+                            prochain int unsigned not null,
+                            constraint ID_IdSequence_ID primary key (prefixe)
+)DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- TABLE DES TÂCHES PLANIFIÉES (cf. app/utils/scheduler.py)
+-- Dernière exécution de chaque tâche périodique, partagée par les workers.
+create table TachePlanifiee (
+                                nom varchar(50) not null,
+                                derniere_execution datetime not null,
+                                constraint ID_TachePlanifiee_ID primary key (nom)
+)DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Index Section
+-- _____________
+-- Colonnes filtrées par l'application (cf. app/utils/index_advisor.py)
+
+-- Connexion : authenticate_user recherche le personnel par e-mail
+create index IDX_Personnel_email on Personnel (email);
+
+-- Tableau de bord : tâches ouvertes et tâches en retard
+create index IDX_Tache_statut on Tache (statut);
+create index IDX_Tache_alerte_retard on Tache (alerte_retard);
+
+-- Agenda : tâches planifiées chevauchant une période (GET /outlook/agenda)
+create index IDX_Tache_dates on Tache (date_debut, date_fin);
+
+-- Encodage : recherche des projets par préfixe du nom (GET /projects/options)
+create index IDX_Projet_nom on Projet (nom_projet);
+
+-- Listes et encodages filtrés par période
+create index IDX_PrestationCollaborateur_date on PrestationCollaborateur (date);
+create index IDX_PlanificationCollaborateur_semaine on PlanificationCollaborateur (semaine);
+create index IDX_ProjectionFacturation_mois on ProjectionFacturation (mois);
+
+-- Synchronisation Outlook : événements d'une boîte sur une période
+create index IDX_EvenementOutlook_boite_debut on EvenementOutlook (boite_mail, date_debut);
+
 -- INSERT
 
 -- ======= CLIENTS =======
@@ -364,40 +442,37 @@ WHERE PC.facture_associee IS NULL;
 
 
 -- ======= TRIGGER =======
+-- Les heures prestées d'une tâche sont maintenues par différence (NEW - OLD) :
+-- chaque prestation insérée, modifiée ou supprimée ajoute ou retire ses heures
+-- au lieu de recalculer la somme de toutes les prestations de la tâche.
+-- Mode différé : quand la variable de session @polybase_heures_differees est
+-- définie (imports en masse, cf. app/utils/task_hours.py), ces triggers ne
+-- font rien et l'application recalcule une seule fois chaque tâche touchée.
+-- Dans un UPDATE mono-table, MySQL évalue les affectations de gauche à droite :
+-- heures_depassees est donc calculée à partir de la nouvelle valeur de heures_prestees.
+
 -- Preliminary cleaning
 DROP TRIGGER IF EXISTS maj_heures_tache;
 DROP TRIGGER IF EXISTS maj_depassement_apres_modif_estimee;
+DROP TRIGGER IF EXISTS maj_depassement_apres_modif_tache;
 DROP TRIGGER IF EXISTS maj_heures_apres_modif_prestation;
+DROP TRIGGER IF EXISTS maj_heures_apres_suppression_prestation;
 DROP TRIGGER IF EXISTS maj_alerte_retard;
 
 DELIMITER $$
 
--- Trigger 1: Update hours after INSERT of a service
+-- Trigger 1: Add the hours of an inserted service to its task
 
 CREATE TRIGGER maj_heures_tache
     AFTER INSERT ON PrestationCollaborateur
     FOR EACH ROW
 BEGIN
-    DECLARE total_heures DECIMAL(5,2);
-    DECLARE heures_estimees DECIMAL(5,2);
-    DECLARE depassement DECIMAL(5,2);
-
-    SELECT COALESCE(SUM(heures_effectuees), 0)
-    INTO total_heures
-    FROM PrestationCollaborateur
-    WHERE id_tache = NEW.id_tache;
-
-    SELECT heures_estimees
-    INTO heures_estimees
-    FROM Tache
-    WHERE id_tache = NEW.id_tache;
-
-    SET depassement = GREATEST(total_heures - heures_estimees, 0);
-
-    UPDATE Tache
-    SET heures_prestees = total_heures,
-        heures_depassees = depassement
-    WHERE id_tache = NEW.id_tache;
+    IF @polybase_heures_differees IS NULL AND NEW.id_tache IS NOT NULL THEN
+        UPDATE Tache
+        SET heures_prestees = COALESCE(heures_prestees, 0) + NEW.heures_effectuees,
+            heures_depassees = GREATEST(heures_prestees - heures_estimees, 0)
+        WHERE id_tache = NEW.id_tache;
+    END IF;
 END$$
 
 -- Trigger 2: Update the overtime if the estimated or actual hours change
@@ -414,33 +489,40 @@ BEGIN
     END IF;
 END$$
 
--- Trigger 3: Update hours after modifying a service
+-- Trigger 3: Apply the difference of a modified service (hours or task changed)
 
 CREATE TRIGGER maj_heures_apres_modif_prestation
     AFTER UPDATE ON PrestationCollaborateur
     FOR EACH ROW
 BEGIN
-    DECLARE total_heures DECIMAL(5,2);
-    DECLARE heures_estimees DECIMAL(5,2);
-    DECLARE depassement DECIMAL(5,2);
-
-    IF NEW.heures_effectuees != OLD.heures_effectuees THEN
-        SELECT COALESCE(SUM(heures_effectuees), 0)
-        INTO total_heures
-        FROM PrestationCollaborateur
-        WHERE id_tache = NEW.id_tache;
-
-        SELECT heures_estimees
-        INTO heures_estimees
-        FROM Tache
-        WHERE id_tache = NEW.id_tache;
+    IF @polybase_heures_differees IS NULL
+        AND (NEW.heures_effectuees != OLD.heures_effectuees OR NOT (NEW.id_tache <=> OLD.id_tache)) THEN
+        IF OLD.id_tache IS NOT NULL THEN
+            UPDATE Tache
+            SET heures_prestees = COALESCE(heures_prestees, 0) - OLD.heures_effectuees,
+                heures_depassees = GREATEST(heures_prestees - heures_estimees, 0)
+            WHERE id_tache = OLD.id_tache;
+        END IF;
+        IF NEW.id_tache IS NOT NULL THEN
+            UPDATE Tache
+            SET heures_prestees = COALESCE(heures_prestees, 0) + NEW.heures_effectuees,
+                heures_depassees = GREATEST(heures_prestees - heures_estimees, 0)
+            WHERE id_tache = NEW.id_tache;
+        END IF;
+    END IF;
+END$$
 
-        SET depassement = GREATEST(total_heures - heures_estimees, 0);
+-- Trigger 5: Remove the hours of a deleted service from its task
 
+CREATE TRIGGER maj_heures_apres_suppression_prestation
+    AFTER DELETE ON PrestationCollaborateur
+    FOR EACH ROW
+BEGIN
+    IF @polybase_heures_differees IS NULL AND OLD.id_tache IS NOT NULL THEN
         UPDATE Tache
-        SET heures_prestees = total_heures,
-            heures_depassees = depassement
-        WHERE id_tache = NEW.id_tache;
+        SET heures_prestees = COALESCE(heures_prestees, 0) - OLD.heures_effectuees,
+            heures_depassees = GREATEST(heures_prestees - heures_estimees, 0)
+        WHERE id_tache = OLD.id_tache;
     END IF;
 END$$
 
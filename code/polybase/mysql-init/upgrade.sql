@@ -0,0 +1,195 @@
+-- *********************************************
+-- * Mise à niveau d'une base existante
+-- *--------------------------------------------
+-- * init.sql ne s'exécute qu'à la création du volume MySQL : une base déjà
+-- * initialisée reçoit ici les tables, colonnes, index et triggers ajoutés
+-- * depuis. Le script est idempotent et peut être rejoué sans risque :
+-- *   docker exec -i polybase-mysql mysql -uroot -ppolyroot PolyBase < mysql-init/upgrade.sql
+-- * Toute modification du schéma dans init.sql doit être reportée ici.
+-- *********************************************
+
+USE PolyBase;
+
+-- Procédures utilitaires (MySQL n'a pas de ADD COLUMN / CREATE INDEX IF NOT EXISTS)
+-- _____________________
+
+DROP PROCEDURE IF EXISTS polybase_ajouter_colonne;
+DROP PROCEDURE IF EXISTS polybase_ajouter_index;
+
+DELIMITER $$
+
+CREATE PROCEDURE polybase_ajouter_colonne(IN p_table VARCHAR(64), IN p_colonne VARCHAR(64), IN p_definition VARCHAR(255))
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM information_schema.COLUMNS
+                   WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = p_table AND COLUMN_NAME = p_colonne) THEN
+        SET @ddl = CONCAT('ALTER TABLE ', p_table, ' ADD COLUMN ', p_colonne, ' ', p_definition);
+        PREPARE stmt FROM @ddl;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+    END IF;
+END$$
+
+CREATE PROCEDURE polybase_ajouter_index(IN p_table VARCHAR(64), IN p_index VARCHAR(64), IN p_colonnes VARCHAR(255))
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM information_schema.STATISTICS
+                   WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = p_table AND INDEX_NAME = p_index) THEN
+        SET @ddl = CONCAT('CREATE INDEX ', p_index, ' ON ', p_table, ' (', p_colonnes, ')');
+        PREPARE stmt FROM @ddl;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+    END IF;
+END$$
+
+DELIMITER ;
+
+-- Colonnes ajoutées
+-- _________________
+
+-- ImportLog : suggestion de correction de l'IA et suivi des imports asynchrones
+CALL polybase_ajouter_colonne('ImportLog', 'suggestion_ia', 'TEXT AFTER message_log');
+CALL polybase_ajouter_colonne('ImportLog', 'derniere_maj', 'datetime AFTER suggestion_ia');
+
+-- Tables ajoutées
+-- _______________
+
+create table if not exists EvenementOutlook (
+                                  id_outlook varchar(255) not null,
+                                  boite_mail varchar(100) not null,
+                                  sujet varchar(255) not null,
+                                  date_debut datetime not null,
+                                  date_fin datetime not null,
+                                  modifie_le varchar(40),
+                                  constraint ID_EvenementOutlook_ID primary key (id_outlook)
+)DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+create table if not exists SynchroOutlook (
+                                boite_mail varchar(100) not null,
+                                delta_link TEXT,
+                                debut_fenetre datetime not null,
+                                fin_fenetre datetime not null,
+                                derniere_synchro datetime not null,
+                                constraint ID_SynchroOutlook_ID primary key (boite_mail)
+)DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+create table if not exists ExportOutlook (
+                               boite_mail varchar(100) not null,
+                               id_tache varchar(10) not null,
+                               id_outlook varchar(255) not null,
+                               empreinte char(40) not null,
+                               exporte_le datetime not null,
+                               constraint ID_ExportOutlook_ID primary key (boite_mail, id_tache),
+                               foreign key (id_tache) references Tache(id_tache) ON DELETE CASCADE
+)DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Les séquences sont amorcées par app/utils/id_allocator.py au premier identifiant demandé
+create table if not exists IdSequence (
+                            prefixe varchar(10) not null,
+                            prochain int unsigned not null,
+                            constraint ID_IdSequence_ID primary key (prefixe)
+)DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+create table if not exists TachePlanifiee (
+                                nom varchar(50) not null,
+                                derniere_execution datetime not null,
+                                constraint ID_TachePlanifiee_ID primary key (nom)
+)DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Index ajoutés
+-- _____________
+
+CALL polybase_ajouter_index('Personnel', 'IDX_Personnel_email', 'email');
+CALL polybase_ajouter_index('Tache', 'IDX_Tache_statut', 'statut');
+CALL polybase_ajouter_index('Tache', 'IDX_Tache_alerte_retard', 'alerte_retard');
+CALL polybase_ajouter_index('Tache', 'IDX_Tache_dates', 'date_debut, date_fin');
+CALL polybase_ajouter_index('Projet', 'IDX_Projet_nom', 'nom_projet');
+CALL polybase_ajouter_index('PrestationCollaborateur', 'IDX_PrestationCollaborateur_date', 'date');
+CALL polybase_ajouter_index('PlanificationCollaborateur', 'IDX_PlanificationCollaborateur_semaine', 'semaine');
+CALL polybase_ajouter_index('ProjectionFacturation', 'IDX_ProjectionFacturation_mois', 'mois');
+CALL polybase_ajouter_index('EvenementOutlook', 'IDX_EvenementOutlook_boite_debut', 'boite_mail, date_debut');
+
+DROP PROCEDURE polybase_ajouter_colonne;
+DROP PROCEDURE polybase_ajouter_index;
+
+-- Triggers
+-- ________
+-- Même définition que la section TRIGGER de init.sql (heures maintenues par différence).
+-- Les anciens triggers recalculaient la somme complète : heures_prestees est donc
+-- déjà cohérente et les nouveaux triggers peuvent reprendre à partir de là.
+
+DROP TRIGGER IF EXISTS maj_heures_tache;
+DROP TRIGGER IF EXISTS maj_depassement_apres_modif_estimee;
+DROP TRIGGER IF EXISTS maj_depassement_apres_modif_tache;
+DROP TRIGGER IF EXISTS maj_heures_apres_modif_prestation;
+DROP TRIGGER IF EXISTS maj_heures_apres_suppression_prestation;
+DROP TRIGGER IF EXISTS maj_alerte_retard;
+
+DELIMITER $$
+
+CREATE TRIGGER maj_heures_tache
+    AFTER INSERT ON PrestationCollaborateur
+    FOR EACH ROW
+BEGIN
+    IF @polybase_heures_differees IS NULL AND NEW.id_tache IS NOT NULL THEN
+        UPDATE Tache
+        SET heures_prestees = COALESCE(heures_prestees, 0) + NEW.heures_effectuees,
+            heures_depassees = GREATEST(heures_prestees - heures_estimees, 0)
+        WHERE id_tache = NEW.id_tache;
+    END IF;
+END$$
+
+CREATE TRIGGER maj_depassement_apres_modif_tache
+    BEFORE UPDATE ON Tache
+    FOR EACH ROW
+BEGIN
+    DECLARE depassement DECIMAL(5,2);
+
+    IF NEW.heures_estimees != OLD.heures_estimees OR NEW.heures_prestees != OLD.heures_prestees THEN
+        SET depassement = GREATEST(NEW.heures_prestees - NEW.heures_estimees, 0);
+        SET NEW.heures_depassees = depassement;
+    END IF;
+END$$
+
+CREATE TRIGGER maj_heures_apres_modif_prestation
+    AFTER UPDATE ON PrestationCollaborateur
+    FOR EACH ROW
+BEGIN
+    IF @polybase_heures_differees IS NULL
+        AND (NEW.heures_effectuees != OLD.heures_effectuees OR NOT (NEW.id_tache <=> OLD.id_tache)) THEN
+        IF OLD.id_tache IS NOT NULL THEN
+            UPDATE Tache
+            SET heures_prestees = COALESCE(heures_prestees, 0) - OLD.heures_effectuees,
+                heures_depassees = GREATEST(heures_prestees - heures_estimees, 0)
+            WHERE id_tache = OLD.id_tache;
+        END IF;
+        IF NEW.id_tache IS NOT NULL THEN
+            UPDATE Tache
+            SET heures_prestees = COALESCE(heures_prestees, 0) + NEW.heures_effectuees,
+                heures_depassees = GREATEST(heures_prestees - heures_estimees, 0)
+            WHERE id_tache = NEW.id_tache;
+        END IF;
+    END IF;
+END$$
+
+CREATE TRIGGER maj_heures_apres_suppression_prestation
+    AFTER DELETE ON PrestationCollaborateur
+    FOR EACH ROW
+BEGIN
+    IF @polybase_heures_differees IS NULL AND OLD.id_tache IS NOT NULL THEN
+        UPDATE Tache
+        SET heures_prestees = COALESCE(heures_prestees, 0) - OLD.heures_effectuees,
+            heures_depassees = GREATEST(heures_prestees - heures_estimees, 0)
+        WHERE id_tache = OLD.id_tache;
+    END IF;
+END$$
+
+CREATE TRIGGER maj_alerte_retard
+    BEFORE UPDATE ON Tache
+    FOR EACH ROW
+BEGIN
+    IF CURDATE() > NEW.date_fin AND NEW.statut != 'termine' THEN
+        SET NEW.alerte_retard = TRUE;
+    ELSE
+        SET NEW.alerte_retard = FALSE;
+    END IF;
+END$$
+DELIMITER ;
@@ -1,6 +1,6 @@
 // =============================================
 // specification: Esteban Barracho (v.1 26/06/2025)
-// implement: Esteban Barracho (v.4.1 12/07/2025)
+// implement: Esteban Barracho (v.4.5 17/10/2026)
 // =============================================
 document.addEventListener("DOMContentLoaded", () => {
     const tableSelect = document.getElementById('table-select');
@@ -98,17 +98,33 @@ document.addEventListener("DOMContentLoaded", () => {
         formUpdate.style.display = "none";
     }
 
-    function loadTableData() {
-        fetch(`/admin/table/${tableName}`)
-            .then(res => res.json())
-            .then(data => {
-                console.assert(Array.isArray(data), "❌ Les données de la table doivent être un tableau");
-                if (data.length > 0) {
-                    console.assert(typeof data[0] === "object", "❌ Chaque ligne doit être un objet");
-                }
+    async function loadTableData() {
+        // Lecture en flux NDJSON : les premières lignes s'affichent avant la fin du transfert
+        const requested = tableName;
+        const res = await fetch(`/admin/table/${requested}?format=ndjson`);
+        const reader = res.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = "";
+        let data = [];
+        let rendered = false;
+        while (true) {
+            const {done, value} = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, {stream: true});
+            const lines = buffer.split("\n");
+            buffer = lines.pop();
+            lines.filter(l => l.trim()).forEach(l => data.push(JSON.parse(l)));
+            if (!rendered && data.length > 0 && requested === tableName) {
+                console.assert(typeof data[0] === "object", "❌ Chaque ligne doit être un objet");
                 tableData = data;
                 renderTable();
-            });
+                rendered = true;
+            }
+        }
+        if (buffer.trim()) data.push(JSON.parse(buffer));
+        if (requested !== tableName) return;
+        tableData = data;
+        renderTable();
     }
 
     function loadTableStructure() {
@@ -394,15 +410,7 @@ document.addEventListener("DOMContentLoaded", () => {
     }).then(res => res.json())
     .then(result => {
         if (result.status === "ok") {
-            alert(`${result.inserted} ligne(s) importée(s).`);
-            loadTableData();
-            // Affiche la suggestion IA
-            const suggestionBlock = document.getElementById("suggestion-block");
-            const suggestionContent = document.getElementById("suggestion-content");
-            if (suggestionBlock && suggestionContent) {
-                suggestionContent.innerHTML = result.suggestion || "Aucune suggestion IA reçue.";
-                suggestionBlock.style.display = "block";
-            }
+            followImportJob(result.job_id);
         } else {
             alert("Erreur d'import : " + JSON.stringify(result));
         }
@@ -410,6 +418,54 @@ document.addEventListener("DOMContentLoaded", () => {
         alert("Erreur réseau : " + err.message);
     });
     };
+
+    // Suivi d'un import exécuté en tâche de fond
+    function followImportJob(jobId) {
+        const label = importBtn.textContent;
+        importBtn.disabled = true;
+        const poll = () => fetch(`/admin/import/jobs/${jobId}`).then(res => res.json()).then(job => {
+            if (job.statut === "en_attente" || job.statut === "en_cours") {
+                importBtn.textContent = job.statut === "en_attente"
+                    ? "Import en attente…"
+                    : `Import : ${job.inserted} / ${job.parsed ?? "?"}`;
+                setTimeout(poll, 1000);
+                return;
+            }
+            importBtn.textContent = label;
+            importBtn.disabled = false;
+            let message = `${job.inserted ?? 0} ligne(s) importée(s).`;
+            if (job.failed) {
+                const details = job.errors.slice(0, 10)
+                    .map(e => (e.ligne ? `Ligne ${e.ligne} : ` : "") + e.message).join("\n");
+                message += `\n${job.failed} ligne(s) rejetée(s) :\n${details}`;
+            } else if (job.statut !== "succès") {
+                message = `Import ${job.statut} : ${job.message || JSON.stringify(job.errors)}`;
+            }
+            alert(message);
+            loadTableData();
+            showImportSuggestion(jobId, job);
+        }).catch(err => {
+            importBtn.textContent = label;
+            importBtn.disabled = false;
+            alert("Erreur réseau : " + err.message);
+        });
+        poll();
+    }
+
+    // Affiche la suggestion IA (elle peut arriver après la fin de l'import)
+    function showImportSuggestion(jobId, job, attempt = 0) {
+        const suggestionBlock = document.getElementById("suggestion-block");
+        const suggestionContent = document.getElementById("suggestion-content");
+        if (!suggestionBlock || !suggestionContent) return;
+        suggestionBlock.style.display = "block";
+        if (job.suggestion_prete === false && attempt < 60) {
+            suggestionContent.innerHTML = "Suggestion IA en cours de génération…";
+            setTimeout(() => fetch(`/admin/import/jobs/${jobId}`).then(res => res.json())
+                .then(next => showImportSuggestion(jobId, next, attempt + 1)), 2000);
+            return;
+        }
+        suggestionContent.innerHTML = job.suggestion || "Aucune suggestion IA reçue.";
+    }
     document.getElementById("toggle-suggestion")?.addEventListener("click", () => {
     const content = document.getElementById("suggestion-content");
     const btn = document.getElementById("toggle-suggestion");
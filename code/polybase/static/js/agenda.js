@@ -1,12 +1,14 @@
 // =============================================
 // specification: Esteban Barracho (v.1 21/06/2025)
-// implement: Esteban Barracho (v.2.1 14/07/2025)
+// implement: Esteban Barracho (v.4 17/10/2026)
 // =============================================
 
 document.addEventListener("DOMContentLoaded", async () => {
     const days = ["Lun", "Mar", "Mer", "Jeu", "Ven"];
     const container = document.getElementById("weekly-view");
     const taskList = document.getElementById("task-list");
+    const outlookStatus = document.getElementById("outlook-status");
+    const OUTLOOK_RETRY_DELAY = 1500;  // ms avant de redemander l'agenda quand Outlook est lent
 
     // Initialiser colonnes vides
     const dayColumns = {};
@@ -18,31 +20,75 @@ document.addEventListener("DOMContentLoaded", async () => {
         dayColumns[day] = col.querySelector(".day-content");
     });
 
-    // Convertit une date ISO en nom de jour FR
-    function getDayName(isoDateStr) {
-        const date = new Date(isoDateStr);
-        const jsDay = date.getDay(); // 0=Dim, 1=Lun...
-        return ["Dim", "Lun", "Mar", "Mer", "Jeu", "Ven", "Sam"][jsDay];
+    // Date ISO locale (AAAA-MM-JJ)
+    function isoDate(date) {
+        const local = new Date(date.getTime() - date.getTimezoneOffset() * 60000);
+        return local.toISOString().slice(0, 10);
     }
 
-    // Charge les événements Outlook depuis l’API
-    try {
-        const res = await fetch("/outlook/events");
-        const events = await res.json();
+    // Semaine affichée : du lundi au samedi exclu
+    const monday = new Date();
+    monday.setHours(0, 0, 0, 0);
+    monday.setDate(monday.getDate() - ((monday.getDay() + 6) % 7));
+    const weekDates = days.map((_, i) => {
+        const d = new Date(monday);
+        d.setDate(monday.getDate() + i);
+        return isoDate(d);
+    });
+    const saturday = new Date(monday);
+    saturday.setDate(monday.getDate() + 5);
+
+    function addItem(day, text, source) {
+        const item = document.createElement("div");
+        item.className = `agenda-event agenda-${source}`;
+        item.textContent = text;
+        dayColumns[day].appendChild(item);
+    }
+
+    function showOutlookStatus(message) {
+        outlookStatus.textContent = message || "";
+        outlookStatus.hidden = !message;
+    }
 
-        events.forEach(ev => {
-            const day = getDayName(ev.date_debut);
-            if (dayColumns[day]) {
-                const item = document.createElement("div");
-                item.className = "agenda-event";
-                item.textContent = `${ev.sujet} (${ev.date_debut.slice(11, 16)} - ${ev.date_fin.slice(11, 16)})`;
-                dayColumns[day].appendChild(item);
+    // Charge l'agenda de la semaine (tâches planifiées + Outlook) depuis l’API.
+    // Si Outlook n'a pas répondu à temps ("en_attente"), l'appel est refait une
+    // fois : les événements sont alors servis par le cache du serveur.
+    async function loadAgenda(retry) {
+        try {
+            const res = await fetch(`/outlook/agenda?start=${weekDates[0]}&end=${isoDate(saturday)}`);
+            const agenda = await res.json();
+
+            Object.values(dayColumns).forEach(col => col.replaceChildren());
+            (agenda.evenements || []).forEach(ev => {
+                if (ev.source === "tache") {
+                    // Tâche : affichée chaque jour ouvré qu'elle couvre
+                    weekDates.forEach((d, i) => {
+                        if (ev.date_debut <= d && d <= ev.date_fin) addItem(days[i], `${ev.sujet} (journée)`, "tache");
+                    });
+                    return;
+                }
+                const i = weekDates.indexOf(ev.date_debut.slice(0, 10));
+                if (i >= 0) {
+                    addItem(days[i], `${ev.sujet} (${ev.date_debut.slice(11, 16)} - ${ev.date_fin.slice(11, 16)})`, "outlook");
+                }
+            });
+
+            if (agenda.outlook !== "en_attente") {
+                showOutlookStatus(agenda.outlook === "erreur" ? "⚠️ Événements Outlook indisponibles." : "");
+            } else if (retry) {
+                showOutlookStatus("⏳ Chargement des événements Outlook…");
+                setTimeout(() => loadAgenda(false), OUTLOOK_RETRY_DELAY);
+            } else {
+                showOutlookStatus("⏳ Outlook lent : événements affichés au prochain chargement.");
             }
-        });
-    } catch (err) {
-        console.error("Erreur chargement Outlook :", err);
+        } catch (err) {
+            showOutlookStatus("");
+            console.error("Erreur chargement agenda :", err);
+        }
     }
 
+    await loadAgenda(true);
+
     // Charge les tâches à planifier
     try {
         const res = await fetch("/tasks/agenda");
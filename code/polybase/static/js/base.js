@@ -1,8 +1,64 @@
 // =============================================
 // specification: Esteban Barracho (v.1 21/06/2025)
-// implement: Esteban Barracho (v.1 21/06/2025)
+// implement: Esteban Barracho (v.3 17/10/2026)
 // =============================================
 // ----- Script commun à toute l'application -----
 document.addEventListener("DOMContentLoaded", () => {
     console.log("PolyBase est prêt.");
 });
+
+// ----- Lecture d'une page d'une liste paginée (curseur X-Next-Cursor) -----
+async function fetchPage(url, cursor = null) {
+    const sep = url.includes("?") ? "&" : "?";
+    const pageUrl = cursor ? `${url}${sep}cursor=${encodeURIComponent(cursor)}` : url;
+    const response = await fetch(pageUrl);
+    if (!response.ok) throw new Error(`Erreur ${response.status} sur ${url}`);
+    return { rows: await response.json(), next: response.headers.get("X-Next-Cursor") };
+}
+
+// ----- Tableau paginé : première page, puis bouton « Charger plus » à la demande -----
+async function loadPagedTable(url, tbody, renderRow, colspan, emptyText) {
+    const table = tbody.closest("table");
+    const more = document.createElement("button");
+    more.type = "button";
+    more.className = "btn-load-more";
+    more.textContent = "Charger plus";
+    more.style.display = "none";
+    table.insertAdjacentElement("afterend", more);
+
+    let cursor = null;
+    let first = true;
+    async function loadNext() {
+        more.disabled = true;
+        const page = await fetchPage(url, cursor);
+        const html = page.rows.map(renderRow).join("");
+        if (first) {
+            tbody.innerHTML = html || `<tr><td colspan="${colspan}" style="text-align:center;">${emptyText}</td></tr>`;
+            first = false;
+        } else {
+            tbody.insertAdjacentHTML("beforeend", html);
+        }
+        cursor = page.next;
+        more.style.display = cursor ? "" : "none";
+        more.disabled = false;
+    }
+    more.addEventListener("click", () => loadNext().catch(e => {
+        console.error(`Erreur de chargement de ${url} :`, e);
+        more.disabled = false;
+    }));
+    await loadNext();
+}
+
+// ----- Lecture complète d'une liste paginée -----
+// Réservée aux listes agrégées de petite taille dont l'écran calcule des totaux
+// sur toutes les lignes (offres) ; les tableaux utilisent loadPagedTable.
+async function fetchAllPages(url) {
+    const rows = [];
+    let cursor = null;
+    do {
+        const page = await fetchPage(url, cursor);
+        rows.push(...page.rows);
+        cursor = page.next;
+    } while (cursor);
+    return rows;
+}
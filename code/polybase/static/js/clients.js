@@ -1,20 +1,18 @@
 // =============================================
 // specification: Esteban Barracho (v.1 21/06/2025)
-// implement: Esteban Barracho (v.1 21/06/2025)
+// implement: Esteban Barracho (v.3 17/10/2026)
 // =============================================
 window.onload = async () => {
     try {
-        const response = await fetch("/clients");
-        const clients = await response.json();
         const table = document.querySelector("#clients-table tbody");
-        table.innerHTML = (clients.map(c => `
+        await loadPagedTable("/clients", table, c => `
             <tr>
                 <td>${c.id_client}</td>
                 <td>${c.nom_client}</td>
                 <td>${c.adresse}</td>
                 <td>${c.secteur_activite}</td>
             </tr>
-        `).join("")) || `<tr><td colspan="4" style="text-align:center;">Aucun client</td></tr>`;
+        `, 4, "Aucun client");
     } catch (e) {
         console.error("Erreur de chargement des clients :", e);
         const table = document.querySelector("#clients-table tbody");
@@ -1,18 +1,36 @@
-// Chargement dynamique des projets
+// Chargement dynamique des projets (recherche par préfixe via /projects/options)
 document.addEventListener("DOMContentLoaded", () => {
     const selectProjet = document.getElementById("id_projet");
-    fetch("/admin/table/Projet")
-        .then(res => res.json())
-        .then(data => {
-            selectProjet.innerHTML = '<option value="">-- Sélectionner un projet --</option>';
-            data.forEach(p => {
-                const opt = document.createElement("option");
-                opt.value = p.id_projet;
-                opt.textContent = `${p.nom_projet} (${p.id_projet})`;
-                selectProjet.appendChild(opt);
+    const rechercheProjet = document.getElementById("recherche_projet");
+    let delai = null;
+
+    function chargerProjets(prefixe) {
+        const params = new URLSearchParams({ q: prefixe, limit: 100 });
+        fetch(`/projects/options?${params}`)
+            .then(res => {
+                if (!res.ok) throw new Error(res.status);
+                return res.json();
+            })
+            .then(data => {
+                selectProjet.innerHTML = data.length
+                    ? '<option value="">-- Sélectionner un projet --</option>'
+                    : '<option value="">Aucun projet trouvé</option>';
+                data.forEach(p => {
+                    const opt = document.createElement("option");
+                    opt.value = p.id_projet;
+                    opt.textContent = `${p.nom_projet} (${p.id_projet})`;
+                    selectProjet.appendChild(opt);
+                });
+            })
+            .catch(() => {
+                selectProjet.innerHTML = '<option value="">Erreur de chargement</option>';
             });
-        })
-        .catch(() => {
-            selectProjet.innerHTML = '<option value="">Erreur de chargement</option>';
-        });
+    }
+
+    rechercheProjet.addEventListener("input", () => {
+        clearTimeout(delai);
+        delai = setTimeout(() => chargerProjets(rechercheProjet.value.trim()), 250);
+    });
+
+    chargerProjets("");
 });
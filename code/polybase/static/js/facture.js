@@ -1,19 +1,15 @@
 // =============================================
 // specification: Esteban Barracho (v.1 21/06/2025)
-// implement: Esteban Barracho (v.1 21/06/2025)
+// implement: Esteban Barracho (v.3 17/10/2026)
 // =============================================
 // ================================
 //   Chargement dynamique Factures
 //   ================================
 window.onload = async () => {
     try {
-        // Appel API REST pour récupérer la liste des factures
-        const response = await fetch("/factures");
-        const factures = await response.json();
+        // Appel API REST : factures chargées page par page
         const tableBody = document.querySelector("#factures-table tbody");
-
-        if (Array.isArray(factures) && factures.length > 0) {
-            tableBody.innerHTML = factures.map(f => `
+        await loadPagedTable("/factures", tableBody, f => `
                 <tr>
                     <td>${f.id_facture}</td>
                     <td>${f.date_emission}</td>
@@ -21,10 +17,7 @@ window.onload = async () => {
                     <td>${f.statut}</td>
                     <td>${f.reference_banque}</td>
                 </tr>
-            `).join("");
-        } else {
-            tableBody.innerHTML = `<tr><td colspan="5" style="text-align:center;">Aucune facture</td></tr>`;
-        }
+            `, 5, "Aucune facture");
     } catch (e) {
         console.error("Erreur de chargement des factures :", e);
         const tableBody = document.querySelector("#factures-table tbody");
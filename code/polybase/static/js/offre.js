@@ -1,11 +1,10 @@
 // =============================================
 // specification: Esteban Barracho (v.1 21/06/2025)
-// implement: Esteban Barracho (v.1 21/06/2025)
+// implement: Esteban Barracho (v.2 17/10/2026)
 // =============================================
 window.onload = async () => {
     try {
-        const response = await fetch("/offres");
-        const offres = await response.json();
+        const offres = await fetchAllPages("/offres");
 
         // Statistiques
         let total = 0;
@@ -1,13 +1,11 @@
 // =============================================
 // specification: Esteban Barracho (v.1 21/06/2025)
-// implement: Esteban Barracho (v.1 21/06/2025)
+// implement: Esteban Barracho (v.3 17/10/2026)
 // =============================================
 window.onload = async () => {
     try {
-        const response = await fetch("/planifications");
-        const planifications = await response.json();
         const table = document.querySelector("#planifications-table tbody");
-        table.innerHTML = (planifications.map(p => `
+        await loadPagedTable("/planifications", table, p => `
             <tr>
                 <td>${p.id_planification}</td>
                 <td>${p.id_tache}</td>
@@ -15,7 +13,7 @@ window.onload = async () => {
                 <td>${p.heures_prevues}</td>
                 <td>${p.semaine}</td>
             </tr>
-        `).join("")) || `<tr><td colspan="5" style="text-align:center;">Aucune planification</td></tr>`;
+        `, 5, "Aucune planification");
     } catch (e) {
         console.error("Erreur de chargement des planifications :", e);
         const table = document.querySelector("#planifications-table tbody");
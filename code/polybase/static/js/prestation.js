@@ -1,13 +1,11 @@
 // =============================================
 // specification: Esteban Barracho (v.1 21/06/2025)
-// implement: Esteban Barracho (v.1 21/06/2025)
+// implement: Esteban Barracho (v.3 17/10/2026)
 // =============================================
 window.onload = async () => {
     try {
-        const response = await fetch("/prestation");
-        const prestations = await response.json();
         const table = document.querySelector("#prestation-table tbody");
-        table.innerHTML = (prestations.map(pre => `
+        await loadPagedTable("/prestation", table, pre => `
             <tr>
                 <td>${pre.id_prestation}</td>
                 <td>${pre.date}</td>
@@ -18,7 +16,7 @@ window.onload = async () => {
                 <td>${pre.facture_associee || '-'}</td>
                 <td>${pre.taux_horaire} €</td>
             </tr>
-        `).join("")) || `<tr><td colspan="8" style="text-align:center;">Aucune prestation</td></tr>`;
+        `, 8, "Aucune prestation");
     } catch (e) {
         console.error("Erreur de chargement des prestations :", e);
         const table = document.querySelector("#prestation-table tbody");
@@ -1,13 +1,11 @@
 // =============================================
 // specification: Esteban Barracho (v.1 21/06/2025)
-// implement: Esteban Barracho (v.1 21/06/2025)
+// implement: Esteban Barracho (v.3 17/10/2026)
 // =============================================
 window.onload = async () => {
     try {
-        const response = await fetch("/factures");
-        const factures = await response.json();
         const table = document.querySelector("#factures-table tbody");
-        table.innerHTML = (factures.map(f => `
+        await loadPagedTable("/factures", table, f => `
             <tr>
                 <td>${f.id_facture}</td>
                 <td>${f.date_emission}</td>
@@ -15,7 +13,7 @@ window.onload = async () => {
                 <td>${f.statut}</td>
                 <td>${f.reference_banque}</td>
             </tr>
-        `).join("")) || `<tr><td colspan="5" style="text-align:center;">Aucune facture</td></tr>`;
+        `, 5, "Aucune facture");
     } catch (e) {
         console.error("Erreur de chargement des factures :", e);
         const table = document.querySelector("#factures-table tbody");
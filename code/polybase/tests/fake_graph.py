@@ -0,0 +1,151 @@
+# ============================================
+# IMPORTS
+# ============================================
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# ============================================
+# FAKE MICROSOFT GRAPH (calendarView/delta, $batch)
+# ============================================
+
+def graph_event(id_outlook: str, sujet: str, jour: int, modifie_le: str = "2025-06-01T00:00:00Z") -> dict:
+    """Graph event of June 2025, from 08:00 to 09:00 on `jour`."""
+    return {
+        "id": id_outlook,
+        "subject": sujet,
+        "start": {"dateTime": f"2025-06-{jour:02d}T08:00:00.0000000", "timeZone": "UTC"},
+        "end": {"dateTime": f"2025-06-{jour:02d}T09:00:00.0000000", "timeZone": "UTC"},
+        "lastModifiedDateTime": modifie_le
+    }
+
+class FakeGraph:
+    """Local HTTP server answering `calendarView/delta` like Microsoft Graph:
+    a full round returns `events` by pages of `page_size` (`@odata.nextLink`)
+    and ends with a `@odata.deltaLink`; a call on that link returns the
+    `changes` queued since, or 410 Gone once `expired` is set.
+    `$batch` creates (POST) and updates (PATCH, 404 for an unknown event) the
+    events of `created`. The next `batch_throttles` calls are answered as a
+    whole with that status and a Retry-After of `retry_after` seconds; a
+    request id listed in `throttled` gets that many 429 answers first. Each
+    call lasts `batch_delay` seconds and `max_in_flight` records the highest
+    number of concurrent calls.
+    """
+
+    def __init__(self, page_size: int = 2):
+        self.page_size = page_size
+        self.events = {}
+        self.changes = []
+        self.expired = False
+        self.calls = []
+        self.created = {}
+        self._created_count = 0
+        self.batches = []
+        self.batch_throttles = []
+        self.throttled = {}
+        self.retry_after = 7
+        self.batch_delay = 0.0
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._rounds = 0
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def add(self, *events):
+        for event in events:
+            self.events[event["id"]] = event
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _delta_link(self) -> str:
+        self._rounds += 1
+        return f"{self.url}/delta?deltatoken={self._rounds}"
+
+    def _answer(self, path: str) -> tuple:
+        query = parse_qs(urlparse(path).query)
+        if "deltatoken" in query:
+            if self.expired:
+                return 410, {"error": {"code": "syncStateNotFound", "message": "Jeton delta expiré"}}
+            changes, self.changes = self.changes, []
+            return 200, {"value": changes, "@odata.deltaLink": self._delta_link()}
+        page = int(query.get("skiptoken", ["0"])[0])
+        events = list(self.events.values())
+        body = {"value": events[page * self.page_size:(page + 1) * self.page_size]}
+        if (page + 1) * self.page_size < len(events):
+            body["@odata.nextLink"] = f"{self.url}{urlparse(path).path}?skiptoken={page + 1}"
+        else:
+            body["@odata.deltaLink"] = self._delta_link()
+        return 200, body
+
+    def _batch_answer(self, request: dict) -> dict:
+        answer = {"id": request["id"], "headers": {"Content-Type": "application/json"}}
+        if self.throttled.get(request["id"]):
+            self.throttled[request["id"]] -= 1
+            return {**answer, "status": 429, "headers": {"Retry-After": str(self.retry_after)}, "body": {}}
+        if request["method"] == "POST":
+            self._created_count += 1
+            id_outlook = f"EV{self._created_count}"
+            self.created[id_outlook] = request["body"]
+            return {**answer, "status": 201, "body": {"id": id_outlook, **request["body"]}}
+        id_outlook = request["url"].rsplit("/", 1)[1]
+        if id_outlook not in self.created:
+            return {**answer, "status": 404, "body": {"error": {"code": "ErrorItemNotFound", "message": "Introuvable"}}}
+        self.created[id_outlook].update(request["body"])
+        return {**answer, "status": 200, "body": {"id": id_outlook, **self.created[id_outlook]}}
+
+    def _batch(self, body: dict) -> tuple:
+        with self._lock:
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        try:
+            time.sleep(self.batch_delay)
+            with self._lock:
+                self.batches.append(body["requests"])
+                if self.batch_throttles:
+                    status = self.batch_throttles.pop(0)
+                    return status, {"Retry-After": str(self.retry_after)}, {"error": {"code": "TooManyRequests"}}
+                return 200, {}, {"responses": [self._batch_answer(r) for r in body["requests"]]}
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _handler(self):
+        graph = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body: dict, headers: dict = None):
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                for name, value in {"Content-Type": "application/json", **(headers or {})}.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                graph.calls.append(self.path)
+                self._send(*graph._answer(self.path))
+
+            def do_POST(self):
+                graph.calls.append(self.path)
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                status, headers, answer = graph._batch(body)
+                self._send(status, answer, headers)
+
+        return Handler
@@ -0,0 +1,32 @@
+# ============================================
+# IMPORTS
+# ============================================
+
+from app.auth import user_cache
+from app.utils.pool_metrics import pool_metrics
+
+# ============================================
+# ONE CONNECTION PER REQUEST
+# ============================================
+
+def checkouts_during(call) -> int:
+    """Number of connections checked out of the pool while `call` runs."""
+    before = pool_metrics.checkouts
+    response = call()
+    assert response.status_code < 500, response.text
+    return pool_metrics.checkouts - before
+
+def test_get_current_user_and_route_share_one_connection(login):
+    client = login("P001")
+    user_cache.invalidate()  # get_current_user reads Personnel, the route reads ImportLog
+    assert checkouts_during(lambda: client.get("/admin/import/jobs/IMP999")) == 1
+
+def test_cached_user_does_not_open_another_connection(login):
+    client = login("P001")
+    client.get("/admin/import/jobs/IMP999")
+    assert checkouts_during(lambda: client.get("/admin/import/jobs/IMP999")) == 1
+
+def test_authentication_from_cache_alone_uses_no_connection(login):
+    client = login("P001")
+    client.get("/admin/pool")
+    assert checkouts_during(lambda: client.get("/admin/pool")) == 0
@@ -0,0 +1,46 @@
+# ============================================
+# IMPORTS
+# ============================================
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app import models
+from app.routers.dashboard import mes_taches
+
+# ============================================
+# FIXTURES
+# ============================================
+
+@pytest.fixture
+def planning(db):
+    """Tasks T951 (en_cours) and T952 (termine) planned for P951."""
+    db.add_all([
+        models.Tache(id_tache="T951", nom_tache="Ouverte", statut="en_cours"),
+        models.Tache(id_tache="T952", nom_tache="Terminée", statut="termine"),
+        models.PlanificationCollaborateur(id_planification="PL951", id_tache="T951", id_collaborateur="P951"),
+        models.PlanificationCollaborateur(id_planification="PL952", id_tache="T952", id_collaborateur="P951"),
+    ])
+    db.commit()
+    yield
+    db.query(models.PlanificationCollaborateur).filter_by(id_collaborateur="P951").delete()
+    db.query(models.Tache).filter(models.Tache.id_tache.in_(["T951", "T952"])).delete(synchronize_session=False)
+    db.commit()
+
+# ============================================
+# MY TASKS
+# ============================================
+
+def test_my_tasks_exclude_completed_tasks(engine, planning):
+    async def run():
+        async_engine = create_async_engine(engine.url.set(drivername="sqlite+aiosqlite"))
+        try:
+            async with AsyncSession(async_engine) as session:
+                return await mes_taches(SimpleNamespace(id_personnel="P951"), session)
+        finally:
+            await async_engine.dispose()
+
+    assert [t["id_tache"] for t in asyncio.run(run())] == ["T951"]
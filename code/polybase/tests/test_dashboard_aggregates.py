@@ -0,0 +1,71 @@
+# ============================================
+# IMPORTS
+# ============================================
+
+from collections import namedtuple
+
+from app.utils.dashboard_aggregates import DashboardAggregates
+
+# ============================================
+# CONCURRENT ROW REFRESHES
+# ============================================
+
+TacheRow = namedtuple("TacheRow", "id_tache alerte_retard heures_depassees")
+
+class FakeQuery:
+    """Returns `rows` from filter(), after running `during_read` (a write landing meanwhile)."""
+
+    def __init__(self, rows, during_read=None):
+        self.rows = rows
+        self.during_read = during_read
+
+    def filter(self, *criteria):
+        if self.during_read:
+            self.during_read()
+        return list(self.rows)
+
+class FakeDb:
+    def __init__(self, query):
+        self._query = query
+
+    def query(self, *columns):
+        return self._query
+
+def loaded_store() -> DashboardAggregates:
+    store = DashboardAggregates(ttl=3600)
+    store._loaded = True
+    store._apply_tache("T001", (False, 0))
+    return store
+
+def test_refresh_read_before_a_newer_refresh_invalidates_the_store():
+    store = loaded_store()
+    newer = FakeDb(FakeQuery([TacheRow("T001", True, 8)]))
+    older = FakeDb(FakeQuery([TacheRow("T001", False, 2)], during_read=lambda: store.refresh_tache(newer, "T001")))
+    store.refresh_tache(older, "T001")
+    assert not store._loaded
+
+def test_refresh_without_concurrent_write_is_applied():
+    store = loaded_store()
+    store.refresh_tache(FakeDb(FakeQuery([TacheRow("T001", True, 8)])), "T001")
+    assert store._loaded
+    assert store._taches_retard == {"T001"}
+    assert store._heures_depassees == 8
+
+# ============================================
+# CONSISTENCY CHECK
+# ============================================
+
+def test_check_does_not_load_the_store(db):
+    store = DashboardAggregates(ttl=3600)
+    assert store.check(db) == {"statut": "non chargé", "coherent": None, "ecarts": []}
+    assert not store._loaded
+
+def test_check_reports_a_tampered_store(db):
+    store = DashboardAggregates(ttl=3600)
+    store.rebuild(db)
+    assert store.check(db)["coherent"] is True
+    store._heures_depassees += 5
+    store._taches_retard.add("T999")
+    report = store.check(db)
+    assert report["statut"] == "chargé" and report["coherent"] is False
+    assert [e["indicateur"] for e in report["ecarts"]] == ["heures_depassees", "taches_retard"]
@@ -0,0 +1,52 @@
+# ============================================
+# IMPORTS
+# ============================================
+
+import pytest
+from sqlalchemy import text
+
+from app.utils.bulk_import import bulk_insert
+from app.utils.id_allocator import id_allocator
+
+# ============================================
+# FIXTURES
+# ============================================
+
+@pytest.fixture
+def clients(db):
+    """Removes the clients created by a test (all but the reference client CL001)."""
+    yield
+    db.execute(text("DELETE FROM Client WHERE id_client <> 'CL001'"))
+    db.commit()
+
+def number(id_client: str) -> int:
+    return int(id_client[len("CL"):])
+
+def client_row(id_client: str) -> dict:
+    return {"id_client": id_client, "nom_client": f"Client {id_client}", "adresse": "Rue 2", "secteur_activite": "Privé"}
+
+# ============================================
+# EXPLICIT IDENTIFIERS
+# ============================================
+
+def test_allocation_continues_after_a_client_created_with_its_own_id(client, clients):
+    explicit = f"CL{number(id_allocator.next_id('CL')) + 10:03d}"
+    assert client.post("/clients", json=client_row(explicit)).status_code == 200
+    assert number(id_allocator.next_id("CL")) == number(explicit) + 1
+
+def test_allocation_continues_after_imported_ids(db, clients):
+    explicit = f"CL{number(id_allocator.next_id('CL')) + 20:03d}"
+    report = bulk_insert(db, "Client", [client_row(explicit)])
+    assert report["inserted"] == 1
+    assert number(id_allocator.next_id("CL")) == number(explicit) + 1
+
+def test_insert_row_retries_after_a_collision_with_an_unknown_explicit_id(login, db, clients):
+    # Written without advancing the sequence: the next number of the reserved block is already taken
+    id_allocator.next_id("CL")
+    colliding = f"CL{id_allocator._blocks['CL'][0]:03d}"
+    db.execute(text("INSERT INTO Client (id_client, nom_client, adresse, secteur_activite) "
+                    "VALUES (:id_client, :nom_client, :adresse, :secteur_activite)"), client_row(colliding))
+    db.commit()
+    answer = login("P001").post("/admin/table/Client", json={k: v for k, v in client_row("").items() if k != "id_client"})
+    assert answer.status_code == 200
+    assert number(answer.json()["id"]) > number(colliding)
@@ -0,0 +1,152 @@
+# ============================================
+# IMPORTS
+# ============================================
+
+import time
+from contextlib import contextmanager
+
+import pytest
+
+from app.utils import import_jobs as jobs_module
+from app.utils.import_jobs import ImportJobManager
+
+# ============================================
+# FIXTURES
+# ============================================
+
+@pytest.fixture
+def manager(monkeypatch, tmp_path):
+    """Job manager whose imports only record the order in which they ran."""
+    ran = []
+
+    def fake_import(table, file_path, db, source, id_import, on_progress):
+        ran.append(id_import)
+        return {"inserted": 1, "failed": 0, "errors": [], "methode": "test"}, None
+
+    monkeypatch.setattr(jobs_module, "adapt_excel_to_table", fake_import)
+    manager = ImportJobManager(workers=1)
+    manager.ran = ran
+    manager.upload = lambda name: str(tmp_path / name)
+    yield manager
+    manager._executor.shutdown(wait=True)
+
+def wait_finished(manager, db, ids, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if all(manager.status(db, i)["statut"] not in jobs_module.RUNNING_STATUSES for i in ids):
+            return
+        time.sleep(0.02)
+    pytest.fail(f"imports toujours en cours : {[manager.status(db, i)['statut'] for i in ids]}")
+
+# ============================================
+# QUEUE OF A TABLE
+# ============================================
+
+def test_queue_is_drained_when_cleanup_fails(manager, db, monkeypatch):
+    def locked_file(path):
+        raise PermissionError(f"fichier verrouillé : {path}")
+
+    monkeypatch.setattr(jobs_module.os, "remove", locked_file)
+    ids = [manager.create(db, "Client", f"clients_{i}.xlsx") for i in range(3)]
+    for i, id_import in enumerate(ids):
+        path = manager.upload(f"clients_{i}.xlsx")
+        open(path, "wb").close()
+        manager.submit(id_import, path)
+    wait_finished(manager, db, ids)
+    assert manager.ran == ids
+    assert "Client" not in manager._queues
+
+# ============================================
+# TABLE LOCKED BY ANOTHER WORKER
+# ============================================
+
+@pytest.fixture
+def locked_tables(monkeypatch):
+    """Tables whose cross-worker lock is held by another worker (until removed by the test)."""
+    locked = set()
+
+    @contextmanager
+    def fake_lock(name, timeout=0):
+        assert timeout == 0
+        yield name.removeprefix("import_") not in locked
+
+    monkeypatch.setattr(jobs_module, "cross_worker_lock", fake_lock)
+    monkeypatch.setattr(jobs_module, "IMPORT_LOCK_RETRY", 0.05)
+    return locked
+
+def submit(manager, db, table):
+    id_import = manager.create(db, table, f"{table}.xlsx")
+    path = manager.upload(f"{id_import}.xlsx")
+    open(path, "wb").close()
+    manager.submit(id_import, path)
+    return id_import
+
+def test_job_waiting_for_another_worker_frees_the_import_thread(manager, db, locked_tables):
+    locked_tables.add("Client")
+    waiting = submit(manager, db, "Client")
+    other = submit(manager, db, "Projet")  # single import thread: runs while Client waits
+    wait_finished(manager, db, [other])
+    assert manager.ran == [other]
+    assert manager.status(db, waiting)["statut"] == "en_attente"
+    locked_tables.clear()
+    wait_finished(manager, db, [waiting])
+    assert manager.ran == [other, waiting]
+
+def test_job_fails_once_the_lock_timeout_is_reached(manager, db, locked_tables, monkeypatch):
+    monkeypatch.setattr(jobs_module, "IMPORT_LOCK_TIMEOUT", 0)
+    locked_tables.add("Client")
+    id_import = submit(manager, db, "Client")
+    wait_finished(manager, db, [id_import])
+    manager._executor.shutdown(wait=True)  # the queue is drained after the status is set
+    assert manager.status(db, id_import)["statut"] == "échec"
+    assert manager.ran == []
+    assert "Client" not in manager._queues
+
+# ============================================
+# STATUS READ FROM ANOTHER WORKER
+# ============================================
+
+@pytest.fixture
+def other_worker_job(manager, db, monkeypatch):
+    """ImportLog row of a job created by another uvicorn worker, read through a session
+    seen as MySQL; the state of the table lock is set by the test."""
+    from types import SimpleNamespace
+    from sqlalchemy import text
+
+    id_import = manager.create(db, "Projet", "projets.xlsx")
+    manager._jobs.clear()
+    lock = {"free": False}
+    monkeypatch.setattr(jobs_module, "lock_is_free", lambda db, name: lock["free"])
+
+    def set_row(statut, age):
+        db.execute(text("UPDATE ImportLog SET statut = :statut, derniere_maj = :maj WHERE id_import = :id"),
+                   {"statut": statut, "maj": jobs_module.datetime.now() - jobs_module.timedelta(seconds=age),
+                    "id": id_import})
+        db.commit()
+
+    mysql = SimpleNamespace(execute=db.execute, get_bind=lambda: SimpleNamespace(dialect=SimpleNamespace(name="mysql")))
+    yield SimpleNamespace(id=id_import, lock=lock, set_row=set_row, db=mysql)
+
+@pytest.mark.parametrize("statut", ["en_attente", "en_cours"])
+def test_job_of_another_worker_keeps_its_persisted_status(manager, db, other_worker_job, statut):
+    other_worker_job.set_row(statut, age=3600 * 24)
+    assert manager.status(other_worker_job.db, other_worker_job.id)["statut"] == statut  # the table lock is held
+
+def test_running_job_with_free_lock_is_interrupted_once_stale(manager, db, other_worker_job):
+    other_worker_job.lock["free"] = True
+    other_worker_job.set_row("en_cours", age=1)
+    assert manager.status(other_worker_job.db, other_worker_job.id)["statut"] == "en_cours"
+    other_worker_job.set_row("en_cours", age=jobs_module.ORPHAN_AFTER + 1)
+    assert manager.status(other_worker_job.db, other_worker_job.id)["statut"] == "interrompu"
+
+def test_queued_job_with_free_lock_waits_up_to_the_lock_timeout(manager, db, other_worker_job):
+    other_worker_job.lock["free"] = True
+    other_worker_job.set_row("en_attente", age=jobs_module.ORPHAN_AFTER + 1)
+    assert manager.status(other_worker_job.db, other_worker_job.id)["statut"] == "en_attente"
+    other_worker_job.set_row("en_attente", age=jobs_module.IMPORT_LOCK_TIMEOUT + 1)
+    assert manager.status(other_worker_job.db, other_worker_job.id)["statut"] == "interrompu"
+
+def test_single_process_reports_jobs_lost_in_a_restart(manager, db):
+    id_import = manager.create(db, "Projet", "projets.xlsx")
+    manager._jobs.clear()
+    assert manager.status(db, id_import)["statut"] == "interrompu"
@@ -0,0 +1,52 @@
+# ============================================
+# IMPORTS
+# ============================================
+
+import re
+from pathlib import Path
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.utils.index_advisor import RECOMMENDED_INDEXES, advise
+from app.utils.schema_catalog import schema_catalog
+
+# ============================================
+# CONFIGURATION
+# ============================================
+
+INIT_SQL = Path(__file__).resolve().parents[1] / "mysql-init" / "init.sql"
+
+def declared_indexes() -> dict:
+    """IDX_* indexes created by init.sql: name -> (table, columns)."""
+    pattern = re.compile(r"create index (IDX_\w+) on (\w+) \(([^)]*)\)", re.IGNORECASE)
+    return {name: (table, [c.strip() for c in columns.split(",")])
+            for name, table, columns in pattern.findall(INIT_SQL.read_text(encoding="utf-8"))}
+
+@pytest.fixture(scope="module")
+def mysql(mysql_engine):
+    """Session on the compose MySQL, with the schema catalog reflected from it."""
+    schema_catalog.invalidate()
+    db = Session(mysql_engine)
+    yield db
+    db.close()
+    schema_catalog.invalidate()
+
+# ============================================
+# INDEX ADVISOR
+# ============================================
+
+def test_every_init_sql_index_is_checked_by_the_advisor():
+    assert declared_indexes() == RECOMMENDED_INDEXES
+
+def test_no_index_of_init_sql_is_reported_missing(mysql):
+    assert advise(mysql)["index_manquants"] == []
+
+def test_known_queries_have_no_full_scan(mysql):
+    report = advise(mysql)["requetes"]
+    errors = {query["nom"]: query["erreur"] for query in report if "erreur" in query}
+    assert not errors, errors
+    # A scan the optimizer picks over an available index (tables of a few rows) is not a missing index.
+    scans = {query["nom"]: query["alertes"] for query in report
+             if any(not alert["index_possibles"] for alert in query["alertes"])}
+    assert not scans, scans
@@ -0,0 +1,97 @@
+# ============================================
+# IMPORTS
+# ============================================
+
+from datetime import datetime, timedelta
+
+import pytest
+import requests
+from sqlalchemy import text
+
+from app.utils import outlook_sync
+from app.utils.outlook_sync import DELTA_RESET_DAYS, DeltaExpiredError, delta_sync, graph_pages
+from fake_graph import FakeGraph, graph_event
+
+MAILBOX = "agenda@polybase.local"
+NOW = datetime(2025, 6, 1)
+
+# ============================================
+# FIXTURES
+# ============================================
+
+@pytest.fixture
+def graph(monkeypatch, db):
+    """Fake Graph server with three events, and no synchronized state for MAILBOX."""
+    for table in ("EvenementOutlook", "SynchroOutlook"):
+        db.execute(text(f"DELETE FROM {table} WHERE boite_mail = :boite"), {"boite": MAILBOX})
+    db.commit()
+    server = FakeGraph().start()
+    server.add(graph_event("E1", "Réunion", 2), graph_event("E2", "Chantier", 3), graph_event("E3", "Client", 4))
+    monkeypatch.setattr(outlook_sync, "GRAPH_BASE_URL", server.url)
+    yield server
+    server.stop()
+
+def stored_events(db) -> dict:
+    return dict(db.execute(text("SELECT id_outlook, sujet FROM EvenementOutlook WHERE boite_mail = :boite"),
+                           {"boite": MAILBOX}).all())
+
+def stored_state(db):
+    return db.execute(text("SELECT delta_link, debut_fenetre FROM SynchroOutlook WHERE boite_mail = :boite"),
+                      {"boite": MAILBOX}).first()
+
+# ============================================
+# GRAPH PAGES
+# ============================================
+
+def test_graph_pages_follows_next_links_up_to_the_delta_link(graph):
+    with requests.Session() as http:
+        items, delta_link = graph_pages(http, f"{graph.url}/users/{MAILBOX}/calendarView/delta", "jeton")
+    assert [i["id"] for i in items] == ["E1", "E2", "E3"]
+    assert delta_link == f"{graph.url}/delta?deltatoken=1"
+    assert len(graph.calls) == 2
+
+def test_graph_pages_raises_on_expired_delta_token(graph):
+    graph.expired = True
+    with requests.Session() as http, pytest.raises(DeltaExpiredError):
+        graph_pages(http, f"{graph.url}/delta?deltatoken=1", "jeton")
+
+# ============================================
+# DELTA SYNC
+# ============================================
+
+def test_first_sync_is_complete_and_stores_the_delta_link(graph, db):
+    report = delta_sync(MAILBOX, "jeton", now=NOW)
+    assert report["mode"] == "complet" and report["inserted"] == 3
+    assert stored_events(db) == {"E1": "Réunion", "E2": "Chantier", "E3": "Client"}
+    assert stored_state(db).delta_link == f"{graph.url}/delta?deltatoken=1"
+
+def test_delta_round_applies_changes_and_removed_items(graph, db):
+    delta_sync(MAILBOX, "jeton", now=NOW)
+    graph.changes = [graph_event("E2", "Chantier déplacé", 5, "2025-06-02T00:00:00Z"),
+                     graph_event("E4", "Nouveau", 6),
+                     {"id": "E1", "@removed": {"reason": "deleted"}}]
+    report = delta_sync(MAILBOX, "jeton", now=NOW + timedelta(hours=1))
+    assert report["mode"] == "delta"
+    assert (report["inserted"], report["updated"], report["deleted"]) == (1, 1, 1)
+    assert stored_events(db) == {"E2": "Chantier déplacé", "E3": "Client", "E4": "Nouveau"}
+    assert graph.calls[-1].endswith("deltatoken=1")
+    assert stored_state(db).delta_link.endswith("deltatoken=2")
+
+def test_expired_delta_token_falls_back_to_a_full_sync(graph, db):
+    delta_sync(MAILBOX, "jeton", now=NOW)
+    graph.expired = True
+    del graph.events["E3"]
+    report = delta_sync(MAILBOX, "jeton", now=NOW + timedelta(hours=1))
+    assert report["mode"] == "complet" and report["deleted"] == 1
+    assert stored_events(db) == {"E1": "Réunion", "E2": "Chantier"}
+    assert any(call.endswith("deltatoken=1") for call in graph.calls)
+    assert stored_state(db).delta_link.endswith("deltatoken=2")  # link of the new full round
+
+def test_window_is_reset_after_delta_reset_days(graph, db):
+    delta_sync(MAILBOX, "jeton", now=NOW)
+    calls = len(graph.calls)
+    later = NOW + timedelta(days=DELTA_RESET_DAYS)
+    report = delta_sync(MAILBOX, "jeton", now=later)
+    assert report["mode"] == "complet"
+    assert not any("deltatoken" in call for call in graph.calls[calls:])
+    assert outlook_sync._as_datetime(stored_state(db).debut_fenetre) == later
@@ -0,0 +1,130 @@
+# ============================================
+# IMPORTS
+# ============================================
+
+from datetime import date
+
+import pytest
+from sqlalchemy import text
+
+from app import models
+from app.utils import outlook_sync
+from app.utils.outlook_sync import export_tasks
+from fake_graph import FakeGraph
+
+MAILBOX = "export@polybase.local"
+TOKEN = "jeton-de-test-graph"
+
+# ============================================
+# FIXTURES
+# ============================================
+
+@pytest.fixture
+def graph(monkeypatch):
+    server = FakeGraph().start()
+    monkeypatch.setattr(outlook_sync, "GRAPH_BASE_URL", server.url)
+    yield server
+    server.stop()
+
+@pytest.fixture
+def taches(db):
+    """Returns a function creating feasible tasks T901, T902, ... (removed with their mappings afterwards)."""
+    ids = []
+
+    def _create(count: int) -> list:
+        for i in range(count):
+            ids.append(f"T9{i + 1:02d}")
+            db.add(models.Tache(id_tache=ids[-1], nom_tache=f"Tâche {i + 1}", est_realisable=True,
+                                date_debut=date(2025, 6, 2), date_fin=date(2025, 6, 6)))
+        db.commit()
+        return list(ids)
+
+    yield _create
+    db.execute(text("DELETE FROM ExportOutlook WHERE boite_mail = :boite"), {"boite": MAILBOX})
+    db.query(models.Tache).filter(models.Tache.id_tache.in_(ids)).delete(synchronize_session=False)
+    db.commit()
+
+def export(db, ids, waits=None):
+    """Exports the tasks; the requested waits are recorded in `waits` instead of slept."""
+    waits = [] if waits is None else waits
+    return export_tasks(db, TOKEN, MAILBOX, ids_tache=ids, sleep=waits.append)
+
+def mapping(db, id_tache):
+    return db.query(models.ExportOutlook).filter_by(boite_mail=MAILBOX, id_tache=id_tache).one()
+
+# ============================================
+# THROTTLING
+# ============================================
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_throttled_batch_is_resent_after_retry_after(graph, db, taches, status):
+    ids = taches(2)
+    graph.batch_throttles = [status, status]
+    waits = []
+    report = export(db, ids, waits)
+    assert report["created"] == 2 and report["failed"] == 0
+    assert waits == [graph.retry_after, graph.retry_after]
+    assert [len(batch) for batch in graph.batches] == [2, 2, 2]
+
+def test_throttled_sub_request_is_resent_alone(graph, db, taches):
+    ids = taches(3)
+    graph.throttled = {"T902": 2}
+    waits = []
+    report = export(db, ids, waits)
+    assert report["created"] == 3 and report["failed"] == 0
+    assert waits == [graph.retry_after, graph.retry_after]
+    assert [[r["id"] for r in batch] for batch in graph.batches] == [ids, ["T902"], ["T902"]]
+
+def test_requests_still_throttled_after_the_retries_fail(graph, db, taches):
+    ids = taches(1)
+    graph.throttled = {"T901": outlook_sync.EXPORT_MAX_RETRIES + 1}
+    waits = []
+    report = export(db, ids, waits)
+    assert report["failed"] == 1 and "T901" in report["errors"]
+    assert len(waits) == outlook_sync.EXPORT_MAX_RETRIES
+    assert db.query(models.ExportOutlook).filter_by(boite_mail=MAILBOX).count() == 0
+
+# ============================================
+# RE-EXPORT
+# ============================================
+
+def test_reexport_patches_changed_tasks_and_skips_unchanged_ones(graph, db, taches):
+    ids = taches(2)
+    export(db, ids)
+    id_outlook = mapping(db, "T901").id_outlook
+    db.get(models.Tache, "T901").nom_tache = "Tâche renommée"
+    db.commit()
+    report = export(db, ids)
+    assert (report["created"], report["updated"], report["unchanged"]) == (0, 1, 1)
+    assert [(r["method"], r["url"].rsplit("/", 1)[1]) for r in graph.batches[-1]] == [("PATCH", id_outlook)]
+    assert graph.created[id_outlook]["subject"] == "Tâche renommée"
+    assert mapping(db, "T901").id_outlook == id_outlook
+
+def test_patch_of_an_event_deleted_in_outlook_recreates_it(graph, db, taches):
+    ids = taches(1)
+    export(db, ids)
+    deleted = mapping(db, "T901").id_outlook
+    del graph.created[deleted]
+    db.get(models.Tache, "T901").nom_tache = "Tâche recréée"
+    db.commit()
+    waits = []
+    report = export(db, ids, waits)
+    assert (report["created"], report["updated"], report["failed"]) == (1, 0, 0)
+    assert [r["method"] for batch in graph.batches[1:] for r in batch] == ["PATCH", "POST"]
+    assert waits == []
+    recreated = mapping(db, "T901").id_outlook
+    assert recreated != deleted and graph.created[recreated]["subject"] == "Tâche recréée"
+
+# ============================================
+# CONCURRENCY
+# ============================================
+
+def test_batches_in_flight_are_bounded_by_export_concurrency(graph, db, taches, monkeypatch):
+    monkeypatch.setattr(outlook_sync, "GRAPH_BATCH_SIZE", 1)
+    monkeypatch.setattr(outlook_sync, "EXPORT_CONCURRENCY", 2)
+    graph.batch_delay = 0.1
+    ids = taches(6)
+    report = export(db, ids)
+    assert report["created"] == 6
+    assert len(graph.batches) == 6
+    assert graph.max_in_flight == 2
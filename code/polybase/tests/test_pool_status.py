@@ -0,0 +1,43 @@
+# ============================================
+# IMPORTS
+# ============================================
+
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.database import DB_CONNECTION_BUDGET
+from app.utils.pool_metrics import InstrumentedAsyncQueuePool, async_pool_metrics, instrument_engine, pool_metrics
+
+# ============================================
+# POOL STATUS
+# ============================================
+
+def test_pool_status_reports_both_pools(login):
+    status = login("P001").get("/admin/pool").json()
+    assert status["configuration"]["budget_connexions"] == DB_CONNECTION_BUDGET
+    for pool in ("synchrone", "asynchrone"):
+        assert status[pool]["utilisation"]["capacite"] == status[pool]["pool_size"] + status[pool]["max_overflow"]
+        assert "p95" in status[pool]["metriques"]["attente_ms"]
+
+def test_async_pool_reports_to_its_own_metrics(tmp_path):
+    pytest.importorskip("aiosqlite")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'async.db'}", poolclass=InstrumentedAsyncQueuePool,
+                                 pool_size=2, max_overflow=0)
+    instrument_engine(engine.sync_engine, pre_ping="idle", idle_ping_after=0, metrics=async_pool_metrics)
+    before_sync, before_async = pool_metrics.checkouts, async_pool_metrics.snapshot()
+
+    async def run():
+        for _ in range(2):
+            async with engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+        await engine.dispose()
+
+    asyncio.run(run())
+    after = async_pool_metrics.snapshot()
+    assert pool_metrics.checkouts == before_sync
+    assert after["checkouts"] - before_async["checkouts"] == 2
+    assert after["pings"] - before_async["pings"] == 1  # second checkout reuses an idle connection
+    assert after["attente_ms"]["echantillons"] > before_async["attente_ms"]["echantillons"]
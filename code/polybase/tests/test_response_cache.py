@@ -0,0 +1,82 @@
+# ============================================
+# IMPORTS
+# ============================================
+
+import asyncio
+
+from starlette.requests import Request
+
+from app.utils.response_cache import ResponseCache
+
+# ============================================
+# HELPERS
+# ============================================
+
+def request(path: str = "/clients") -> Request:
+    return Request({"type": "http", "method": "GET", "path": path, "query_string": b"", "headers": []})
+
+NO_WRITE = object()
+
+def counting_build(cache: ResponseCache, invalidate=NO_WRITE):
+    """Build function counting its calls; its first call can simulate a write
+    committed while it runs (`invalidate(table)`, None for every table)."""
+    calls = []
+
+    def build():
+        calls.append(1)
+        if invalidate is not NO_WRITE and len(calls) == 1:
+            cache.invalidate(invalidate)
+        return [{"id_client": "CL001", "version": len(calls)}]
+    build.calls = calls
+    return build
+
+# ============================================
+# RESPONSE CACHE
+# ============================================
+
+def test_response_is_cached_until_its_table_is_invalidated():
+    cache = ResponseCache()
+    build = counting_build(cache)
+    cache.respond(request(), ("Client",), build)
+    cache.respond(request(), ("Client",), build)
+    assert len(build.calls) == 1
+    cache.invalidate("Client")
+    cache.respond(request(), ("Client",), build)
+    assert len(build.calls) == 2
+
+def test_response_built_during_an_invalidation_is_not_cached():
+    cache = ResponseCache()
+    build = counting_build(cache, invalidate="Client")
+    first = cache.respond(request(), ("Client",), build)
+    second = cache.respond(request(), ("Client",), build)
+    assert len(build.calls) == 2
+    assert b'"version":2' in second.body and first.headers["ETag"] != second.headers["ETag"]
+
+def test_invalidation_through_a_cascade_or_of_everything_also_discards_the_build():
+    for invalidated in ("Client", None):  # Projet rows are deleted with their Client
+        cache = ResponseCache()
+        build = counting_build(cache, invalidate=invalidated)
+        for _ in range(2):
+            cache.respond(request("/projects"), ("Projet",), build)
+        assert len(build.calls) == 2
+
+def test_invalidation_of_another_table_keeps_the_build():
+    cache = ResponseCache()
+    build = counting_build(cache, invalidate="Offre")
+    for _ in range(2):
+        cache.respond(request(), ("Client",), build)
+    assert len(build.calls) == 1
+
+def test_async_response_built_during_an_invalidation_is_not_cached():
+    cache = ResponseCache()
+    build = counting_build(cache, invalidate="Client")
+
+    async def build_async():
+        return build()
+
+    async def run():
+        for _ in range(2):
+            await cache.respond_async(request(), ("Client",), build_async)
+
+    asyncio.run(run())
+    assert len(build.calls) == 2
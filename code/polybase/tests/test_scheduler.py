@@ -0,0 +1,60 @@
+# ============================================
+# IMPORTS
+# ============================================
+
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+
+from app.utils.scheduler import BackgroundScheduler
+
+# ============================================
+# SHARED LAST RUN
+# ============================================
+
+JOB = "synchro_test"
+
+@pytest.fixture
+def workers(db):
+    """Two schedulers sharing the test database, as two uvicorn workers share MySQL."""
+    runs = []
+    schedulers = []
+    for worker in ("A", "B"):
+        scheduler = BackgroundScheduler()
+        scheduler.add_job(JOB, lambda worker=worker: runs.append(worker), interval=900)
+        schedulers.append(scheduler)
+    yield schedulers, runs
+    db.execute(text("DELETE FROM TachePlanifiee WHERE nom = :nom"), {"nom": JOB})
+    db.commit()
+
+def run(scheduler):
+    scheduler._run_job(JOB, scheduler._jobs[JOB])
+    return scheduler._jobs[JOB]
+
+def test_job_runs_once_per_interval_across_workers(workers):
+    (a, b), runs = workers
+    assert run(a)["last_status"] == "ok"
+    job = run(b)
+    assert job["last_status"] == "ignoree"
+    assert runs == ["A"]
+
+def test_skipped_worker_waits_for_the_shared_next_run(workers, db):
+    (a, b), runs = workers
+    run(a)
+    db.execute(text("UPDATE TachePlanifiee SET derniere_execution = :t WHERE nom = :nom"),
+               {"t": datetime.utcnow() - timedelta(seconds=600), "nom": JOB})
+    db.commit()
+    job = run(b)
+    assert job["last_status"] == "ignoree"
+    assert 290 < job["next_run"] - time.monotonic() <= 300
+
+def test_job_runs_again_once_the_interval_has_elapsed(workers, db):
+    (a, b), runs = workers
+    run(a)
+    db.execute(text("UPDATE TachePlanifiee SET derniere_execution = :t WHERE nom = :nom"),
+               {"t": datetime.utcnow() - timedelta(seconds=900), "nom": JOB})
+    db.commit()
+    assert run(b)["last_status"] == "ok"
+    assert runs == ["A", "B"]
@@ -0,0 +1,84 @@
+# ============================================
+# IMPORTS
+# ============================================
+
+import random
+import string
+
+import Levenshtein
+import pytest
+from sqlalchemy import text
+
+from app.utils.search_index import SearchIndex, MAX_DISTANCE, normalize
+
+# ============================================
+# FUZZY RECALL
+# ============================================
+
+PRENOMS = ["jean", "marie", "lucas", "emma", "louis", "chloe", "hugo", "julie", "noah", "sophie"]
+NOMS = ["dupont", "martin", "bernard", "dubois", "lambert", "leroy", "moreau", "simon", "laurent", "michel"]
+TABLES = {"Personnel": {"pk": ["id"], "columns": ["nom"]}}
+
+def build_index(values: list) -> SearchIndex:
+    index = SearchIndex()
+    index.load(TABLES, (("Personnel", {"id": i, "nom": v}) for i, v in enumerate(values)))
+    return index
+
+def edit(rng: random.Random, value: str, edits: int) -> str:
+    """Applies `edits` random substitutions, insertions or deletions."""
+    for _ in range(edits):
+        i = rng.randrange(len(value))
+        kind = rng.randrange(3)
+        if kind == 0:
+            value = value[:i] + rng.choice(string.ascii_lowercase) + value[i + 1:]
+        elif kind == 1:
+            value = value[:i] + rng.choice(string.ascii_lowercase) + value[i:]
+        else:
+            value = value[:i] + value[i + 1:]
+    return value
+
+def test_spread_substitutions_at_the_maximum_distance_are_found():
+    index = build_index(["bernard dupont", "marie lambert"])
+    query = "bxrnaxd duxont"  # 3 substitutions, 9 of the 15 trigrams destroyed
+    assert Levenshtein.distance(query, "bernard dupont") == MAX_DISTANCE
+    assert [(h["pk"], h["score"]) for h in index.search(query)] == [((0,), MAX_DISTANCE)]
+
+@pytest.mark.parametrize("edits", [2, 3])
+def test_multi_edit_queries_find_every_value_of_the_scan(edits):
+    rng = random.Random(edits)
+    values = [f"{rng.choice(PRENOMS)} {rng.choice(NOMS)} {rng.choice(NOMS)}" for _ in range(300)]
+    index = build_index(values)
+    for _ in range(50):
+        query = edit(rng, rng.choice(values), edits)
+        expected = {i for i, v in enumerate(values) if Levenshtein.distance(normalize(query), v) <= MAX_DISTANCE}
+        found = {h["pk"][0] for h in index.search(query, k=len(values))}
+        assert found == expected, query
+
+# ============================================
+# COMPOSITE KEYS
+# ============================================
+
+@pytest.fixture
+def gerer(db):
+    db.execute(text("INSERT INTO Gerer (id_personnel, id_projet) VALUES ('P901', 'PRJ901')"))
+    db.commit()
+    yield
+    db.execute(text("DELETE FROM Gerer WHERE id_personnel = 'P901'"))
+    db.commit()
+
+def test_composite_key_row_is_refreshed_and_removed(db, gerer):
+    index = SearchIndex()
+    index.load({"Gerer": {"pk": ["id_personnel", "id_projet"], "columns": ["id_personnel", "id_projet"]}}, [])
+    index.refresh_row(db, "Gerer", {"id_personnel": "P901", "id_projet": "PRJ901"})
+    assert {h["pk"] for h in index.search("PRJ901")} == {("P901", "PRJ901")}
+    index.remove_row("Gerer", {"id_personnel": "P901", "id_projet": "PRJ901"})
+    assert index.search("PRJ901") == []
+
+def test_partial_composite_key_schedules_a_rebuild(db, monkeypatch):
+    index = SearchIndex()
+    index.load({"Gerer": {"pk": ["id_personnel", "id_projet"], "columns": ["id_projet"]}}, [])
+    rebuilds = []
+    monkeypatch.setattr(index, "schedule_rebuild", lambda: rebuilds.append(True))
+    index.refresh_row(db, "Gerer", {"id_personnel": "P901"})
+    index.remove_row("Gerer", {"id_personnel": "P901"})
+    assert len(rebuilds) == 2
@@ -0,0 +1,25 @@
+# ============================================
+# IMPORTS
+# ============================================
+
+from app.utils.suggestion_cache import SuggestionCache, column_signature, sample_hash
+
+# ============================================
+# SUGGESTION CACHE
+# ============================================
+
+SIGNATURE = column_signature(["Date", "Collaborateur", "Heures"])
+JUNE = sample_hash([{"Date": "2025-06-02", "Collaborateur": "P002", "Heures": -3}])
+JULY = sample_hash([{"Date": "2025-07-01", "Collaborateur": "P002", "Heures": 8}])
+
+def test_suggestion_is_only_reused_for_the_same_sample(tmp_path):
+    cache = SuggestionCache(path=str(tmp_path / "suggestions.json"))
+    cache.put("PrestationCollaborateur", SIGNATURE, JUNE, "Heures négatives à la ligne 2")
+    assert cache.get("PrestationCollaborateur", SIGNATURE, JUNE) == "Heures négatives à la ligne 2"
+    assert cache.get("PrestationCollaborateur", SIGNATURE, JULY) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_suggestions_survive_a_restart(tmp_path):
+    path = str(tmp_path / "suggestions.json")
+    SuggestionCache(path=path).put("Client", column_signature(["Nom"]), JUNE, "RAS")
+    assert SuggestionCache(path=path).get("Client", column_signature([" nom "]), JUNE) == "RAS"
@@ -0,0 +1,43 @@
+# ============================================
+# IMPORTS
+# ============================================
+
+import pytest
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.orm import Session
+
+from app.utils.task_hours import DEFERRED_FLAG, DEFERRED_HOURS_VARIABLE, deferred_task_hours
+
+# ============================================
+# BULK MODE RESET
+# ============================================
+
+def deferred_mode(engine):
+    """Value of the bulk mode variable on the (single) pooled connection of `engine`."""
+    with engine.connect() as connection:
+        return connection.execute(text(f"SELECT {DEFERRED_HOURS_VARIABLE}")).scalar()
+
+def test_flagged_connection_that_cannot_be_reset_is_discarded(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", pool_size=1, max_overflow=0)
+    with engine.connect() as connection:
+        first = connection.connection.dbapi_connection
+        connection.connection.info[DEFERRED_FLAG] = True  # SQLite rejects the SET: the connection is invalidated
+    with engine.connect() as connection:
+        assert connection.connection.dbapi_connection is not first
+        assert DEFERRED_FLAG not in connection.connection.info
+    engine.dispose()
+
+def test_failed_block_keeps_its_error_and_resets_the_connection(mysql_engine):
+    db = Session(mysql_engine)
+    with pytest.raises(exc.ProgrammingError):
+        with deferred_task_hours(db, "PrestationCollaborateur", []):
+            db.execute(text("SELECT * FROM TableInexistante"))
+    db.rollback()
+    db.close()
+    assert deferred_mode(mysql_engine) is None
+
+def test_connection_returned_with_the_flag_is_reset_by_the_pool(mysql_engine):
+    with mysql_engine.connect() as connection:
+        connection.execute(text(f"SET {DEFERRED_HOURS_VARIABLE} = 1"))
+        connection.connection.info[DEFERRED_FLAG] = True
+    assert deferred_mode(mysql_engine) is None
@@ -0,0 +1,112 @@
+# ============================================
+# IMPORTS
+# ============================================
+
+from datetime import date
+
+import pytest
+
+from app import models
+
+SEMAINE = "2025-W23"  # du lundi 2 au dimanche 8 juin 2025
+
+# ============================================
+# FIXTURES
+# ============================================
+
+@pytest.fixture
+def collaborateur(db, login):
+    """Collaborator P951 with 20 h already encoded on 05/06 (task T963 on PRJ001), logged in."""
+    db.add_all([
+        models.Personnel(id_personnel="P951", nom="Collab", prenom="Poly", email="p951@polybase.local",
+                         fonction="collaborateur", taux_honoraire_standard=80),
+        models.Collaborateur(id_personnel="P951"),
+        models.Projet(id_projet="PRJ951", nom_projet="Clos", statut="clos", date_debut=date(2025, 1, 1),
+                      date_fin=date(2025, 3, 31), montant_total_estime=100, type_marche="public",
+                      id_client="CL001"),
+        models.Projet(id_projet="PRJ952", nom_projet="Autre", statut="en_cours", date_debut=date(2025, 1, 1),
+                      date_fin=date(2025, 12, 31), montant_total_estime=100, type_marche="public",
+                      id_client="CL001"),
+        models.Tache(id_tache="T961", nom_tache="Ouverte", statut="en_cours"),
+        models.Tache(id_tache="T962", nom_tache="Terminée", statut="termine"),
+        models.Tache(id_tache="T963", nom_tache="Encodée", statut="en_cours"),
+        models.PrestationCollaborateur(id_prestation="PC951", date=date(2025, 6, 5), id_tache="T963",
+                                       id_projet="PRJ001", id_collaborateur="P951", heures_effectuees=20),
+    ])
+    db.commit()
+    yield login("P951")
+    db.query(models.PrestationCollaborateur).filter_by(id_collaborateur="P951").delete()
+    db.query(models.Tache).filter(models.Tache.id_tache.in_(["T961", "T962", "T963"])).delete(
+        synchronize_session=False)
+    db.query(models.Projet).filter(models.Projet.id_projet.in_(["PRJ951", "PRJ952"])).delete(
+        synchronize_session=False)
+    db.query(models.Collaborateur).filter_by(id_personnel="P951").delete()
+    db.query(models.Personnel).filter_by(id_personnel="P951").delete()
+    db.commit()
+
+def encode(client, *lignes):
+    response = client.post("/api/encodage/semaine", json={"semaine": SEMAINE, "lignes": [
+        {"id_projet": id_projet, "id_tache": id_tache, "heures": heures} for id_projet, id_tache, heures in lignes
+    ]})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+def messages(report) -> dict:
+    return {(r["ligne"], r["date"]): r.get("message") for r in report["resultats"]}
+
+# ============================================
+# VALIDATION
+# ============================================
+
+def test_invalid_cells_are_reported_and_the_valid_ones_inserted(collaborateur, db):
+    report = encode(
+        collaborateur,
+        ("PRJ001", "T961", {"2025-06-02": 4, "2025-06-03": 25, "2025-06-04": 1.1, "2025-06-09": 2}),
+        ("PRJ999", None, {"2025-06-02": 1}),
+        ("PRJ951", None, {"2025-06-02": 1}),
+        ("PRJ001", "T999", {"2025-06-02": 1}),
+        ("PRJ001", "T962", {"2025-06-02": 1}),
+        ("PRJ952", "T963", {"2025-06-02": 1}),
+        ("PRJ001", "T961", {"2025-06-02": 2}),
+        ("PRJ952", "T961", {"2025-06-03": 1}),
+        ("PRJ001", "T963", {"2025-06-03": 1}),
+    )
+    assert messages(report) == {
+        (0, "2025-06-02"): None,
+        (0, "2025-06-03"): "Durée invalide : 25.0 h (entre 0 et 24 h)",
+        (0, "2025-06-04"): "Durée invalide : 1.1 h (par pas de 0.25 h)",
+        (0, "2025-06-09"): "Date hors de la semaine encodée",
+        (1, "2025-06-02"): "Projet inconnu : PRJ999",
+        (2, "2025-06-02"): "Projet clôturé : PRJ951",
+        (3, "2025-06-02"): "Tâche inconnue : T999",
+        (4, "2025-06-02"): "Tâche terminée : T962",
+        (5, "2025-06-02"): "Tâche T963 hors du projet PRJ952",
+        (6, "2025-06-02"): "Cellule en double (même jour, projet et tâche)",
+        (7, "2025-06-03"): "Tâche T961 hors du projet PRJ952",
+        (8, "2025-06-03"): None,
+    }
+    assert (report["inserted"], report["failed"]) == (2, 10)
+    inserted = [r for r in report["resultats"] if r["statut"] == "ok"]
+    assert all(r["statut"] == "erreur" for r in report["resultats"] if r.get("message"))
+    stored = {p.id_prestation: (p.date.isoformat(), p.id_projet, p.id_tache, float(p.heures_effectuees))
+              for p in db.query(models.PrestationCollaborateur).filter_by(id_collaborateur="P951")
+              if p.id_prestation != "PC951"}
+    assert stored == {r["id_prestation"]: (r["date"], r["id_projet"], r["id_tache"], r["heures"]) for r in inserted}
+
+def test_daily_cap_includes_the_hours_already_encoded(collaborateur, db):
+    report = encode(
+        collaborateur,
+        ("PRJ001", "T963", {"2025-06-05": 3, "2025-06-06": 8}),
+        ("PRJ001", None, {"2025-06-05": 2}),
+    )
+    assert messages(report) == {
+        (0, "2025-06-05"): "Plus de 24 h encodées le 2025-06-05 (25 h)",
+        (0, "2025-06-06"): None,
+        (1, "2025-06-05"): "Plus de 24 h encodées le 2025-06-05 (25 h)",
+    }
+    assert (report["inserted"], report["failed"]) == (1, 2)
+    assert db.query(models.PrestationCollaborateur).filter_by(id_collaborateur="P951").count() == 2
+
+def test_only_collaborators_can_encode(login):
+    response = login("P001").post("/api/encodage/semaine", json={"lignes": []})
+    assert response.status_code == 403